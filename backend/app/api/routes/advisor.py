@@ -4,11 +4,19 @@ AI Advisor and Goal Targeting routes.
 The AI advisor uses the Claude API (claude-haiku) to answer student questions
 about their simulation results in natural language.
 
-Goal targeting runs a grid search over schedule parameters to find the
-minimum adjustments needed to achieve a target GPA.
+Goal targeting runs a pruned, batched bisection search over schedule
+parameters to find the minimum adjustments needed to achieve a target GPA.
+Cohort runs simulate or goal-target many students at once for advisors.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import json
+import threading
+import time
+from contextlib import suppress
+
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
@@ -17,14 +25,23 @@ from app.db import crud
 from app.schemas.simulation import (
     AdvisorRequest,
     AdvisorResponse,
+    CohortRequest,
+    CohortStudentResult,
+    CohortSummary,
+    GoalSurfaceRequest,
+    GoalSurfaceResult,
     GoalTargetRequest,
     GoalTargetResult,
-    ScenarioConfig,
+    SimulationTrace,
 )
+from app.simulation.cohort import CohortMember, iter_cohort
+from app.simulation.course_table import CourseTable
 from app.simulation.engine import SimulationEngine
+from app.simulation.goal_search import goal_surface, goal_target_search
+from app.simulation.result_cache import simulation_cache
 
 router = APIRouter(prefix="/advisor", tags=["advisor"])
-_engine = SimulationEngine()
+_engine = SimulationEngine(cache=simulation_cache)
 
 
 @router.post("/chat", response_model=AdvisorResponse)
@@ -67,9 +84,7 @@ def advisor_chat(request: AdvisorRequest, db: Session = Depends(get_db)):
     context_used = False
     sim_id = request.simulation_id
     if not sim_id:
-        all_runs = crud.get_simulation_runs_for_student(db, request.student_id)
-        if all_runs:
-            sim_id = all_runs[-1].id
+        sim_id = crud.get_latest_simulation_run_id(db, request.student_id)
 
     if sim_id:
         sim_run = crud.get_simulation_run(db, sim_id)
@@ -77,17 +92,18 @@ def advisor_chat(request: AdvisorRequest, db: Session = Depends(get_db)):
             r = sim_run.results
             summary = r.get("summary", {})
             cfg = r.get("scenario_config", {})
-            snapshots = r.get("weekly_snapshots", [])
+            if "trace" in r:
+                trace = SimulationTrace.from_dict(r["trace"])
+            else:
+                trace = SimulationTrace.from_snapshots(r.get("weekly_snapshots", []))
 
-            # Compute early-vs-late trends from weekly snapshots
+            # Compute early-vs-late trends from the weekly trace
             trend_text = ""
-            if len(snapshots) >= 6:
-                early = snapshots[:3]
-                late  = snapshots[-3:]
-                avg_load_early = sum(s.get("cognitive_load", 0) for s in early) / 3
-                avg_load_late  = sum(s.get("cognitive_load", 0) for s in late)  / 3
-                avg_gpa_early  = sum(s.get("predicted_gpa", 0) for s in early) / 3
-                avg_gpa_late   = sum(s.get("predicted_gpa", 0) for s in late)  / 3
+            if len(trace) >= 6:
+                avg_load_early = float(trace.cognitive_load[:3].sum()) / 3
+                avg_load_late  = float(trace.cognitive_load[-3:].sum()) / 3
+                avg_gpa_early  = float(trace.predicted_gpa[:3].sum()) / 3
+                avg_gpa_late   = float(trace.predicted_gpa[-3:].sum()) / 3
                 gpa_dir  = ("improving" if avg_gpa_late  > avg_gpa_early  + 0.05 else
                             "declining" if avg_gpa_late  < avg_gpa_early  - 0.05 else "stable")
                 load_dir = ("rising"   if avg_load_late > avg_load_early + 5   else
@@ -101,12 +117,12 @@ def advisor_chat(request: AdvisorRequest, db: Session = Depends(get_db)):
 
             # Highest burnout week
             worst_week_text = ""
-            if snapshots:
-                worst = max(snapshots, key=lambda s: s.get("burnout_probability", 0))
+            if len(trace):
+                worst = int(trace.burnout_probability.argmax())
                 worst_week_text = (
-                    f"\n  - Worst burnout week: week {worst.get('week')} "
-                    f"({worst.get('burnout_probability', 0) * 100:.0f}% probability, "
-                    f"load {worst.get('cognitive_load', 0):.0f}/100)"
+                    f"\n  - Worst burnout week: week {worst + 1} "
+                    f"({trace.burnout_probability[worst] * 100:.0f}% probability, "
+                    f"load {trace.cognitive_load[worst]:.0f}/100)"
                 )
 
             gpa_mean = summary.get("predicted_gpa_mean", 0)
@@ -181,65 +197,42 @@ def goal_target(request: GoalTargetRequest, db: Session = Depends(get_db)):
     """
     Find the schedule parameters needed to achieve a target GPA.
 
-    Performs a grid search over work hours, sleep, and study strategy.
-    Returns the most achievable schedule (or the closest if target is not reachable).
+    Searches work hours, sleep, and study strategy for the schedule closest to
+    the student's current one (fewest weekly hours moved) that reaches the
+    target, or the highest-GPA schedule if the target is not reachable.
     """
     student = crud.get_student(db, request.student_id)
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found.")
 
-    courses = crud.get_courses_for_student(db, request.student_id)
+    courses = CourseTable.from_courses(crud.get_courses_for_student(db, request.student_id))
     if not courses:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No courses enrolled. Add courses before using goal targeting.",
         )
 
-    course_ids = [c.id for c in courses]
-    best_result = None
-    best_config = None
-    achievable = False
-
-    # Grid search: strategy × sleep × work
-    for strategy in ["spaced", "mixed", "cramming"]:
-        for sleep_h in [9.0, 8.5, 8.0, 7.5, 7.0, 6.5, 6.0]:
-            for work_h in [0.0, 5.0, 10.0, 15.0, 20.0, request.max_work_hours]:
-                if work_h > request.max_work_hours:
-                    continue
-                try:
-                    config = ScenarioConfig(
-                        student_id=request.student_id,
-                        num_weeks=request.num_weeks,
-                        work_hours_per_week=work_h,
-                        sleep_target_hours=sleep_h,
-                        study_strategy=strategy,
-                        include_course_ids=course_ids,
-                        exam_weeks=request.exam_weeks,
-                    )
-                    result = _engine.run(config=config, courses=courses, student=student)
-                    gpa = result.summary.predicted_gpa_mean
-
-                    if gpa >= request.target_gpa:
-                        achievable = True
-                        if best_result is None or gpa > best_result.summary.predicted_gpa_mean:
-                            best_result = result
-                            best_config = config
-                    elif not achievable:
-                        # Track best non-achieving result as fallback
-                        if best_result is None or gpa > best_result.summary.predicted_gpa_mean:
-                            best_result = result
-                            best_config = config
-                except Exception:
-                    continue
-
-    if best_result is None:
+    try:
+        outcome = goal_target_search(
+            _engine, courses, request,
+            current_work_hours=student.weekly_work_hours,
+            current_sleep_hours=student.sleep_target_hours,
+        )
+    except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Goal targeting failed — no valid simulation completed.",
+            detail=f"Goal targeting failed: {str(e)}",
         )
+    best_config = outcome.config
+    achievable = outcome.achievable
+
+    # The search only compares summaries; re-run the winner once for its weekly allocation
+    best_result = _engine.run(config=best_config, courses=courses, student=student)
 
-    last_alloc = best_result.weekly_snapshots[-1].time_allocation
-    required_study = last_alloc.deep_study_hours + last_alloc.shallow_study_hours
+    last_alloc = best_result.trace.time_allocation
+    required_study = float(
+        last_alloc["deep_study_hours"][-1] + last_alloc["shallow_study_hours"][-1]
+    )
     gap = max(0.0, round(request.target_gpa - best_result.summary.predicted_gpa_mean, 2))
 
     tips: list[str] = []
@@ -274,4 +267,116 @@ def goal_target(request: GoalTargetRequest, db: Session = Depends(get_db)):
         predicted_gpa=best_result.summary.predicted_gpa_mean,
         gap_to_target=gap,
         tips=tips,
+        adjustment_hours=outcome.adjustment_hours,
+        evaluations=outcome.evaluations,
+    )
+
+
+@router.post("/goal-surface", response_model=GoalSurfaceResult)
+def goal_target_surface(request: GoalSurfaceRequest, db: Session = Depends(get_db)):
+    """
+    Predicted GPA and burnout over the whole goal-targeting schedule grid.
+
+    Simulates every (strategy, sleep, work) cell in one batch and caches the
+    surface by course fingerprint, so trying different target GPAs (or
+    drawing the feasible region) does not re-simulate anything.
+    """
+    student = crud.get_student(db, request.student_id)
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found.")
+
+    courses = CourseTable.from_courses(crud.get_courses_for_student(db, request.student_id))
+    if not courses:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No courses enrolled. Add courses before using goal targeting.",
+        )
+
+    try:
+        return goal_surface(_engine, courses, request, cache=simulation_cache)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Goal surface failed: {str(e)}",
+        )
+
+
+@router.post("/cohort")
+async def cohort_endpoint(
+    request: CohortRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+):
+    """
+    Simulate or goal-target a cohort of students, streamed as Server-Sent Events.
+
+    Loads every student's courses in one query, then runs the cohort in
+    batched chunks (optionally across worker processes). Emits a `student`
+    event per student — first the unknown ids, then the found students in id
+    order, chunk by chunk; unknown ids and students without courses carry a
+    `detail` instead of results — and a final `summary` event. Stops
+    simulating as soon as the client disconnects.
+    """
+    if request.student_ids is None:
+        students = crud.get_all_students(db)
+    else:
+        students = crud.get_students(db, request.student_ids)
+    if not students:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No students found.")
+
+    courses = crud.get_courses_for_students(db, [student.id for student in students])
+    members = [
+        CohortMember(
+            student_id=student.id,
+            courses=CourseTable.from_courses(courses[student.id]),
+            work_hours=student.weekly_work_hours,
+            sleep_hours=student.sleep_target_hours,
+            target_gpa=student.target_gpa,
+        )
+        for student in students
+    ]
+    missing = sorted(set(request.student_ids or []) - {student.id for student in students})
+
+    async def events():
+        started = time.perf_counter()
+        stop = threading.Event()
+        chunks = iter_cohort(members, request, stop)
+        results: list[CohortStudentResult] = [
+            CohortStudentResult(student_id=student_id, detail="Student not found.")
+            for student_id in missing
+        ]
+        simulated = achievable = evaluations = 0
+        try:
+            while not await http_request.is_disconnected():
+                for result in results:
+                    simulated += result.detail is None
+                    achievable += bool(result.achievable)
+                    yield f"event: student\ndata: {result.model_dump_json()}\n\n"
+                chunk = await run_in_threadpool(next, chunks, None)
+                if chunk is None:
+                    summary = CohortSummary(
+                        students=len(members) + len(missing),
+                        simulated=simulated,
+                        skipped=len(members) + len(missing) - simulated,
+                        achievable=achievable if request.mode == "goal_target" else None,
+                        evaluations=evaluations,
+                        elapsed_ms=round((time.perf_counter() - started) * 1000.0, 1),
+                    )
+                    yield f"event: summary\ndata: {summary.model_dump_json()}\n\n"
+                    break
+                results, chunk_evaluations = chunk
+                evaluations += chunk_evaluations
+        except ValueError as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            # On disconnect a worker thread may still be inside next(), where
+            # close() raises; `stop` then ends the iterator after that chunk
+            stop.set()
+            with suppress(ValueError):
+                chunks.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
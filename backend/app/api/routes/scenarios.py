@@ -3,9 +3,22 @@ from sqlalchemy.orm import Session
 
 from app.db.database import get_db
 from app.db import crud
-from app.schemas.simulation import OptimizationRequest, OptimizationResult, ScenarioConfig
+from app.schemas.simulation import (
+    OptimizationRequest,
+    OptimizationResult,
+    ParetoRequest,
+    ParetoResult,
+    ScenarioConfig,
+)
+from app.simulation.course_table import CourseTable
 from app.simulation.engine import SimulationEngine
-from app.simulation.optimizer import optimize_schedule
+from app.simulation.optimizer import (
+    WARM_START_MAX_SEEDS,
+    optimize_schedule,
+    pareto_front,
+    request_key,
+    reuse_optimum,
+)
 
 router = APIRouter(prefix="/scenarios", tags=["scenarios"])
 engine = SimulationEngine()
@@ -16,24 +29,44 @@ def optimize(request: OptimizationRequest, db: Session = Depends(get_db)):
     """
     Find the optimal schedule configuration for a student using differential evolution.
     Returns the best work hours, sleep hours, and study strategy for the given objective.
+
+    Optima are stored per student with a fingerprint of the course set: an
+    identical request returns the stored optimum without searching, and other
+    requests start their search from the nearest earlier optima.
     """
     student = crud.get_student(db, request.student_id)
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found.")
 
-    courses = crud.get_courses_for_student(db, request.student_id)
+    courses = CourseTable.from_courses(crud.get_courses_for_student(db, request.student_id))
     if not courses:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="No courses found. Add courses before running optimization.",
         )
 
+    fingerprint = courses.fingerprint()
+    key = request_key(request)
     try:
+        stored = crud.get_optimization_run(db, student.id, fingerprint, key)
+        if stored is not None:
+            # Same courses, objective and constraints: the optimum is known
+            return reuse_optimum(
+                engine, student, courses, request,
+                work_hours=stored.optimal_work_hours,
+                sleep_hours=stored.optimal_sleep_hours,
+                study_strategy=stored.optimal_study_strategy,
+            )
+
+        priors = crud.get_prior_optima(
+            db, student.id, request.objective, fingerprint, limit=WARM_START_MAX_SEEDS
+        )
         result = optimize_schedule(
             engine=engine,
             student=student,
             courses=courses,
             request=request,
+            seeds=[(p.optimal_work_hours, p.optimal_sleep_hours) for p in priors],
         )
     except Exception as e:
         raise HTTPException(
@@ -41,4 +74,36 @@ def optimize(request: OptimizationRequest, db: Session = Depends(get_db)):
             detail=f"Optimization failed: {str(e)}",
         )
 
+    # Only a finished search is worth reusing verbatim
+    if result.converged:
+        crud.create_optimization_run(db, student.id, fingerprint, key, request, result)
     return result
+
+
+@router.post("/pareto", response_model=ParetoResult, status_code=status.HTTP_200_OK)
+def pareto(request: ParetoRequest, db: Session = Depends(get_db)):
+    """
+    Compute the GPA vs burnout trade-off front for a student.
+
+    Simulates every schedule on the optimizer's grid in one batch and returns
+    the non-dominated ones, each with its config, so the UI can explore the
+    trade-off without re-optimizing per objective.
+    """
+    student = crud.get_student(db, request.student_id)
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found.")
+
+    courses = CourseTable.from_courses(crud.get_courses_for_student(db, request.student_id))
+    if not courses:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No courses found. Add courses before computing the trade-off front.",
+        )
+
+    try:
+        return pareto_front(engine=engine, student=student, courses=courses, request=request)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Pareto search failed: {str(e)}",
+        )
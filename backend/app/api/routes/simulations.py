@@ -1,4 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+import json
+import threading
+from contextlib import suppress
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
@@ -8,16 +14,20 @@ from app.schemas.simulation import (
     ActualGradeEntry,
     ActualGradesResponse,
     ActualGradesUpdate,
+    MonteCarloCompareRequest,
+    MonteCarloCompareResult,
     MonteCarloRequest,
     MonteCarloResult,
     ScenarioConfig,
     SimulationResult,
 )
+from app.simulation.course_table import CourseTable
 from app.simulation.engine import SimulationEngine
-from app.simulation.monte_carlo import run_monte_carlo
+from app.simulation.monte_carlo import compare_monte_carlo, run_monte_carlo, stream_monte_carlo
+from app.simulation.result_cache import simulation_cache
 
 router = APIRouter(prefix="/simulations", tags=["simulations"])
-engine = SimulationEngine()
+engine = SimulationEngine(cache=simulation_cache)
 
 
 class LeaderboardEntry(BaseModel):
@@ -38,7 +48,7 @@ def run_simulation(config: ScenarioConfig, db: Session = Depends(get_db)):
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found.")
 
-    courses = crud.get_courses_for_student(db, config.student_id)
+    courses = CourseTable.from_courses(crud.get_courses_for_student(db, config.student_id))
     if not courses:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -82,7 +92,9 @@ def run_monte_carlo_endpoint(request: MonteCarloRequest, db: Session = Depends(g
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found.")
 
-    courses = crud.get_courses_for_student(db, request.scenario_config.student_id)
+    courses = CourseTable.from_courses(
+        crud.get_courses_for_student(db, request.scenario_config.student_id)
+    )
     if not courses:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -90,7 +102,7 @@ def run_monte_carlo_endpoint(request: MonteCarloRequest, db: Session = Depends(g
         )
 
     if request.scenario_config.include_course_ids:
-        courses = [c for c in courses if c.id in request.scenario_config.include_course_ids]
+        courses = courses.select(request.scenario_config.include_course_ids)
 
     try:
         return run_monte_carlo(request=request, courses=courses, student=student)
@@ -98,52 +110,106 @@ def run_monte_carlo_endpoint(request: MonteCarloRequest, db: Session = Depends(g
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
 
-@router.get("/leaderboard", response_model=list[LeaderboardEntry])
-def get_leaderboard(db: Session = Depends(get_db)):
+@router.post("/monte-carlo/compare", response_model=MonteCarloCompareResult)
+def compare_monte_carlo_endpoint(request: MonteCarloCompareRequest, db: Session = Depends(get_db)):
     """
-    Return top 10 anonymous leaderboard entries.
-    Each entry is the best simulation per student ordered by GPA descending.
+    Monte Carlo several scenarios against one shared noise matrix.
+
+    Returns per-scenario p10/p50/p90 bands plus paired-difference bands of
+    each scenario against the first (baseline) one. Results are NOT persisted.
+    """
+    student_id = request.scenario_configs[0].student_id
+    if any(cfg.student_id != student_id for cfg in request.scenario_configs):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="All scenarios must belong to the same student.",
+        )
+    student = crud.get_student(db, student_id)
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found.")
+
+    courses = CourseTable.from_courses(crud.get_courses_for_student(db, student_id))
+    if not courses:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Student has no courses enrolled.",
+        )
+
+    try:
+        return compare_monte_carlo(request=request, courses=courses, student=student)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/monte-carlo/stream")
+async def stream_monte_carlo_endpoint(
+    request: MonteCarloRequest,
+    http_request: Request,
+    db: Session = Depends(get_db),
+):
     """
-    from app.models.simulation import SimulationRun
+    Stream Monte Carlo progress as Server-Sent Events.
 
-    # Get all simulation runs
-    all_runs = db.query(SimulationRun).all()
+    Emits a `progress` event with the interim p10/p50/p90 bands after every
+    chunk of runs, then a `result` event with the final bands (identical to
+    POST /monte-carlo). Stops simulating as soon as the client disconnects.
+    """
+    student = crud.get_student(db, request.scenario_config.student_id)
+    if not student:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found.")
+
+    courses = CourseTable.from_courses(
+        crud.get_courses_for_student(db, request.scenario_config.student_id)
+    )
+    if request.scenario_config.include_course_ids:
+        courses = courses.select(request.scenario_config.include_course_ids)
+    if not courses:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No courses selected for simulation.",
+        )
 
-    # Best sim per student (max predicted_gpa_mean)
-    best_per_student: dict[int, SimulationRun] = {}
-    for run in all_runs:
-        if not run.results:
-            continue
+    async def events():
+        stop = threading.Event()
+        updates = stream_monte_carlo(request=request, courses=courses, student=student, stop=stop)
         try:
-            gpa = run.results["summary"]["predicted_gpa_mean"]
-        except (KeyError, TypeError):
-            continue
-        prev = best_per_student.get(run.student_id)
-        if prev is None:
-            best_per_student[run.student_id] = run
-        else:
-            prev_gpa = prev.results["summary"]["predicted_gpa_mean"]
-            if gpa > prev_gpa:
-                best_per_student[run.student_id] = run
-
-    # Sort by GPA desc, take top 10
-    sorted_runs = sorted(
-        best_per_student.values(),
-        key=lambda r: r.results["summary"]["predicted_gpa_mean"],
-        reverse=True,
-    )[:10]
+            while not await http_request.is_disconnected():
+                update = await run_in_threadpool(next, updates, None)
+                if update is None:
+                    break
+                event = "result" if update.done else "progress"
+                yield f"event: {event}\ndata: {update.model_dump_json()}\n\n"
+        except ValueError as e:
+            yield f"event: error\ndata: {json.dumps({'detail': str(e)})}\n\n"
+        finally:
+            # On disconnect a worker thread may still be inside next(), where
+            # close() raises; `stop` then ends the generator after that chunk
+            stop.set()
+            with suppress(ValueError):
+                updates.close()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
 
+@router.get("/leaderboard", response_model=list[LeaderboardEntry])
+def get_leaderboard(db: Session = Depends(get_db)):
+    """
+    Return top 10 anonymous leaderboard entries.
+    Each entry is the best simulation per student ordered by GPA descending.
+    """
     entries = []
-    for rank, run in enumerate(sorted_runs, start=1):
-        summary = run.results["summary"]
-        config = run.results.get("scenario_config", {})
+    for rank, row in enumerate(crud.get_leaderboard(db, limit=10), start=1):
         entries.append(
             LeaderboardEntry(
                 rank=rank,
-                gpa_mean=round(summary["predicted_gpa_mean"], 2),
-                burnout_risk=summary.get("burnout_risk", "UNKNOWN"),
-                strategy=config.get("study_strategy", "unknown"),
-                week_count=config.get("num_weeks", 0),
+                gpa_mean=round(row.predicted_gpa_mean, 2),
+                burnout_risk=row.burnout_risk or "UNKNOWN",
+                strategy=row.study_strategy or "unknown",
+                week_count=row.num_weeks or 0,
             )
         )
     return entries
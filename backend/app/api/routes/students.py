@@ -79,14 +79,17 @@ def send_summary(student_id: int, db: Session = Depends(get_db)):
     if not getattr(student, "notify_weekly_summary", True):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Student has disabled weekly summary emails.")
 
-    runs = crud.get_simulation_runs_for_student(db, student_id, limit=100)
+    runs = crud.get_simulation_summaries(db, student_id, limit=100)
     if not runs:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No simulations to summarize.")
 
-    gpas = [r.results["summary"]["predicted_gpa_mean"] for r in runs if r.results]
-    risks = [r.results["summary"]["burnout_risk"] for r in runs if r.results]
-    tips_list = [r.results["summary"].get("recommendation", "") for r in runs if r.results]
-    tip = next((t for t in reversed(tips_list) if t), "Keep running simulations to track your academic progress.")
+    gpas = [r.predicted_gpa_mean for r in runs]
+    risks = [r.burnout_risk for r in runs]
+    # Only the latest run's blob is parsed, for its recommendation
+    latest = crud.get_simulation_run(db, runs[-1].id)
+    tip = (latest.results.get("summary") or {}).get("recommendation") or (
+        "Keep running simulations to track your academic progress."
+    )
 
     try:
         send_weekly_summary_email(
@@ -29,6 +29,10 @@ class Settings(BaseSettings):
     # On the free plan without a custom domain use: onboarding@resend.dev
     RESEND_FROM: str = "Academic Digital Twin <onboarding@resend.dev>"
 
+    # ── Simulation ───────────────────────────────────────────────────────────
+    # Max results kept in the in-process LRU cache in front of the engine (0 = off).
+    SIMULATION_CACHE_SIZE: int = 512
+
     # ── Frontend URL (used in password-reset links) ───────────────────────────
     FRONTEND_URL: str = "https://academic-digital-twin-simulator.vercel.app"
 
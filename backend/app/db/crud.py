@@ -1,12 +1,22 @@
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.models.student import Student
 from app.models.course import Course
 from app.models.simulation import SimulationRun
+from app.models.optimization import OptimizationRun
+from app.models.student_best_run import StudentBestRun
 from app.models.actual_grade import ActualGrade
 from app.schemas.student import StudentCreate, StudentUpdate
 from app.schemas.course import CourseCreate
-from app.schemas.simulation import ScenarioConfig, SimulationResult, ActualGradeEntry
+from app.schemas.simulation import (
+    ActualGradeEntry,
+    OptimizationRequest,
+    OptimizationResult,
+    ScenarioConfig,
+    SimulationResult,
+)
+from app.simulation.result_cache import simulation_cache
 
 
 # ── Student ──────────────────────────────────────────────────────────────────
@@ -44,6 +54,22 @@ def get_courses_for_student(db: Session, student_id: int) -> list[Course]:
     return db.query(Course).filter(Course.student_id == student_id).all()
 
 
+def get_courses_for_students(db: Session, student_ids: list[int]) -> dict[int, list[Course]]:
+    """Courses of many students in one query, grouped by student (in id order)."""
+    grouped: dict[int, list[Course]] = {student_id: [] for student_id in student_ids}
+    if not student_ids:
+        return grouped
+    courses = (
+        db.query(Course)
+        .filter(Course.student_id.in_(student_ids))
+        .order_by(Course.student_id.asc(), Course.id.asc())
+        .all()
+    )
+    for course in courses:
+        grouped[course.student_id].append(course)
+    return grouped
+
+
 def get_course(db: Session, course_id: int) -> Course | None:
     return db.query(Course).filter(Course.id == course_id).first()
 
@@ -54,6 +80,7 @@ def create_course(db: Session, student_id: int, data: CourseCreate) -> Course:
     db.add(course)
     db.commit()
     db.refresh(course)
+    simulation_cache.invalidate_student(student_id)
     return course
 
 
@@ -61,8 +88,10 @@ def delete_course(db: Session, course_id: int) -> bool:
     course = get_course(db, course_id)
     if not course:
         return False
+    student_id = course.student_id
     db.delete(course)
     db.commit()
+    simulation_cache.invalidate_student(student_id)
     return True
 
 
@@ -77,14 +106,129 @@ def create_simulation_run(
     run = SimulationRun(
         student_id=student_id,
         scenario_config=config.model_dump(mode="json"),
-        results=result.model_dump(mode="json"),
+        results={
+            **result.model_dump(mode="json", exclude={"weekly_snapshots"}),
+            "trace": result.trace.to_dict(),
+        },
+        predicted_gpa_mean=result.summary.predicted_gpa_mean,
+        burnout_risk=result.summary.burnout_risk,
+        study_strategy=config.study_strategy,
+        num_weeks=config.num_weeks,
     )
     db.add(run)
+    db.flush()
+    _offer_best_run(db, run)
     db.commit()
     db.refresh(run)
     return run
 
 
+def _offer_best_run(db: Session, run: SimulationRun) -> None:
+    """Make `run` its student's best run if it beats the current one."""
+    if run.predicted_gpa_mean is None:
+        return
+    best = db.get(StudentBestRun, run.student_id)
+    if best is None:
+        best = StudentBestRun(student_id=run.student_id)
+        db.add(best)
+    elif run.predicted_gpa_mean <= best.predicted_gpa_mean:
+        return
+    best.simulation_run_id = run.id
+    best.predicted_gpa_mean = run.predicted_gpa_mean
+    best.burnout_risk = run.burnout_risk
+    best.study_strategy = run.study_strategy
+    best.num_weeks = run.num_weeks
+
+
+def _fill_best_run(db: Session, student_id: int) -> None:
+    """Recompute a student's missing best run from their runs (indexed lookup)."""
+    run = (
+        db.query(SimulationRun)
+        .filter(
+            SimulationRun.student_id == student_id,
+            SimulationRun.predicted_gpa_mean.is_not(None),
+        )
+        .order_by(SimulationRun.predicted_gpa_mean.desc(), SimulationRun.id.asc())
+        .first()
+    )
+    if run is not None:
+        _offer_best_run(db, run)
+
+
+def _summary_columns(run: SimulationRun) -> dict | None:
+    """Denormalized summary column values parsed from a stored run's JSON, if it has a summary."""
+    results = run.results or {}
+    summary = results.get("summary") or {}
+    if summary.get("predicted_gpa_mean") is None:
+        return None
+    config = run.scenario_config or results.get("scenario_config") or {}
+    return {
+        "predicted_gpa_mean": summary["predicted_gpa_mean"],
+        "burnout_risk": summary.get("burnout_risk"),
+        "study_strategy": config.get("study_strategy"),
+        "num_weeks": config.get("num_weeks"),
+    }
+
+
+def backfill_simulation_summaries(db: Session, batch_size: int = 500) -> int:
+    """
+    Fill the summary columns of runs stored before they existed.
+
+    Idempotent: only rows whose `predicted_gpa_mean` is still NULL are read,
+    in id-ordered batches. Rows without a summary in their JSON stay NULL.
+
+    Returns:
+        Number of rows updated.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        runs = (
+            db.query(SimulationRun)
+            .filter(SimulationRun.predicted_gpa_mean.is_(None), SimulationRun.id > last_id)
+            .order_by(SimulationRun.id.asc())
+            .limit(batch_size)
+            .all()
+        )
+        if not runs:
+            return updated
+        for run in runs:
+            columns = _summary_columns(run)
+            if columns is not None:
+                for name, value in columns.items():
+                    setattr(run, name, value)
+                db.flush()
+                _offer_best_run(db, run)
+                updated += 1
+        db.commit()
+        last_id = runs[-1].id
+
+
+def backfill_student_best_runs(db: Session) -> int:
+    """
+    Create the missing student_best_run rows (students with runs but no row).
+
+    Idempotent; rows kept up to date by create/delete are left alone.
+
+    Returns:
+        Number of students filled in.
+    """
+    missing = (
+        db.query(SimulationRun.student_id)
+        .outerjoin(StudentBestRun, StudentBestRun.student_id == SimulationRun.student_id)
+        .filter(
+            StudentBestRun.student_id.is_(None),
+            SimulationRun.predicted_gpa_mean.is_not(None),
+        )
+        .distinct()
+        .all()
+    )
+    for (student_id,) in missing:
+        _fill_best_run(db, student_id)
+    db.commit()
+    return len(missing)
+
+
 def get_simulation_run(db: Session, sim_id: int) -> SimulationRun | None:
     return db.query(SimulationRun).filter(SimulationRun.id == sim_id).first()
 
@@ -102,11 +246,62 @@ def get_simulation_runs_for_student(
     )
 
 
+def get_simulation_summaries(db: Session, student_id: int, limit: int = 100) -> list:
+    """
+    (id, predicted_gpa_mean, burnout_risk) of a student's runs, oldest first.
+
+    Reads only the summary columns; runs without a summary are skipped.
+    """
+    return (
+        db.query(SimulationRun.id, SimulationRun.predicted_gpa_mean, SimulationRun.burnout_risk)
+        .filter(
+            SimulationRun.student_id == student_id,
+            SimulationRun.predicted_gpa_mean.is_not(None),
+        )
+        .order_by(SimulationRun.id.asc())
+        .limit(limit)
+        .all()
+    )
+
+
+def get_latest_simulation_run_id(db: Session, student_id: int) -> int | None:
+    """Id of the student's most recent run, without loading any run."""
+    return (
+        db.query(func.max(SimulationRun.id))
+        .filter(SimulationRun.student_id == student_id)
+        .scalar()
+    )
+
+
+def get_leaderboard(db: Session, limit: int = 10) -> list[StudentBestRun]:
+    """
+    Each student's best run by predicted GPA, best first (ties: earlier run).
+
+    One indexed ORDER BY ... LIMIT over student_best_run, so the cost does
+    not grow with the number of stored runs.
+    """
+    return (
+        db.query(StudentBestRun)
+        .order_by(StudentBestRun.predicted_gpa_mean.desc(), StudentBestRun.simulation_run_id.asc())
+        .limit(limit)
+        .all()
+    )
+
+
 def delete_simulation_run(db: Session, sim_id: int) -> bool:
     run = get_simulation_run(db, sim_id)
     if not run:
         return False
+    best = db.get(StudentBestRun, run.student_id)
+    was_best = best is not None and best.simulation_run_id == sim_id
+    if was_best:
+        # The best-run row references the run, so it goes first
+        db.delete(best)
+        db.flush()
     db.delete(run)
+    db.flush()
+    if was_best:
+        _fill_best_run(db, run.student_id)
     db.commit()
     return True
 
@@ -117,15 +312,93 @@ def delete_student(db: Session, student_id: int) -> bool:
         return False
     db.delete(student)
     db.commit()
+    simulation_cache.invalidate_student(student_id)
     return True
 
 
+# ── Optimization ──────────────────────────────────────────────────────────────
+
+def create_optimization_run(
+    db: Session,
+    student_id: int,
+    course_fingerprint: str,
+    request_key: str,
+    request: OptimizationRequest,
+    result: OptimizationResult,
+) -> OptimizationRun:
+    run = OptimizationRun(
+        student_id=student_id,
+        course_fingerprint=course_fingerprint,
+        request_key=request_key,
+        objective=result.objective,
+        optimal_work_hours=result.optimal_work_hours,
+        optimal_sleep_hours=result.optimal_sleep_hours,
+        optimal_study_strategy=result.optimal_study_strategy,
+        predicted_gpa=result.predicted_gpa,
+        predicted_burnout_probability=result.predicted_burnout_probability,
+        request=request.model_dump(mode="json"),
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
+
+
+def get_optimization_run(
+    db: Session, student_id: int, course_fingerprint: str, request_key: str
+) -> OptimizationRun | None:
+    """Latest stored optimum for exactly these courses and request settings."""
+    return (
+        db.query(OptimizationRun)
+        .filter(
+            OptimizationRun.student_id == student_id,
+            OptimizationRun.course_fingerprint == course_fingerprint,
+            OptimizationRun.request_key == request_key,
+        )
+        .order_by(OptimizationRun.id.desc())
+        .first()
+    )
+
+
+def get_prior_optima(
+    db: Session, student_id: int, objective: str, course_fingerprint: str, limit: int = 5
+) -> list[OptimizationRun]:
+    """
+    A student's stored optima for an objective, nearest first.
+
+    Optima found for the same course set come first (only the constraints
+    differed), then the rest, newest first.
+    """
+    return (
+        db.query(OptimizationRun)
+        .filter(OptimizationRun.student_id == student_id, OptimizationRun.objective == objective)
+        .order_by(
+            (OptimizationRun.course_fingerprint == course_fingerprint).desc(),
+            OptimizationRun.id.desc(),
+        )
+        .limit(limit)
+        .all()
+    )
+
+
 # ── All Students ───────────────────────────────────────────────────────────────
 
 def get_all_students(db: Session) -> list[Student]:
     return db.query(Student).order_by(Student.id.asc()).all()
 
 
+def get_students(db: Session, student_ids: list[int]) -> list[Student]:
+    """Students with the given ids (unknown ids are skipped), in id order."""
+    if not student_ids:
+        return []
+    return (
+        db.query(Student)
+        .filter(Student.id.in_(student_ids))
+        .order_by(Student.id.asc())
+        .all()
+    )
+
+
 # ── Actual Grades ──────────────────────────────────────────────────────────────
 
 def save_actual_grades(db: Session, sim_id: int, grades: list[ActualGradeEntry]) -> int:
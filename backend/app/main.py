@@ -1,14 +1,17 @@
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
 from app.core.config import get_settings
-from app.db.database import Base, engine
+from app.db import crud
+from app.db.database import Base, SessionLocal, engine
 from app.api.routes import students, courses, simulations, scenarios, canvas, advisor, auth
 
 limiter = Limiter(key_func=get_remote_address)
@@ -18,7 +21,7 @@ settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Create all database tables on startup, then apply any missing column migrations."""
+    """Create all database tables on startup, apply any missing column migrations, then backfill."""
     Base.metadata.create_all(bind=engine)
     # Idempotent column migrations — safe to run on every startup
     _migrations = [
@@ -28,6 +31,13 @@ async def lifespan(app: FastAPI):
         "ALTER TABLE students ADD COLUMN IF NOT EXISTS notify_burnout_alert BOOLEAN NOT NULL DEFAULT TRUE",
         "ALTER TABLE students ADD COLUMN IF NOT EXISTS notify_weekly_summary BOOLEAN NOT NULL DEFAULT TRUE",
         "ALTER TABLE students ADD COLUMN IF NOT EXISTS theme_preference VARCHAR(10) NOT NULL DEFAULT 'system'",
+        "ALTER TABLE simulation_runs ADD COLUMN IF NOT EXISTS predicted_gpa_mean FLOAT",
+        "ALTER TABLE simulation_runs ADD COLUMN IF NOT EXISTS burnout_risk VARCHAR(10)",
+        "ALTER TABLE simulation_runs ADD COLUMN IF NOT EXISTS study_strategy VARCHAR(16)",
+        "ALTER TABLE simulation_runs ADD COLUMN IF NOT EXISTS num_weeks INTEGER",
+        "CREATE INDEX IF NOT EXISTS ix_simulation_runs_predicted_gpa_mean ON simulation_runs (predicted_gpa_mean)",
+        "CREATE INDEX IF NOT EXISTS ix_simulation_runs_burnout_risk ON simulation_runs (burnout_risk)",
+        "CREATE INDEX IF NOT EXISTS ix_simulation_runs_student_gpa ON simulation_runs (student_id, predicted_gpa_mean)",
     ]
     for _sql in _migrations:
         try:
@@ -36,6 +46,14 @@ async def lifespan(app: FastAPI):
                 conn.commit()
         except Exception:
             pass  # Column already exists or DB dialect doesn't support IF NOT EXISTS
+    # Fill the summary columns and best-run rows of runs stored before they existed
+    try:
+        with SessionLocal() as db:
+            crud.backfill_simulation_summaries(db)
+            crud.backfill_student_best_runs(db)
+    except OperationalError as exc:
+        # Summary columns or tables not migrated on this database; other errors propagate
+        logging.getLogger(__name__).warning("Skipped simulation summary backfill: %s", exc)
     yield
 
 
@@ -1,5 +1,7 @@
 from app.models.student import Student
 from app.models.course import Course
 from app.models.simulation import SimulationRun
+from app.models.optimization import OptimizationRun
+from app.models.student_best_run import StudentBestRun
 
-__all__ = ["Student", "Course", "SimulationRun"]
+__all__ = ["Student", "Course", "SimulationRun", "OptimizationRun", "StudentBestRun"]
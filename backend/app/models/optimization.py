@@ -0,0 +1,36 @@
+from datetime import datetime
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, JSON, String, func
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.database import Base
+
+
+class OptimizationRun(Base):
+    """
+    Stored optimum of one /scenarios/optimize call.
+
+    `course_fingerprint` identifies the exact course set the schedule was
+    optimized for and `request_key` the objective, semester length and
+    constraints, so an identical request can reuse the optimum and a
+    similar one can seed its search from it.
+    """
+
+    __tablename__ = "optimization_runs"
+    __table_args__ = (
+        Index("ix_optimization_runs_lookup", "student_id", "course_fingerprint", "request_key"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    student_id: Mapped[int] = mapped_column(Integer, ForeignKey("students.id"), nullable=False)
+    course_fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    request_key: Mapped[str] = mapped_column(String(64), nullable=False)
+    objective: Mapped[str] = mapped_column(String(32), nullable=False)
+    optimal_work_hours: Mapped[float] = mapped_column(Float, nullable=False)
+    optimal_sleep_hours: Mapped[float] = mapped_column(Float, nullable=False)
+    optimal_study_strategy: Mapped[str] = mapped_column(String(16), nullable=False)
+    predicted_gpa: Mapped[float] = mapped_column(Float, nullable=False)
+    predicted_burnout_probability: Mapped[float] = mapped_column(Float, nullable=False)
+    request: Mapped[dict] = mapped_column(JSON, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+
+    student: Mapped["Student"] = relationship("Student", back_populates="optimization_runs")
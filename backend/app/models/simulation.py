@@ -1,5 +1,6 @@
 from datetime import datetime
-from sqlalchemy import DateTime, ForeignKey, Integer, JSON, func
+from typing import Optional
+from sqlalchemy import DateTime, Float, ForeignKey, Index, Integer, JSON, String, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.db.database import Base
@@ -7,6 +8,10 @@ from app.db.database import Base
 
 class SimulationRun(Base):
     __tablename__ = "simulation_runs"
+    __table_args__ = (
+        # Per-student best run (leaderboard) and run listings
+        Index("ix_simulation_runs_student_gpa", "student_id", "predicted_gpa_mean"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     student_id: Mapped[int] = mapped_column(Integer, ForeignKey("students.id"), nullable=False)
@@ -14,4 +19,12 @@ class SimulationRun(Base):
     results: Mapped[dict] = mapped_column(JSON, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
 
+    # Copied out of `results` / `scenario_config` at insert time so list
+    # queries never parse the JSON blobs. NULL only for legacy rows without
+    # a summary (see crud.backfill_simulation_summaries).
+    predicted_gpa_mean: Mapped[Optional[float]] = mapped_column(Float, nullable=True, index=True)
+    burnout_risk: Mapped[Optional[str]] = mapped_column(String(10), nullable=True, index=True)
+    study_strategy: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    num_weeks: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
     student: Mapped["Student"] = relationship("Student", back_populates="simulation_runs")
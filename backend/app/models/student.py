@@ -32,3 +32,5 @@ class Student(Base):
 
     courses: Mapped[list["Course"]] = relationship("Course", back_populates="student", cascade="all, delete-orphan")
     simulation_runs: Mapped[list["SimulationRun"]] = relationship("SimulationRun", back_populates="student", cascade="all, delete-orphan")
+    optimization_runs: Mapped[list["OptimizationRun"]] = relationship("OptimizationRun", back_populates="student", cascade="all, delete-orphan")
+    best_run: Mapped[Optional["StudentBestRun"]] = relationship("StudentBestRun", back_populates="student", uselist=False, cascade="all, delete-orphan")
@@ -0,0 +1,39 @@
+from typing import Optional
+from sqlalchemy import Float, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from app.db.database import Base
+
+
+class StudentBestRun(Base):
+    """
+    Each student's best simulation run by predicted GPA (ties: earliest run).
+
+    Maintained by crud.create_simulation_run / delete_simulation_run so the
+    leaderboard is one indexed ORDER BY ... LIMIT over one row per student,
+    however many runs have been stored. The summary fields are copied from
+    the run so the leaderboard needs no join.
+    """
+
+    __tablename__ = "student_best_run"
+
+    student_id: Mapped[int] = mapped_column(Integer, ForeignKey("students.id"), primary_key=True)
+    simulation_run_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("simulation_runs.id", ondelete="CASCADE"), nullable=False, unique=True
+    )
+    predicted_gpa_mean: Mapped[float] = mapped_column(Float, nullable=False)
+    burnout_risk: Mapped[Optional[str]] = mapped_column(String(10), nullable=True)
+    study_strategy: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    num_weeks: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    student: Mapped["Student"] = relationship("Student", back_populates="best_run")
+    # Lets the unit of work delete this row before the run it points at
+    simulation_run: Mapped["SimulationRun"] = relationship("SimulationRun", passive_deletes=True)
+
+
+# Leaderboard order: GPA descending, earlier run first on ties
+Index(
+    "ix_student_best_run_rank",
+    StudentBestRun.predicted_gpa_mean.desc(),
+    StudentBestRun.simulation_run_id,
+)
@@ -1,6 +1,12 @@
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Literal
-from pydantic import BaseModel, Field
+from functools import cached_property
+from typing import Annotated, Any, Literal
+
+import numpy as np
+from pydantic import BaseModel, Field, GetCoreSchemaHandler, computed_field, model_validator
+from pydantic.json_schema import SkipJsonSchema
+from pydantic_core import core_schema
 
 
 class TimeAllocation(BaseModel):
@@ -27,6 +33,175 @@ class WeeklySnapshot(BaseModel):
     is_exam_week: bool = False
 
 
+_TRACE_METRICS = (
+    "cognitive_load",
+    "predicted_gpa",
+    "burnout_probability",
+    "fatigue_level",
+    "retention_score",
+)
+
+
+@dataclass(eq=False)
+class SimulationTrace:
+    """
+    Column-oriented weekly history of one simulation run.
+
+    Each metric is a contiguous array indexed by week (values already rounded
+    to WeeklySnapshot precision); per-course grades and retentions share a
+    single `course_names` index instead of repeating names every week.
+    WeeklySnapshot models are only built on demand via `snapshots()`.
+
+    Attributes:
+        course_names: Course name per column of the per-course matrices.
+        cognitive_load, predicted_gpa, burnout_probability, fatigue_level,
+            retention_score: Shape (weeks,).
+        is_exam_week: Boolean, shape (weeks,).
+        time_allocation: TimeAllocation field name -> shape (weeks,).
+        course_grades: Shape (weeks, courses); NaN where a course was not graded.
+        course_retentions: Shape (weeks, courses); NaN where not tracked.
+        carried_course: Column of the dropped course whose frozen grade is
+            listed last that week, or -1.
+    """
+
+    course_names: list[str]
+    cognitive_load: np.ndarray
+    predicted_gpa: np.ndarray
+    burnout_probability: np.ndarray
+    fatigue_level: np.ndarray
+    retention_score: np.ndarray
+    is_exam_week: np.ndarray
+    time_allocation: dict[str, np.ndarray]
+    course_grades: np.ndarray
+    course_retentions: np.ndarray
+    carried_course: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.cognitive_load)
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source_type: Any, handler: GetCoreSchemaHandler):
+        # Opaque to pydantic: validated by isinstance, never serialized as a field
+        return core_schema.is_instance_schema(cls)
+
+    def snapshots(self) -> list[WeeklySnapshot]:
+        """Materialize every week as a WeeklySnapshot."""
+        metrics = {name: getattr(self, name).tolist() for name in _TRACE_METRICS}
+        allocation = {name: values.tolist() for name, values in self.time_allocation.items()}
+        grades = self.course_grades.tolist()
+        retentions = self.course_retentions.tolist()
+        carried = self.carried_course.tolist()
+        exam = self.is_exam_week.tolist()
+        num_courses = len(self.course_names)
+
+        snapshots = []
+        for w in range(len(self)):
+            # Key order: graded courses, then the frozen dropped one
+            order = [j for j in range(num_courses) if j != carried[w]]
+            if carried[w] >= 0:
+                order.append(carried[w])
+            snapshots.append(
+                WeeklySnapshot(
+                    week=w + 1,
+                    **{name: values[w] for name, values in metrics.items()},
+                    time_allocation=TimeAllocation(
+                        **{name: values[w] for name, values in allocation.items()}
+                    ),
+                    course_grades={
+                        self.course_names[j]: grades[w][j]
+                        for j in order
+                        if grades[w][j] == grades[w][j]  # skip NaN
+                    },
+                    course_retentions={
+                        name: value
+                        for name, value in zip(self.course_names, retentions[w])
+                        if value == value
+                    },
+                    is_exam_week=exam[w],
+                )
+            )
+        return snapshots
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-safe columnar representation (NaN stored as null)."""
+        return {
+            "course_names": list(self.course_names),
+            **{name: getattr(self, name).tolist() for name in _TRACE_METRICS},
+            "is_exam_week": self.is_exam_week.tolist(),
+            "time_allocation": {
+                name: values.tolist() for name, values in self.time_allocation.items()
+            },
+            "course_grades": _nan_to_none(self.course_grades),
+            "course_retentions": _nan_to_none(self.course_retentions),
+            "carried_course": self.carried_course.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "SimulationTrace":
+        """Inverse of `to_dict`."""
+        num_courses = len(data["course_names"])
+        return cls(
+            course_names=list(data["course_names"]),
+            **{name: np.asarray(data[name], dtype=float) for name in _TRACE_METRICS},
+            is_exam_week=np.asarray(data["is_exam_week"], dtype=bool),
+            time_allocation={
+                name: np.asarray(values, dtype=float)
+                for name, values in data["time_allocation"].items()
+            },
+            course_grades=np.asarray(data["course_grades"], dtype=float).reshape(-1, num_courses),
+            course_retentions=np.asarray(
+                data["course_retentions"], dtype=float
+            ).reshape(-1, num_courses),
+            carried_course=np.asarray(data["carried_course"], dtype=int),
+        )
+
+    @classmethod
+    def from_snapshots(cls, snapshots: list) -> "SimulationTrace":
+        """Build a trace from WeeklySnapshot models or their dumped dicts."""
+        snapshots = [
+            s if isinstance(s, WeeklySnapshot) else WeeklySnapshot.model_validate(s)
+            for s in snapshots
+        ]
+        course_names: list[str] = []
+        for snapshot in snapshots:
+            for name in [*snapshot.course_retentions, *snapshot.course_grades]:
+                if name not in course_names:
+                    course_names.append(name)
+        column = {name: j for j, name in enumerate(course_names)}
+
+        num_weeks, num_courses = len(snapshots), len(course_names)
+        grades = np.full((num_weeks, num_courses), np.nan)
+        retentions = np.full((num_weeks, num_courses), np.nan)
+        carried = np.full(num_weeks, -1, dtype=int)
+        for w, snapshot in enumerate(snapshots):
+            columns = [column[name] for name in snapshot.course_grades]
+            grades[w, columns] = list(snapshot.course_grades.values())
+            if len(columns) > 1 and columns[-1] < columns[-2]:
+                carried[w] = columns[-1]
+            for name, value in snapshot.course_retentions.items():
+                retentions[w, column[name]] = value
+
+        return cls(
+            course_names=course_names,
+            **{
+                name: np.array([getattr(s, name) for s in snapshots], dtype=float)
+                for name in _TRACE_METRICS
+            },
+            is_exam_week=np.array([s.is_exam_week for s in snapshots], dtype=bool),
+            time_allocation={
+                name: np.array([getattr(s.time_allocation, name) for s in snapshots], dtype=float)
+                for name in TimeAllocation.model_fields
+            },
+            course_grades=grades,
+            course_retentions=retentions,
+            carried_course=carried,
+        )
+
+
+def _nan_to_none(matrix: np.ndarray) -> list[list[float | None]]:
+    return [[None if v != v else v for v in row] for row in matrix.tolist()]
+
+
 class SimulationSummary(BaseModel):
     predicted_gpa_min: float
     predicted_gpa_max: float
@@ -56,12 +231,35 @@ class ScenarioConfig(BaseModel):
 
 
 class SimulationResult(BaseModel):
+    """
+    Simulation output. The weekly history is held as a columnar
+    SimulationTrace; `weekly_snapshots` is built from it on first access.
+    Accepts either `trace` (object or stored dict) or legacy `weekly_snapshots`.
+    """
+
     id: int | None = None
     scenario_config: ScenarioConfig
     summary: SimulationSummary
-    weekly_snapshots: list[WeeklySnapshot]
+    trace: SkipJsonSchema[SimulationTrace] = Field(exclude=True)
     created_at: datetime | None = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def _coerce_trace(cls, data: Any) -> Any:
+        if not isinstance(data, dict):
+            return data
+        trace = data.get("trace")
+        if isinstance(trace, dict):
+            data = {**data, "trace": SimulationTrace.from_dict(trace)}
+        elif trace is None and "weekly_snapshots" in data:
+            data = {**data, "trace": SimulationTrace.from_snapshots(data["weekly_snapshots"])}
+        return data
+
+    @computed_field
+    @cached_property
+    def weekly_snapshots(self) -> list[WeeklySnapshot]:
+        return self.trace.snapshots()
+
 
 class OptimizationConstraints(BaseModel):
     max_work_hours_per_week: float = Field(default=20.0, ge=0.0, le=60.0)
@@ -74,6 +272,25 @@ class OptimizationRequest(BaseModel):
     num_weeks: int = Field(default=16, ge=4, le=20)
     constraints: OptimizationConstraints = Field(default_factory=OptimizationConstraints)
     objective: Literal["maximize_gpa", "minimize_burnout", "balanced"] = "maximize_gpa"
+    # "de": differential evolution; "surrogate": GP + expected improvement,
+    # which needs a few dozen simulations instead of several hundred
+    method: Literal["de", "surrogate"] = "de"
+    # Latency budget for the search; the best schedule found so far is
+    # returned once it runs out
+    deadline_ms: int | None = Field(default=None, ge=1, le=600_000)
+
+
+class StrategySearchStats(BaseModel):
+    """Work done by the optimizer's search for one study strategy."""
+
+    strategy: str
+    best_objective: float
+    # Engine simulations actually run / objective lookups / lookups served by the memo
+    evaluations: int
+    cache_lookups: int
+    cache_hits: int
+    # False if the deadline stopped this search early
+    converged: bool = True
 
 
 class OptimizationResult(BaseModel):
@@ -85,13 +302,56 @@ class OptimizationResult(BaseModel):
     predicted_gpa: float
     predicted_burnout_probability: float
     simulation_result: SimulationResult
+    evaluations: int = 0
+    cache_hit_rate: float = 0.0
+    strategy_searches: list[StrategySearchStats] = Field(default_factory=list)
+    # False if the deadline cut any strategy search short
+    converged: bool = True
+    # "seeded": search started from earlier optima; "reused": an identical
+    # earlier request's optimum was returned without searching
+    warm_start: Literal["cold", "seeded", "reused"] = "cold"
+
+
+class ParetoRequest(BaseModel):
+    student_id: int
+    num_weeks: int = Field(default=16, ge=4, le=20)
+    constraints: OptimizationConstraints = Field(default_factory=OptimizationConstraints)
+
+
+class ParetoPoint(BaseModel):
+    """One non-dominated schedule on the GPA / burnout trade-off front."""
+
+    config: ScenarioConfig
+    predicted_gpa: float
+    burnout_probability: float
+    burnout_risk: Literal["LOW", "MEDIUM", "HIGH"]
+
+
+class ParetoResult(BaseModel):
+    # Ordered by increasing burnout probability (and increasing GPA)
+    points: list[ParetoPoint]
+    # Schedules simulated to find the front
+    evaluations: int
 
 
 # ── Monte Carlo ────────────────────────────────────────────────────────────────
 
 class MonteCarloConfig(BaseModel):
-    runs: int = Field(default=200, ge=10, le=1000)
+    runs: int = Field(default=200, ge=10, le=20000)
     study_variance: float = Field(default=0.15, ge=0.0, le=0.5)
+    # Worker processes for the run chunks; 0 uses every CPU core
+    workers: int = Field(default=1, ge=0, le=64)
+    # Extra percentiles to report (p10/p50/p90 are always included)
+    percentiles: list[Annotated[float, Field(gt=0.0, lt=100.0)]] = Field(
+        default_factory=list, max_length=20
+    )
+    # "auto": exact for small run counts, constant-memory sketch beyond that.
+    # GPAs lie on a 0.01 grid, so "p2" resolves to the (exact) histogram here
+    quantile_method: Literal["auto", "exact", "histogram", "p2"] = "auto"
+    # Noise sampler: pseudo-random, Latin hypercube or scrambled Sobol'
+    sampler: Literal["pseudo", "lhs", "sobol"] = "pseudo"
+    # Stop once every GPA percentile's 95% bootstrap CI is narrower than this
+    tolerance: float | None = Field(default=None, gt=0.0, le=1.0)
 
 
 class MonteCarloRequest(BaseModel):
@@ -108,6 +368,45 @@ class MonteCarloResult(BaseModel):
     weekly_p10: list[float]
     weekly_p50: list[float]
     weekly_p90: list[float]
+    # Requested extra percentiles, keyed "p5", "p25", ...
+    percentiles: dict[str, float] = Field(default_factory=dict)
+    weekly_percentiles: dict[str, list[float]] = Field(default_factory=dict)
+    # True when the tolerance was met before all requested runs
+    stopped_early: bool = False
+
+
+class MonteCarloProgress(MonteCarloResult):
+    """Interim Monte Carlo bands over the first `runs` of `total_runs`."""
+
+    total_runs: int
+    done: bool
+
+
+class MonteCarloCompareRequest(BaseModel):
+    # The first scenario is the baseline every other one is compared against
+    scenario_configs: list[ScenarioConfig] = Field(min_length=2, max_length=8)
+    monte_carlo: MonteCarloConfig = Field(default_factory=MonteCarloConfig)
+
+
+class MonteCarloDifference(BaseModel):
+    """
+    Paired (scenario − baseline) bands under common random numbers.
+
+    `bands` holds percentiles of the per-run GPA difference (final and per
+    shared week) and the mean burnout-probability difference.
+    """
+
+    scenario_index: int
+    baseline_index: int = 0
+    bands: MonteCarloResult
+    # Fraction of runs in which the scenario's final GPA beats the baseline's
+    probability_better: float
+
+
+class MonteCarloCompareResult(BaseModel):
+    runs: int
+    scenarios: list[MonteCarloResult]
+    differences: list[MonteCarloDifference]
 
 
 # ── Goal Targeting ─────────────────────────────────────────────────────────────
@@ -118,6 +417,9 @@ class GoalTargetRequest(BaseModel):
     num_weeks: int = Field(default=16, ge=4, le=20)
     max_work_hours: float = Field(default=20.0, ge=0.0, le=60.0)
     exam_weeks: list[int] = Field(default_factory=lambda: [8, 16])
+    # Search resolution: work hours/week and sleep hours/night
+    work_step: float = Field(default=5.0, ge=0.25, le=10.0)
+    sleep_step: float = Field(default=0.5, ge=0.25, le=1.5)
 
 
 class GoalTargetResult(BaseModel):
@@ -129,6 +431,88 @@ class GoalTargetResult(BaseModel):
     predicted_gpa: float
     gap_to_target: float
     tips: list[str]
+    # Weekly hours moved from the current schedule (work given up + 7 × sleep change)
+    adjustment_hours: float = 0.0
+    # Simulations run by the search
+    evaluations: int = 0
+
+
+class GoalSurfaceRequest(BaseModel):
+    student_id: int
+    num_weeks: int = Field(default=16, ge=4, le=20)
+    max_work_hours: float = Field(default=20.0, ge=0.0, le=60.0)
+    exam_weeks: list[int] = Field(default_factory=lambda: [8, 16])
+    work_step: float = Field(default=5.0, ge=0.25, le=10.0)
+    sleep_step: float = Field(default=0.5, ge=0.25, le=1.5)
+    # Optional target: also return which cells reach it
+    target_gpa: float | None = Field(default=None, ge=0.0, le=4.0)
+
+
+class GoalSurfaceResult(BaseModel):
+    """Predicted outcomes over the whole (strategy, sleep, work) grid."""
+
+    strategies: list[str]
+    sleep_hours: list[float]
+    work_hours: list[float]
+    # Indexed [strategy][sleep][work]
+    predicted_gpa: list[list[list[float]]]
+    burnout_probability: list[list[list[float]]]
+    # predicted_gpa >= target_gpa per cell, when a target was given
+    feasible: list[list[list[bool]]] | None = None
+    # Simulations run to build the surface (0 when it came from the cache)
+    evaluations: int
+    cached: bool = False
+
+
+class CohortRequest(BaseModel):
+    # None runs every student
+    student_ids: list[int] | None = Field(default=None, max_length=20000)
+    # "simulate": each student's current schedule; "goal_target": minimal
+    # adjustment reaching their target GPA
+    mode: Literal["simulate", "goal_target"] = "simulate"
+    num_weeks: int = Field(default=16, ge=4, le=20)
+    study_strategy: Literal["spaced", "cramming", "mixed"] = "spaced"
+    exam_weeks: list[int] = Field(default_factory=lambda: [8, 16])
+    # Goal targeting: overrides every student's own target_gpa
+    target_gpa: float | None = Field(default=None, ge=0.0, le=4.0)
+    max_work_hours: float = Field(default=20.0, ge=0.0, le=60.0)
+    work_step: float = Field(default=5.0, ge=0.25, le=10.0)
+    sleep_step: float = Field(default=0.5, ge=0.25, le=1.5)
+    # Students simulated per batch (and per streamed event group)
+    chunk_size: int = Field(default=256, ge=1, le=5000)
+    # Worker processes for the chunks; 0 uses every CPU core
+    workers: int = Field(default=1, ge=0, le=64)
+
+
+class CohortStudentResult(BaseModel):
+    """One student's outcome in a cohort run (streamed as it completes)."""
+
+    student_id: int
+    predicted_gpa: float | None = None
+    burnout_probability: float | None = None
+    burnout_risk: Literal["LOW", "MEDIUM", "HIGH"] | None = None
+    # Goal-target mode only
+    target_gpa: float | None = None
+    achievable: bool | None = None
+    recommended_work_hours: float | None = None
+    recommended_sleep_hours: float | None = None
+    recommended_strategy: str | None = None
+    adjustment_hours: float | None = None
+    # Why the student was skipped (unknown id, no courses)
+    detail: str | None = None
+
+
+class CohortSummary(BaseModel):
+    """Final event of a cohort run."""
+
+    students: int
+    simulated: int
+    skipped: int
+    # Goal-target mode: students whose target is reachable
+    achievable: int | None = None
+    # Scenario simulations run across the cohort
+    evaluations: int
+    elapsed_ms: float
 
 
 # ── AI Advisor ─────────────────────────────────────────────────────────────────
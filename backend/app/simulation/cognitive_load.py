@@ -141,3 +141,74 @@ def distribute_study_hours(
         c.id: (c.difficulty_score / total_difficulty) * total_study_hours
         for c in courses
     }
+
+
+def distribute_study_hours_batch(
+    difficulty: np.ndarray,
+    active: np.ndarray,
+    total_study_hours: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized distribute_study_hours ('proportional' strategy).
+
+    Args:
+        difficulty: Difficulty score per course, shape (courses,) or
+            (scenarios, courses).
+        active: Boolean enrollment mask, shape (scenarios, courses).
+        total_study_hours: Study budget per scenario, shape (scenarios,).
+
+    Returns:
+        Study hours per course, shape (scenarios, courses); 0 where inactive.
+    """
+    weights = np.where(active, difficulty, 0.0)
+    # Column-by-column so the sum runs in the same order as the scalar path
+    total_difficulty = np.zeros(active.shape[0])
+    for j in range(active.shape[1]):
+        total_difficulty = total_difficulty + weights[:, j]
+    total_difficulty = np.where(total_difficulty == 0.0, 1.0, total_difficulty)
+    share = weights / total_difficulty[:, None]
+    return np.where(active, share * total_study_hours[:, None], 0.0)
+
+
+def compute_weekly_load_batch(
+    difficulty: np.ndarray,
+    workload: np.ndarray,
+    active: np.ndarray,
+    study_hours: np.ndarray,
+    prior_fatigue: np.ndarray,
+    sleep_hours: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized compute_weekly_load over many scenarios.
+
+    Args:
+        difficulty: Difficulty score per course, shape (courses,) or
+            (scenarios, courses).
+        workload: Weekly workload hours per course, same shape as difficulty.
+        active: Boolean enrollment mask, shape (scenarios, courses).
+        study_hours: Study hours per course, shape (scenarios, courses).
+        prior_fatigue: Fatigue carry-over per scenario, shape (scenarios,).
+        sleep_hours: Total weekly sleep per scenario, shape (scenarios,).
+
+    Returns:
+        Cognitive load per scenario in range [0, 100].
+    """
+    study_cap = np.maximum(workload * 2.0, 6.0)
+    weighted = np.where(active, difficulty * np.minimum(study_hours, study_cap), 0.0)
+    raw_load = np.zeros(active.shape[0])
+    for j in range(active.shape[1]):
+        raw_load = raw_load + weighted[:, j]
+
+    # Matrix products count courses faster than boolean sums
+    normalizer = (active @ np.ones(active.shape[1])) * 60.0
+    safe_normalizer = np.where(normalizer > 0, normalizer, 1.0)
+    raw_load = np.where(normalizer > 0, (raw_load / safe_normalizer) * MAX_LOAD, 0.0)
+
+    hard_courses = (active & (difficulty > 7.0)) @ np.ones(active.shape[1])
+    sequencing_penalty = np.maximum(0, hard_courses - 1) * 5.0
+
+    fatigue_multiplier = 1.0 + (prior_fatigue * 0.4)
+    sleep_penalty = np.maximum(0.0, 49.0 - sleep_hours) * 2.0
+
+    load = raw_load * fatigue_multiplier + sequencing_penalty + sleep_penalty
+    return np.clip(load, 0.0, MAX_LOAD)
@@ -0,0 +1,216 @@
+"""
+Cohort Runs.
+
+Simulates — or goal-targets — a whole cohort of students for an advisor.
+Each student has their own course list, so a chunk of students is stacked
+into one CourseStack (one padded course table per scenario) and simulated
+by a single `SimulationEngine.run_batch` call instead of one run per
+student.
+
+Goal targeting advances every student's search (`goal_search_steps`) in
+lockstep: each round gathers the pending schedules of all students in the
+chunk into one batch, so a chunk costs about as many batch calls as a
+single student's search.
+
+Chunks are independent, so they can be farmed out to a process pool; results
+come back chunk by chunk, in member order, for streaming.
+"""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, NamedTuple
+
+from app.schemas.simulation import (
+    CohortRequest,
+    CohortStudentResult,
+    GoalTargetRequest,
+    ScenarioConfig,
+)
+from app.simulation.course_table import CourseStack, CourseTable
+from app.simulation.engine import SimulationEngine
+from app.simulation.goal_search import GoalSearchOutcome, goal_search_steps
+from app.simulation.monte_carlo import resolve_workers
+
+
+# ScenarioConfig caps work hours at this value
+_MAX_SCENARIO_WORK_HOURS: float = 60.0
+
+
+class CohortMember(NamedTuple):
+    """A student's inputs to a cohort run (plain data, so it pickles)."""
+
+    student_id: int
+    courses: CourseTable
+    work_hours: float
+    sleep_hours: float
+    target_gpa: float
+
+
+def _skipped(member: CohortMember) -> CohortStudentResult | None:
+    if not member.courses:
+        return CohortStudentResult(student_id=member.student_id, detail="No courses enrolled.")
+    return None
+
+
+def _target_gpa(member: CohortMember, request: CohortRequest) -> float:
+    return request.target_gpa if request.target_gpa is not None else member.target_gpa
+
+
+def _current_config(member: CohortMember, request: CohortRequest) -> ScenarioConfig:
+    return ScenarioConfig(
+        student_id=member.student_id,
+        num_weeks=request.num_weeks,
+        work_hours_per_week=min(max(member.work_hours, 0.0), _MAX_SCENARIO_WORK_HOURS),
+        sleep_target_hours=member.sleep_hours,
+        study_strategy=request.study_strategy,
+        exam_weeks=request.exam_weeks,
+    )
+
+
+def _simulate_chunk(
+    members: list[CohortMember],
+    request: CohortRequest,
+) -> tuple[list[CohortStudentResult], int]:
+    """
+    Simulate each member's current schedule, all in one batch.
+
+    Returns:
+        (results in member order, simulations run).
+    """
+    results = [_skipped(member) for member in members]
+    runnable = [k for k, result in enumerate(results) if result is None]
+    if runnable:
+        batch = SimulationEngine().run_batch(
+            [_current_config(members[k], request) for k in runnable],
+            CourseStack(tuple(members[k].courses for k in runnable)),
+        )
+        for row, k in enumerate(runnable):
+            lite = batch.lite(row)
+            results[k] = CohortStudentResult(
+                student_id=members[k].student_id,
+                predicted_gpa=lite.predicted_gpa_mean,
+                burnout_probability=lite.burnout_probability,
+                burnout_risk=lite.burnout_risk,
+            )
+    return results, len(runnable)
+
+
+def _goal_chunk(
+    members: list[CohortMember],
+    request: CohortRequest,
+) -> tuple[list[CohortStudentResult], int]:
+    """
+    Goal-target every member, advancing all searches in lockstep.
+
+    Each round batches the pending schedules of every unfinished search;
+    a final batch simulates the chosen schedules for their burnout risk.
+
+    Returns:
+        (results in member order, simulations run).
+    """
+    engine = SimulationEngine()
+    results = [_skipped(member) for member in members]
+    searches = {}
+    pending: dict[int, list[ScenarioConfig]] = {}
+    for k, member in enumerate(members):
+        if results[k] is not None:
+            continue
+        goal = GoalTargetRequest(
+            student_id=member.student_id,
+            target_gpa=_target_gpa(member, request),
+            num_weeks=request.num_weeks,
+            max_work_hours=request.max_work_hours,
+            exam_weeks=request.exam_weeks,
+            work_step=request.work_step,
+            sleep_step=request.sleep_step,
+        )
+        searches[k] = goal_search_steps(member.courses, goal, member.work_hours, member.sleep_hours)
+        pending[k] = next(searches[k])
+
+    # Padded once; every round takes one row per pending schedule
+    stack = CourseStack(tuple(member.courses for member in members))
+    outcomes: dict[int, GoalSearchOutcome] = {}
+    evaluations = 0
+    while pending:
+        order = list(pending)
+        configs = [cfg for k in order for cfg in pending[k]]
+        gpas = engine.run_batch(
+            configs, stack.take([k for k in order for _ in pending[k]])
+        ).predicted_gpa_means()
+        evaluations += len(configs)
+        offset = 0
+        for k in order:
+            count = len(pending.pop(k))
+            try:
+                pending[k] = searches[k].send(gpas[offset:offset + count])
+            except StopIteration as done:
+                outcomes[k] = done.value
+            offset += count
+
+    if outcomes:
+        order = list(outcomes)
+        batch = engine.run_batch([outcomes[k].config for k in order], stack.take(order))
+        evaluations += len(order)
+        for row, k in enumerate(order):
+            outcome, lite = outcomes[k], batch.lite(row)
+            results[k] = CohortStudentResult(
+                student_id=members[k].student_id,
+                predicted_gpa=outcome.predicted_gpa,
+                burnout_probability=lite.burnout_probability,
+                burnout_risk=lite.burnout_risk,
+                target_gpa=_target_gpa(members[k], request),
+                achievable=outcome.achievable,
+                recommended_work_hours=outcome.config.work_hours_per_week,
+                recommended_sleep_hours=outcome.config.sleep_target_hours,
+                recommended_strategy=outcome.config.study_strategy,
+                adjustment_hours=outcome.adjustment_hours,
+            )
+    return results, evaluations
+
+
+_CHUNK_RUNNERS = {"simulate": _simulate_chunk, "goal_target": _goal_chunk}
+
+
+def iter_cohort(
+    members: list[CohortMember],
+    request: CohortRequest,
+    stop: threading.Event | None = None,
+) -> Iterator[tuple[list[CohortStudentResult], int]]:
+    """
+    Run the cohort chunk by chunk, serially or from a process pool.
+
+    Args:
+        members: Students to run, in output order.
+        request: CohortRequest (mode, horizon, chunk size, workers, ...).
+        stop: Optional event that ends the run between chunks, for callers
+            that advance the iterator from a worker thread (where `close()`
+            fails while a chunk is running).
+
+    Yields:
+        (results, simulations run) per chunk of `request.chunk_size`
+        members, in member order. Closing the iterator early, or setting
+        `stop`, cancels chunks that have not started yet.
+    """
+    run_chunk = _CHUNK_RUNNERS[request.mode]
+    chunks = [
+        members[start:start + request.chunk_size]
+        for start in range(0, len(members), request.chunk_size)
+    ]
+
+    workers = min(resolve_workers(request.workers), len(chunks))
+    if workers <= 1:
+        for chunk in chunks:
+            result = run_chunk(chunk, request)
+            if stop is not None and stop.is_set():
+                return
+            yield result
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        for result in pool.map(run_chunk, chunks, [request] * len(chunks)):
+            if stop is not None and stop.is_set():
+                return
+            yield result
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,183 @@
+"""
+Course Table.
+
+Immutable, session-free snapshot of a student's enrolled courses. Built once
+from the ORM rows returned by `crud.get_courses_for_student`, it exposes the
+course attributes both as column arrays (for the vectorized kernels) and as
+lightweight `CourseRecord` tuples (for the scalar subsystem functions, which
+only read `id`, `name`, `credits`, `difficulty_score` and
+`weekly_workload_hours`).
+
+Because it holds no SQLAlchemy state, a CourseTable can be pickled and sent
+to worker processes, hashed, and reused across many simulation runs.
+
+A CourseStack holds one CourseTable per scenario, padded to a common width,
+so scenarios with different course lists (a cohort of students) can share
+one vectorized engine pass.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Iterator, NamedTuple
+
+import numpy as np
+
+
+class CourseRecord(NamedTuple):
+    """One course row, readable wherever a Course ORM object was expected."""
+
+    id: int
+    name: str
+    credits: int
+    difficulty_score: float
+    weekly_workload_hours: float
+
+
+@dataclass(frozen=True)
+class CourseTable:
+    """
+    Array-backed, read-only view of a course list.
+
+    Attributes:
+        records: One CourseRecord per course, in enrollment order.
+        ids, credits, difficulty, workload: Read-only column arrays aligned
+            with `records`.
+        names: Course names aligned with `records`.
+    """
+
+    records: tuple[CourseRecord, ...]
+    ids: np.ndarray = field(init=False, repr=False, compare=False)
+    names: tuple[str, ...] = field(init=False, repr=False, compare=False)
+    credits: np.ndarray = field(init=False, repr=False, compare=False)
+    difficulty: np.ndarray = field(init=False, repr=False, compare=False)
+    workload: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        columns = {
+            "ids": np.array([r.id for r in self.records], dtype=int),
+            "credits": np.array([r.credits for r in self.records], dtype=int),
+            "difficulty": np.array([r.difficulty_score for r in self.records], dtype=float),
+            "workload": np.array([r.weekly_workload_hours for r in self.records], dtype=float),
+        }
+        for name, values in columns.items():
+            values.flags.writeable = False
+            object.__setattr__(self, name, values)
+        object.__setattr__(self, "names", tuple(r.name for r in self.records))
+
+    def __reduce__(self):
+        # Rebuild from the records so the column arrays come back read-only
+        return (CourseTable, (self.records,))
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[CourseRecord]:
+        return iter(self.records)
+
+    @classmethod
+    def from_courses(cls, courses) -> "CourseTable":
+        """
+        Snapshot Course ORM objects (or anything with the same attributes).
+
+        Args:
+            courses: Iterable of Course objects, or an existing CourseTable
+                (returned unchanged).
+
+        Returns:
+            CourseTable with one record per course, in the given order.
+        """
+        if isinstance(courses, cls):
+            return courses
+        return cls(tuple(
+            CourseRecord(
+                id=c.id,
+                name=c.name,
+                credits=int(c.credits),
+                difficulty_score=float(c.difficulty_score),
+                weekly_workload_hours=float(c.weekly_workload_hours),
+            )
+            for c in courses
+        ))
+
+    def fingerprint(self) -> str:
+        """
+        Hex SHA-256 of the course parameters, independent of course order.
+
+        Two tables share a fingerprint exactly when they hold the same
+        courses with the same names, credits, difficulty and workload.
+        """
+        payload = json.dumps(sorted(list(r) for r in self.records), separators=(",", ":"))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def select(self, course_ids) -> "CourseTable":
+        """Courses whose id is in `course_ids`, keeping table order."""
+        wanted = set(course_ids)
+        return CourseTable(tuple(r for r in self.records if r.id in wanted))
+
+
+_STACK_COLUMNS = ("ids", "credits", "difficulty", "workload", "present")
+
+
+@dataclass(frozen=True)
+class CourseStack:
+    """
+    Per-scenario course tables padded to a common width.
+
+    Column arrays have shape (scenarios, width); row k holds `tables[k]`'s
+    courses in order, followed by padding slots that are False in `present`
+    (and zero elsewhere).
+
+    Attributes:
+        tables: One CourseTable per scenario.
+        ids, credits, difficulty, workload: (scenarios, width) column arrays.
+        present: (scenarios, width) mask of real (non-padding) courses.
+    """
+
+    tables: tuple[CourseTable, ...]
+    ids: np.ndarray = field(init=False, repr=False, compare=False)
+    credits: np.ndarray = field(init=False, repr=False, compare=False)
+    difficulty: np.ndarray = field(init=False, repr=False, compare=False)
+    workload: np.ndarray = field(init=False, repr=False, compare=False)
+    present: np.ndarray = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        width = max((len(table) for table in self.tables), default=0)
+        shape = (len(self.tables), width)
+        columns = {
+            "ids": np.zeros(shape, dtype=int),
+            "credits": np.zeros(shape, dtype=int),
+            "difficulty": np.zeros(shape, dtype=float),
+            "workload": np.zeros(shape, dtype=float),
+            "present": np.zeros(shape, dtype=bool),
+        }
+        for k, table in enumerate(self.tables):
+            count = len(table)
+            for name in ("ids", "credits", "difficulty", "workload"):
+                columns[name][k, :count] = getattr(table, name)
+            columns["present"][k, :count] = True
+        for name, values in columns.items():
+            values.flags.writeable = False
+            object.__setattr__(self, name, values)
+
+    def __reduce__(self):
+        return (CourseStack, (self.tables,))
+
+    def __len__(self) -> int:
+        return len(self.tables)
+
+    def take(self, rows) -> "CourseStack":
+        """
+        Stack of the given scenario rows, in that order (rows may repeat).
+
+        Slices the padded arrays instead of re-padding, so the result keeps
+        this stack's width.
+        """
+        rows = np.asarray(rows, dtype=int)
+        stack = object.__new__(CourseStack)
+        object.__setattr__(stack, "tables", tuple(self.tables[k] for k in rows.tolist()))
+        for name in _STACK_COLUMNS:
+            values = getattr(self, name)[rows]
+            values.flags.writeable = False
+            object.__setattr__(stack, name, values)
+        return stack
@@ -13,17 +13,35 @@ Simulation tick order (each week):
   6. RecoveryModel → update fatigue carry-over
 
 All subsystems are pure functions — the engine owns mutable state.
+
+`run_batch()` advances many scenarios at once: every per-week quantity
+becomes a NumPy array with one row per scenario (and one column per course),
+and each subsystem's `*_batch` counterpart applies the same formulas
+element-wise. It reproduces `run()` scenario-for-scenario. An optional
+WeeklyNoise perturbs sleep and study per scenario and week (Monte Carlo).
+
+`run_lite()` (and `BatchSimulationResult.lite()`) return only the summary
+numbers, skipping trace construction for search callers. Full results keep
+their weekly history as a columnar SimulationTrace; WeeklySnapshot models are
+only built when a response serializes them.
+
+`run_with_checkpoints()` records the engine state after every week;
+`resume()` continues from one of those checkpoints under an edited config,
+so a what-if that only changes later weeks re-simulates just those weeks.
 """
 
+import copy
 import statistics
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 
+import numpy as np
+
 from app.schemas.simulation import (
     ScenarioConfig,
     SimulationResult,
     SimulationSummary,
-    TimeAllocation,
-    WeeklySnapshot,
+    SimulationTrace,
 )
 from app.simulation import (
     cognitive_load as cl,
@@ -32,6 +50,8 @@ from app.simulation import (
     retention_model as ret,
     time_system as ts,
 )
+from app.simulation.course_table import CourseStack, CourseTable
+from app.simulation.result_cache import SimulationCache, cache_key
 
 
 # 7 hours/night × 7 nights = recommended weekly sleep hours
@@ -40,6 +60,10 @@ _RECOMMENDED_WEEKLY_SLEEP_HOURS: float = 49.0
 # Variable sleep schedule: weekday 6.5h × 5 + weekend 9h × 2 = 50.5h/week
 _VARIABLE_SLEEP_WEEKLY: float = 6.5 * 5 + 9.0 * 2  # 50.5h
 
+# Weekly sleep bounds for noisy runs (4–12 h/night, as ScenarioConfig allows)
+_MIN_WEEKLY_SLEEP: float = 4.0 * 7
+_MAX_WEEKLY_SLEEP: float = 12.0 * 7
+
 
 class SimulationEngine:
     """
@@ -48,12 +72,20 @@ class SimulationEngine:
     Call `run()` with a ScenarioConfig and the resolved student/courses
     objects. The engine creates a fresh simulation state each call,
     making it safe for concurrent use.
+
+    Args:
+        cache: Optional SimulationCache consulted by `run()` and `run_lite()`
+            before simulating; results are deterministic, so identical
+            config + course parameters are served from the cache.
     """
 
+    def __init__(self, cache: SimulationCache | None = None):
+        self.cache = cache
+
     def run(
         self,
         config: ScenarioConfig,
-        courses: list,
+        courses: CourseTable | list,
         student,
     ) -> SimulationResult:
         """
@@ -61,219 +93,1109 @@ class SimulationEngine:
 
         Args:
             config: ScenarioConfig controlling all simulation parameters.
-            courses: List of Course ORM objects enrolled in this scenario.
+            courses: CourseTable (or list of Course ORM objects) for this scenario.
             student: Student ORM object.
 
         Returns:
             SimulationResult with per-week snapshots and summary statistics.
         """
-        # Filter courses to those included in the scenario
-        if config.include_course_ids:
-            courses = [c for c in courses if c.id in config.include_course_ids]
+        courses = CourseTable.from_courses(courses)
+        if self.cache is not None:
+            key = cache_key(config, courses)
+            cached = self.cache.get(key)
+            if cached is not None:
+                # Fresh wrapper so callers can set id/created_at without touching the cache
+                return cached.model_copy(update={
+                    "scenario_config": config,
+                    "created_at": datetime.now(timezone.utc),
+                })
+
+        result = _result_from_history(config, _simulate(config, courses))
+        if self.cache is not None:
+            self.cache.put(key, config.student_id, result.model_copy())
+        return result
+
+    def run_with_checkpoints(
+        self,
+        config: ScenarioConfig,
+        courses: CourseTable | list,
+        student,
+    ) -> tuple[SimulationResult, list["SimulationCheckpoint"]]:
+        """
+        Execute the full simulation and keep a resumable checkpoint per week.
+
+        Args:
+            config: ScenarioConfig controlling all simulation parameters.
+            courses: CourseTable (or list of Course ORM objects) for this scenario.
+            student: Student ORM object.
+
+        Returns:
+            (result, checkpoints) where checkpoints[k - 1] holds the state at
+            the end of week k.
+        """
+        checkpoints: list[SimulationCheckpoint] = []
+        history = _simulate(config, CourseTable.from_courses(courses), checkpoints=checkpoints)
+        return _result_from_history(config, history), checkpoints
+
+    def resume(
+        self,
+        checkpoint: "SimulationCheckpoint",
+        new_config: ScenarioConfig,
+        student=None,
+    ) -> SimulationResult:
+        """
+        Re-simulate only the weeks after a checkpoint under an edited config.
+
+        Weeks 1..checkpoint.week are reused as-is; `new_config` drives the
+        remaining weeks (see `divergence_week` for choosing a checkpoint that
+        makes the result identical to a full run of `new_config`).
+
+        Args:
+            checkpoint: State at the end of some week of an earlier run.
+            new_config: Config for the remaining weeks; must select the same
+                courses and have num_weeks >= checkpoint.week.
+            student: Student ORM object (unused; accepted for symmetry with run()).
+
+        Returns:
+            SimulationResult covering all new_config.num_weeks weeks.
+
+        Raises:
+            ValueError: If the config selects different courses or is shorter
+                than the checkpoint.
+        """
+        history = _simulate(new_config, checkpoint.courses, start=checkpoint)
+        return _result_from_history(new_config, history)
 
-        if not courses:
-            raise ValueError("No courses selected for simulation.")
+    def run_lite(
+        self,
+        config: ScenarioConfig,
+        courses: CourseTable | list,
+        student=None,
+        weekly: bool = False,
+    ) -> "LiteResult":
+        """
+        Execute the simulation but return only the summary metrics.
+
+        Skips building the weekly trace and the recommendation text —
+        intended for search loops (optimizer, goal targeting, Monte Carlo)
+        that only compare headline numbers.
+
+        Args:
+            config: ScenarioConfig controlling all simulation parameters.
+            courses: CourseTable (or list of Course ORM objects) for this scenario.
+            student: Student ORM object (unused; accepted for symmetry with run()).
+            weekly: Also return the raw per-week GPA, load and burnout arrays.
 
-        course_credits = {c.name: c.credits for c in courses}
+        Returns:
+            LiteResult whose summary fields equal those of `run()`.
+        """
+        courses = CourseTable.from_courses(courses)
+        if self.cache is not None:
+            key = cache_key(config, courses, kind="lite-weekly" if weekly else "lite")
+            cached = self.cache.get(key)
+            if cached is not None:
+                return replace(cached)
 
-        # Effective weekly sleep (variable schedule: more sleep on weekends)
-        effective_sleep_target = (
-            _VARIABLE_SLEEP_WEEKLY / 7.0
-            if config.sleep_schedule == "variable"
-            else config.sleep_target_hours
+        history = _simulate(config, courses)
+        lite = _build_lite_result(
+            final_gpa=history.final_gpa,
+            gpa_std=history.gpa_std,
+            burnout_probability=history.final_burnout_probability,
+            peak_overload_weeks=history.peak_overload_weeks(),
+            avg_sleep_per_week=sum(history.sleep) / len(history.sleep),
+            required_study=history.required_study,
         )
+        if weekly:
+            lite.weekly_gpa = np.array(history.gpa)
+            lite.weekly_cognitive_load = np.array(history.load)
+            lite.weekly_burnout_probability = np.array(history.burnout)
+        if self.cache is not None:
+            self.cache.put(key, config.student_id, replace(lite))
+        return lite
 
-        # ── Mutable state ──────────────────────────────────────────────────
-        fatigue: float = 0.0
-        retention_per_course: dict[int, float] = {c.id: 0.0 for c in courses}
+    def run_batch(
+        self,
+        configs: list[ScenarioConfig],
+        courses: CourseTable | CourseStack | list,
+        noise: "WeeklyNoise | None" = None,
+    ) -> "BatchSimulationResult":
+        """
+        Execute many scenarios over the same course list in one vectorized pass.
 
-        # History accumulators for summary stats
-        load_history: list[float] = []
-        sleep_history: list[float] = []
-        recovery_hours_history: list[float] = []
-        gpa_history: list[float] = []
-        weekly_grades_history: list[dict[str, float]] = []
-        weekly_snapshots: list[WeeklySnapshot] = []
-
-        # ── Week-by-week simulation ────────────────────────────────────────
-        for week in range(1, config.num_weeks + 1):
-            is_exam_week = week in (config.exam_weeks or [])
-
-            # Handle mid-semester course drop
-            if (
-                config.drop_course_id is not None
-                and config.drop_at_week is not None
-                and week > config.drop_at_week
-            ):
-                active_courses = [c for c in courses if c.id != config.drop_course_id]
-            else:
-                active_courses = courses
-
-            if not active_courses:
-                active_courses = courses  # safety: never drop all courses
+        Scenarios are grouped by `num_weeks`; within a group all of them step
+        through the week loop together as (scenario × course) arrays.
 
-            # 1. Time system — during exam weeks squeeze soft reserves for more study
-            alloc: ts.TimeAllocation = ts.allocate_time(
-                courses=active_courses,
-                work_hours=config.work_hours_per_week,
-                sleep_target_hours=effective_sleep_target,
-                study_strategy=config.study_strategy,
-                recovery_hours=2.0 if is_exam_week else 4.0,
-                social_hours=2.0 if is_exam_week else 5.0,
-                extracurricular_hours=config.extracurricular_hours,
+        Args:
+            configs: ScenarioConfigs to simulate (each may select its own
+                courses via include_course_ids, drop a course, etc.).
+            courses: CourseTable (or list of Course ORM objects) shared by all
+                scenarios, or a CourseStack with one table per config (e.g.
+                one student each).
+            noise: Optional per-week perturbations, one row per config
+                (used by Monte Carlo). Without it the run is deterministic.
+
+        Returns:
+            BatchSimulationResult holding per-week arrays for every scenario;
+            `result(i)` materializes the same SimulationResult `run()` returns.
+
+        Raises:
+            ValueError: If any scenario selects no courses.
+        """
+        stacked = isinstance(courses, CourseStack)
+        if stacked and len(courses) != len(configs):
+            raise ValueError("CourseStack needs one course table per config.")
+        course_table = courses if stacked else CourseTable.from_courses(courses)
+        num_scenarios = len(configs)
+        max_weeks = max((cfg.num_weeks for cfg in configs), default=0)
+        num_courses = course_table.ids.shape[-1]
+
+        batch = BatchSimulationResult(
+            configs=list(configs),
+            course_names=[] if stacked else list(course_table.names),
+            num_weeks=np.array([cfg.num_weeks for cfg in configs], dtype=int),
+            cognitive_load=np.full((num_scenarios, max_weeks), np.nan),
+            predicted_gpa=np.full((num_scenarios, max_weeks), np.nan),
+            burnout_probability=np.full((num_scenarios, max_weeks), np.nan),
+            fatigue_level=np.full((num_scenarios, max_weeks), np.nan),
+            retention_score=np.full((num_scenarios, max_weeks), np.nan),
+            is_exam_week=np.zeros((num_scenarios, max_weeks), dtype=bool),
+            time_allocation={
+                name: np.full((num_scenarios, max_weeks), np.nan)
+                for name in _ALLOCATION_FIELDS
+            },
+            course_grades=np.full((num_scenarios, max_weeks, num_courses), np.nan),
+            course_retentions=np.full((num_scenarios, max_weeks, num_courses), np.nan),
+            carried_course=np.full((num_scenarios, max_weeks), -1, dtype=int),
+            final_gpa=np.zeros(num_scenarios),
+            gpa_std=np.zeros(num_scenarios),
+            final_burnout_probability=np.zeros(num_scenarios),
+            avg_cognitive_load=np.zeros(num_scenarios),
+            avg_sleep_per_week=np.zeros(num_scenarios),
+            required_study=np.zeros(num_scenarios),
+            row_course_names=(
+                [table.names for table in course_table.tables] if stacked else None
+            ),
+        )
+
+        for num_weeks in sorted(set(batch.num_weeks.tolist())):
+            rows = np.flatnonzero(batch.num_weeks == num_weeks)
+            _simulate_group(
+                [configs[i] for i in rows],
+                course_table.take(rows) if stacked else course_table,
+                num_weeks, batch, rows,
+                noise=noise.rows(rows, num_weeks) if noise is not None else None,
             )
+        return batch
 
-            # 2. Distribute study hours across active courses
-            total_study = alloc.deep_study_hours + alloc.shallow_study_hours
-            study_per_course = cl.distribute_study_hours(
-                courses=active_courses,
-                total_study_hours=total_study,
+
+@dataclass
+class _ScenarioHistory:
+    """
+    Raw (unrounded) per-week state recorded by `_simulate`.
+
+    The per-week lists are append-only while a scenario runs, so checkpoints
+    can share them and later copy just the prefix they cover.
+    """
+
+    load: list[float] = field(default_factory=list)
+    sleep: list[float] = field(default_factory=list)
+    gpa: list[float] = field(default_factory=list)
+    burnout: list[float] = field(default_factory=list)
+    fatigue: list[float] = field(default_factory=list)
+    retention_score: list[float] = field(default_factory=list)
+    allocations: list[ts.TimeAllocation] = field(default_factory=list)
+    course_grades: list[dict[str, float]] = field(default_factory=list)
+    course_retentions: list[dict[str, float]] = field(default_factory=list)
+    is_exam_week: list[bool] = field(default_factory=list)
+    final_gpa: float = 0.0
+    gpa_std: float = 0.0
+    final_burnout_probability: float = 0.0
+    required_study: float = 0.0
+
+    def prefix(self, weeks: int) -> "_ScenarioHistory":
+        """Copy of the first `weeks` weeks of per-week state (summary fields reset)."""
+        return _ScenarioHistory(
+            load=self.load[:weeks],
+            sleep=self.sleep[:weeks],
+            gpa=self.gpa[:weeks],
+            burnout=self.burnout[:weeks],
+            fatigue=self.fatigue[:weeks],
+            retention_score=self.retention_score[:weeks],
+            allocations=self.allocations[:weeks],
+            course_grades=self.course_grades[:weeks],
+            course_retentions=self.course_retentions[:weeks],
+            is_exam_week=self.is_exam_week[:weeks],
+        )
+
+    def peak_overload_weeks(self) -> list[int]:
+        """Weeks whose (rounded) cognitive load exceeds the overload threshold."""
+        return [
+            week
+            for week, load in enumerate(self.load, start=1)
+            if round(load, 2) > cl.LOAD_OVERLOAD_THRESHOLD
+        ]
+
+
+@dataclass(frozen=True, eq=False)
+class SimulationCheckpoint:
+    """
+    Resumable simulation state at the end of `week`.
+
+    Produced by `SimulationEngine.run_with_checkpoints`; pass one to
+    `SimulationEngine.resume` to re-simulate only the weeks after it.
+
+    Attributes:
+        week: Last simulated week (1-based).
+        config: Scenario config that produced weeks 1..week.
+        courses: Courses the scenario simulated (after include filtering).
+        fatigue: Fatigue carried into week + 1.
+        retention: Per-course retention keyed by course id.
+        burnout: Burnout accumulator over weeks 1..week.
+    """
+
+    week: int
+    config: ScenarioConfig
+    courses: CourseTable
+    fatigue: float
+    retention: dict[int, float]
+    burnout: rm.BurnoutAccumulator
+    history: _ScenarioHistory = field(repr=False)
+
+
+def _simulate(
+    config: ScenarioConfig,
+    courses: CourseTable,
+    start: SimulationCheckpoint | None = None,
+    checkpoints: list[SimulationCheckpoint] | None = None,
+) -> _ScenarioHistory:
+    """
+    Advance one scenario week by week and record its raw history.
+
+    Args:
+        config: Scenario to simulate.
+        courses: Course table (before include filtering).
+        start: Resume after this checkpoint instead of from week 1; weeks up
+            to `start.week` are taken from it.
+        checkpoints: If given, a checkpoint is appended after every week.
+    """
+    # Filter courses to those included in the scenario
+    if config.include_course_ids:
+        courses = courses.select(config.include_course_ids)
+
+    if not courses:
+        raise ValueError("No courses selected for simulation.")
+    if start is not None:
+        if courses != start.courses:
+            raise ValueError("A resumed scenario must simulate the same courses as its checkpoint.")
+        if config.num_weeks < start.week:
+            raise ValueError(
+                f"Cannot resume a week-{start.week} checkpoint into a "
+                f"{config.num_weeks}-week scenario."
             )
 
-            # 3. Cognitive load — apply 1.3× exam pressure multiplier
-            weekly_load = cl.compute_weekly_load(
+    all_courses = courses.records
+    course_credits = dict(zip(courses.names, courses.credits.tolist()))
+
+    # Enrollment before and after a mid-semester drop (never drop all courses)
+    dropping = config.drop_course_id is not None and config.drop_at_week is not None
+    remaining_courses = all_courses
+    dropped = None
+    if dropping:
+        remaining_courses = (
+            tuple(c for c in all_courses if c.id != config.drop_course_id) or all_courses
+        )
+        dropped = next((c for c in all_courses if c.id == config.drop_course_id), None)
+
+    # Effective weekly sleep (variable schedule: more sleep on weekends)
+    effective_sleep_target = (
+        _VARIABLE_SLEEP_WEEKLY / 7.0
+        if config.sleep_schedule == "variable"
+        else config.sleep_target_hours
+    )
+
+    first_week = 1 if start is None else start.week + 1
+
+    # ── Week-type table ────────────────────────────────────────────────
+    # The time budget and study split depend only on exam pressure and on
+    # the enrollment phase (before/after a drop), so each distinct week type
+    # is computed once and reused.
+    exam_weeks = set(config.exam_weeks or [])
+    week_types = [
+        (week in exam_weeks, dropping and week > config.drop_at_week)
+        for week in range(first_week, config.num_weeks + 1)
+    ]
+    week_plans: dict[tuple[bool, bool], tuple[ts.TimeAllocation, dict[int, float]]] = {}
+    for is_exam_week, after_drop in set(week_types):
+        active_courses = remaining_courses if after_drop else all_courses
+        # 1. Time system — during exam weeks squeeze soft reserves for more study
+        alloc = ts.allocate_time(
+            courses=active_courses,
+            work_hours=config.work_hours_per_week,
+            sleep_target_hours=effective_sleep_target,
+            study_strategy=config.study_strategy,
+            recovery_hours=2.0 if is_exam_week else 4.0,
+            social_hours=2.0 if is_exam_week else 5.0,
+            extracurricular_hours=config.extracurricular_hours,
+        )
+        # 2. Distribute study hours across active courses
+        week_plans[is_exam_week, after_drop] = (
+            alloc,
+            cl.distribute_study_hours(
                 courses=active_courses,
-                study_hours_per_course=study_per_course,
-                prior_fatigue=fatigue,
-                sleep_hours=alloc.sleep_hours,
-            )
-            if is_exam_week:
-                weekly_load = min(100.0, weekly_load * 1.3)
-
-            # 4. Retention update per active course
-            for course in active_courses:
-                retention_per_course[course.id] = ret.update_retention(
-                    prior_retention=retention_per_course[course.id],
-                    study_hours=study_per_course.get(course.id, 0.0),
-                    study_strategy=config.study_strategy,
-                )
-
-            # 5. Burnout probability — computed BEFORE grades (exam modifier needs it)
-            burnout_prob = rm.compute_burnout_probability(
-                load_history=load_history + [weekly_load],
-                sleep_history=sleep_history + [alloc.sleep_hours],
-                recovery_history=recovery_hours_history + [alloc.recovery_hours],
-            )
+                total_study_hours=alloc.deep_study_hours + alloc.shallow_study_hours,
+            ),
+        )
 
-            # 6. Performance prediction per active course
-            course_grades: dict[str, float] = {}
-            for course in active_courses:
-                grade = pm.predict_grade(
-                    course=course,
-                    weekly_study_hours=study_per_course.get(course.id, 0.0),
-                    avg_cognitive_load=weekly_load,
-                    cumulative_retention=retention_per_course[course.id],
-                    is_exam_week=is_exam_week,
-                    burnout_probability=burnout_prob,
-                )
-                course_grades[course.name] = grade
-
-            # Dropped course keeps its last recorded grade (frozen after drop)
-            if config.drop_course_id is not None and config.drop_at_week is not None:
-                dropped = next((c for c in courses if c.id == config.drop_course_id), None)
-                if dropped and dropped.name not in course_grades and weekly_grades_history:
-                    course_grades[dropped.name] = weekly_grades_history[-1].get(
-                        dropped.name, 0.0
-                    )
-
-            weekly_gpa = pm.compute_gpa(course_grades, course_credits)
-
-            # 7. Fatigue update
-            fatigue = rm.compute_recovery(
-                current_fatigue=fatigue,
-                sleep_hours=alloc.sleep_hours,
-                recovery_hours=alloc.recovery_hours,
-            )
+    # ── Mutable state ──────────────────────────────────────────────────
+    if start is None:
+        fatigue: float = 0.0
+        retention_per_course: dict[int, float] = {c.id: 0.0 for c in courses}
+        burnout_state = rm.BurnoutAccumulator()
+        history = _ScenarioHistory()
+    else:
+        fatigue = start.fatigue
+        retention_per_course = dict(start.retention)
+        burnout_state = copy.copy(start.burnout)
+        history = start.history.prefix(start.week)
+
+    # ── Week-by-week simulation ────────────────────────────────────────
+    for week, (is_exam_week, after_drop) in enumerate(week_types, start=first_week):
+        active_courses = remaining_courses if after_drop else all_courses
+        alloc, study_per_course = week_plans[is_exam_week, after_drop]
+
+        # 3. Cognitive load — apply 1.3× exam pressure multiplier
+        weekly_load = cl.compute_weekly_load(
+            courses=active_courses,
+            study_hours_per_course=study_per_course,
+            prior_fatigue=fatigue,
+            sleep_hours=alloc.sleep_hours,
+        )
+        if is_exam_week:
+            weekly_load = min(100.0, weekly_load * 1.3)
 
-            # ── Accumulate history ─────────────────────────────────────────
-            load_history.append(weekly_load)
-            sleep_history.append(alloc.sleep_hours)
-            recovery_hours_history.append(alloc.recovery_hours)
-            gpa_history.append(weekly_gpa)
-            weekly_grades_history.append(course_grades)
-
-            # ── Build snapshot ─────────────────────────────────────────────
-            avg_retention = (
-                sum(retention_per_course.values()) / len(retention_per_course)
-                if retention_per_course else 0.0
+        # 4. Retention update per active course
+        for course in active_courses:
+            retention_per_course[course.id] = ret.update_retention(
+                prior_retention=retention_per_course[course.id],
+                study_hours=study_per_course.get(course.id, 0.0),
+                study_strategy=config.study_strategy,
             )
 
-            snapshot = WeeklySnapshot(
-                week=week,
-                cognitive_load=round(weekly_load, 2),
-                predicted_gpa=round(weekly_gpa, 2),
-                burnout_probability=round(burnout_prob, 3),
-                fatigue_level=round(fatigue, 3),
-                retention_score=round(avg_retention, 3),
-                time_allocation=TimeAllocation(
-                    class_hours=alloc.class_hours,
-                    work_hours=alloc.work_hours,
-                    sleep_hours=alloc.sleep_hours,
-                    deep_study_hours=alloc.deep_study_hours,
-                    shallow_study_hours=alloc.shallow_study_hours,
-                    recovery_hours=alloc.recovery_hours,
-                    social_hours=alloc.social_hours,
-                    total_hours=alloc.total_hours,
-                ),
-                course_grades={k: round(v, 1) for k, v in course_grades.items()},
-                course_retentions={
-                    c.name: round(retention_per_course[c.id], 3) for c in courses
-                },
+        # 5. Burnout probability — computed BEFORE grades (exam modifier needs it)
+        burnout_prob = burnout_state.update(weekly_load, alloc.sleep_hours)
+
+        # 6. Performance prediction per active course
+        course_grades: dict[str, float] = {}
+        for course in active_courses:
+            grade = pm.predict_grade(
+                course=course,
+                weekly_study_hours=study_per_course.get(course.id, 0.0),
+                avg_cognitive_load=weekly_load,
+                cumulative_retention=retention_per_course[course.id],
                 is_exam_week=is_exam_week,
+                burnout_probability=burnout_prob,
             )
-            weekly_snapshots.append(snapshot)
+            course_grades[course.name] = grade
+
+        # Dropped course keeps its last recorded grade (frozen after drop)
+        if dropped and dropped.name not in course_grades and history.course_grades:
+            course_grades[dropped.name] = history.course_grades[-1].get(dropped.name, 0.0)
 
-        # ── Build summary ──────────────────────────────────────────────────
-        final_gpa = pm.compute_semester_gpa(weekly_grades_history, course_credits)
-        gpa_std = float(statistics.stdev(gpa_history)) if len(gpa_history) > 1 else 0.0
-        gpa_min = max(0.0, final_gpa - gpa_std)
-        gpa_max = min(4.0, final_gpa + gpa_std)
+        weekly_gpa = pm.compute_gpa(course_grades, course_credits)
 
-        final_burnout_prob = rm.compute_burnout_probability(
-            load_history, sleep_history, recovery_hours_history
+        # 7. Fatigue update
+        fatigue = rm.compute_recovery(
+            current_fatigue=fatigue,
+            sleep_hours=alloc.sleep_hours,
+            recovery_hours=alloc.recovery_hours,
         )
-        burnout_risk = rm.burnout_risk_label(final_burnout_prob)
 
-        peak_weeks = [
-            snap.week
-            for snap in weekly_snapshots
-            if snap.cognitive_load > cl.LOAD_OVERLOAD_THRESHOLD
-        ]
+        # ── Accumulate history ─────────────────────────────────────────
+        history.load.append(weekly_load)
+        history.sleep.append(alloc.sleep_hours)
+        history.gpa.append(weekly_gpa)
+        history.burnout.append(burnout_prob)
+        history.fatigue.append(fatigue)
+        history.retention_score.append(
+            sum(retention_per_course.values()) / len(retention_per_course)
+            if retention_per_course else 0.0
+        )
+        history.allocations.append(alloc)
+        history.course_grades.append(course_grades)
+        history.course_retentions.append(
+            {c.name: retention_per_course[c.id] for c in all_courses}
+        )
+        history.is_exam_week.append(is_exam_week)
+
+        if checkpoints is not None:
+            checkpoints.append(SimulationCheckpoint(
+                week=week,
+                config=config,
+                courses=courses,
+                fatigue=fatigue,
+                retention=dict(retention_per_course),
+                burnout=copy.copy(burnout_state),
+                history=history,
+            ))
+
+    history.final_gpa = pm.compute_semester_gpa(history.course_grades, course_credits)
+    history.gpa_std = float(statistics.stdev(history.gpa)) if len(history.gpa) > 1 else 0.0
+    history.final_burnout_probability = burnout_state.probability()
+    history.required_study = sum(
+        c.weekly_workload_hours * (c.difficulty_score / 5.0) for c in courses
+    )
+    return history
+
+
+def divergence_week(base: ScenarioConfig, new: ScenarioConfig) -> int:
+    """
+    Number of leading weeks that simulate identically under both configs.
+
+    Weeks 1..k are unaffected by an edit when the schedule settings match
+    and exam weeks and the drop state agree up to week k. Resume from the
+    week-k checkpoint of `base` to simulate `new`.
+
+    Args:
+        base: Config of the run whose checkpoints are available.
+        new: Edited config.
+
+    Returns:
+        k in [0, min(num_weeks)]; 0 means nothing can be reused.
+    """
+    fixed_fields = (
+        "work_hours_per_week",
+        "sleep_target_hours",
+        "study_strategy",
+        "extracurricular_hours",
+        "sleep_schedule",
+    )
+    if any(getattr(base, name) != getattr(new, name) for name in fixed_fields):
+        return 0
+    if set(base.include_course_ids) != set(new.include_course_ids):
+        return 0
+
+    def week_state(config: ScenarioConfig, week: int) -> tuple:
+        dropped = (
+            config.drop_course_id
+            if config.drop_course_id is not None
+            and config.drop_at_week is not None
+            and week > config.drop_at_week
+            else None
+        )
+        return week in (config.exam_weeks or []), dropped
+
+    shared = min(base.num_weeks, new.num_weeks)
+    for week in range(1, shared + 1):
+        if week_state(base, week) != week_state(new, week):
+            return week - 1
+    return shared
+
+
+@dataclass
+class LiteResult:
+    """
+    Flat summary record from `run_lite` / `BatchSimulationResult.lite`.
+
+    Summary fields are rounded exactly like SimulationSummary. The weekly
+    arrays are raw and only populated when requested.
+    """
+
+    predicted_gpa_mean: float
+    predicted_gpa_min: float
+    predicted_gpa_max: float
+    burnout_probability: float
+    burnout_risk: str
+    peak_overload_weeks: list[int]
+    required_study_hours_per_week: float
+    sleep_deficit_hours: float
+    weekly_gpa: np.ndarray | None = None
+    weekly_cognitive_load: np.ndarray | None = None
+    weekly_burnout_probability: np.ndarray | None = None
+
+
+@dataclass(frozen=True)
+class WeeklyNoise:
+    """
+    Per-scenario, per-week perturbations applied by `run_batch`.
+
+    Every array has shape (scenarios, weeks); columns past a scenario's own
+    `num_weeks` are ignored. All-zero deltas, unit efficiency and zero
+    disruption reproduce the deterministic simulation exactly.
+
+    Attributes:
+        sleep_delta: Nightly sleep hours added to the planned sleep (the
+            result is clamped to the 4–12 h/night range ScenarioConfig allows).
+        study_efficiency: Multiplier on the effective study hours.
+        disruption: Fraction of the week's study hours lost (sick days,
+            family events), in [0, 1].
+    """
+
+    sleep_delta: np.ndarray
+    study_efficiency: np.ndarray
+    disruption: np.ndarray
+
+    def rows(self, rows: np.ndarray, num_weeks: int) -> "WeeklyNoise":
+        """Slice out the given scenarios and their first `num_weeks` weeks."""
+        return WeeklyNoise(
+            sleep_delta=self.sleep_delta[rows, :num_weeks],
+            study_efficiency=self.study_efficiency[rows, :num_weeks],
+            disruption=self.disruption[rows, :num_weeks],
+        )
+
+
+_ALLOCATION_FIELDS = (
+    "class_hours",
+    "work_hours",
+    "sleep_hours",
+    "deep_study_hours",
+    "shallow_study_hours",
+    "recovery_hours",
+    "social_hours",
+    "total_hours",
+)
 
-        avg_sleep_per_week = sum(sleep_history) / len(sleep_history)
-        sleep_deficit = max(0.0, _RECOMMENDED_WEEKLY_SLEEP_HOURS - avg_sleep_per_week)
 
-        required_study = sum(
-            c.weekly_workload_hours * (c.difficulty_score / 5.0) for c in courses
+@dataclass
+class BatchSimulationResult:
+    """
+    Per-week outputs of `SimulationEngine.run_batch`, one row per scenario.
+
+    Weekly arrays have shape (scenarios, max_weeks) and per-course arrays
+    (scenarios, max_weeks, courses); entries past a scenario's own
+    `num_weeks` — and grades/retentions of courses not in play — are NaN.
+    Values are unrounded; `result(i)` applies the same rounding as `run()`.
+    When the batch ran over a CourseStack, course columns differ per row and
+    `row_course_names` names them.
+    """
+
+    configs: list[ScenarioConfig]
+    course_names: list[str]
+    num_weeks: np.ndarray
+    cognitive_load: np.ndarray
+    predicted_gpa: np.ndarray
+    burnout_probability: np.ndarray
+    fatigue_level: np.ndarray
+    retention_score: np.ndarray
+    is_exam_week: np.ndarray
+    time_allocation: dict[str, np.ndarray]
+    course_grades: np.ndarray
+    course_retentions: np.ndarray
+    # Index of a dropped course whose frozen grade is carried that week, else -1
+    carried_course: np.ndarray
+    final_gpa: np.ndarray
+    gpa_std: np.ndarray
+    final_burnout_probability: np.ndarray
+    avg_cognitive_load: np.ndarray
+    avg_sleep_per_week: np.ndarray
+    required_study: np.ndarray
+    row_course_names: list[tuple[str, ...]] | None = None
+
+    def __len__(self) -> int:
+        return len(self.configs)
+
+    def peak_overload_weeks(self, i: int) -> list[int]:
+        """Weeks whose (rounded) cognitive load exceeds the overload threshold."""
+        loads = self.cognitive_load[i, : self.num_weeks[i]]
+        return [
+            week
+            for week, load in enumerate(loads.tolist(), start=1)
+            if round(load, 2) > cl.LOAD_OVERLOAD_THRESHOLD
+        ]
+
+    def summary(self, i: int) -> SimulationSummary:
+        """Build the SimulationSummary for scenario `i`."""
+        return _build_summary(
+            final_gpa=float(self.final_gpa[i]),
+            gpa_std=float(self.gpa_std[i]),
+            burnout_probability=float(self.final_burnout_probability[i]),
+            peak_overload_weeks=self.peak_overload_weeks(i),
+            avg_cognitive_load=float(self.avg_cognitive_load[i]),
+            avg_sleep_per_week=float(self.avg_sleep_per_week[i]),
+            required_study=float(self.required_study[i]),
         )
 
-        recommendation = _generate_recommendation(
-            burnout_risk=burnout_risk,
-            peak_overload_weeks=peak_weeks,
-            avg_cognitive_load=sum(load_history) / len(load_history),
-            sleep_deficit=sleep_deficit,
+    def lite(self, i: int, weekly: bool = False) -> LiteResult:
+        """Build the LiteResult for scenario `i` without materializing snapshots."""
+        lite = _build_lite_result(
+            final_gpa=float(self.final_gpa[i]),
+            gpa_std=float(self.gpa_std[i]),
+            burnout_probability=float(self.final_burnout_probability[i]),
+            peak_overload_weeks=self.peak_overload_weeks(i),
+            avg_sleep_per_week=float(self.avg_sleep_per_week[i]),
+            required_study=float(self.required_study[i]),
         )
+        if weekly:
+            weeks = slice(0, int(self.num_weeks[i]))
+            lite.weekly_gpa = self.predicted_gpa[i, weeks]
+            lite.weekly_cognitive_load = self.cognitive_load[i, weeks]
+            lite.weekly_burnout_probability = self.burnout_probability[i, weeks]
+        return lite
+
+    def predicted_gpa_means(self) -> list[float]:
+        """`lite(i).predicted_gpa_mean` of every scenario, without the rest of the summary."""
+        return [round(gpa, 2) for gpa in self.final_gpa.tolist()]
 
-        summary = SimulationSummary(
-            predicted_gpa_min=round(gpa_min, 2),
-            predicted_gpa_max=round(gpa_max, 2),
-            predicted_gpa_mean=round(final_gpa, 2),
-            burnout_risk=burnout_risk,
-            burnout_probability=round(final_burnout_prob, 3),
-            peak_overload_weeks=peak_weeks,
-            required_study_hours_per_week=round(required_study, 1),
-            sleep_deficit_hours=round(sleep_deficit, 1),
-            recommendation=recommendation,
+    def lite_results(self, weekly: bool = False) -> list[LiteResult]:
+        """LiteResult for every scenario, in config order."""
+        return [self.lite(i, weekly=weekly) for i in range(len(self))]
+
+    def result(self, i: int) -> SimulationResult:
+        """Materialize scenario `i` as the SimulationResult `run()` would return."""
+        weeks = slice(0, int(self.num_weeks[i]))
+        # Keep only the scenario's included courses (tracked every week)
+        keep = np.flatnonzero(~np.isnan(self.course_retentions[i, 0]))
+        carried = self.carried_course[i, weeks]
+        names = self.row_course_names[i] if self.row_course_names is not None else self.course_names
+        trace = _build_trace(
+            course_names=[names[j] for j in keep],
+            cognitive_load=self.cognitive_load[i, weeks],
+            predicted_gpa=self.predicted_gpa[i, weeks],
+            burnout_probability=self.burnout_probability[i, weeks],
+            fatigue_level=self.fatigue_level[i, weeks],
+            retention_score=self.retention_score[i, weeks],
+            is_exam_week=self.is_exam_week[i, weeks],
+            time_allocation={
+                name: self.time_allocation[name][i, weeks] for name in _ALLOCATION_FIELDS
+            },
+            course_grades=self.course_grades[i, weeks][:, keep],
+            course_retentions=self.course_retentions[i, weeks][:, keep],
+            carried_course=np.where(carried >= 0, np.searchsorted(keep, carried), -1),
         )
 
         return SimulationResult(
-            scenario_config=config,
-            summary=summary,
-            weekly_snapshots=weekly_snapshots,
+            scenario_config=self.configs[i],
+            summary=self.summary(i),
+            trace=trace,
             created_at=datetime.now(timezone.utc),
         )
 
 
+def _simulate_group(
+    configs: list[ScenarioConfig],
+    courses: CourseTable | CourseStack,
+    num_weeks: int,
+    out: BatchSimulationResult,
+    rows: np.ndarray,
+    noise: WeeklyNoise | None = None,
+) -> None:
+    """
+    Run the vectorized week loop for scenarios sharing `num_weeks`, writing into `out`.
+
+    With a CourseStack every course attribute is a (scenarios, courses)
+    array, indexed `[..., j]` like the shared (courses,) columns; padding
+    slots start out excluded.
+    """
+    n = len(configs)
+    stacked = isinstance(courses, CourseStack)
+    num_courses = courses.ids.shape[-1]
+    course_index = np.arange(num_courses)
+    scenario_index = np.arange(n)
+
+    # ── Per-scenario parameters ────────────────────────────────────────
+    included = courses.present.copy() if stacked else np.ones((n, num_courses), dtype=bool)
+    include_masks: dict[tuple, np.ndarray] = {}
+    for k, cfg in enumerate(configs):
+        if cfg.include_course_ids:
+            key = tuple(cfg.include_course_ids)
+            row_ids = courses.ids
+            if stacked:
+                # Rows of the same student share a mask
+                row_ids = courses.ids[k]
+                key = (key, row_ids.tobytes())
+            if key not in include_masks:
+                include_masks[key] = np.isin(row_ids, cfg.include_course_ids)
+            included[k] &= include_masks[key]
+    if not included.any(axis=1).all():
+        raise ValueError("No courses selected for simulation.")
+
+    strategy_factors = {
+        strategy: (
+            ts.DEEP_STUDY_RATIO.get(strategy, ts.DEEP_STUDY_RATIO["mixed"]),
+            *ret.strategy_retention_factors(strategy),
+        )
+        for strategy in {cfg.study_strategy for cfg in configs}
+    }
+    params = np.array([
+        (
+            cfg.work_hours_per_week,
+            cfg.extracurricular_hours,
+            _VARIABLE_SLEEP_WEEKLY / 7.0 if cfg.sleep_schedule == "variable" else cfg.sleep_target_hours,
+            *strategy_factors[cfg.study_strategy],
+        )
+        for cfg in configs
+    ], dtype=float).reshape(n, 6)
+    work_hours, extracurricular, sleep_target, deep_ratio = params[:, :4].T
+    decay = params[:, 4:5]
+    gain_multiplier = params[:, 5:6]
+
+    exam_rows: dict[tuple, list[bool]] = {}
+    for cfg in configs:
+        key = tuple(cfg.exam_weeks or [])
+        if key not in exam_rows:
+            exam_rows[key] = [week in key for week in range(1, num_weeks + 1)]
+    is_exam = np.array(
+        [exam_rows[tuple(cfg.exam_weeks or [])] for cfg in configs], dtype=bool
+    ).reshape(n, num_weeks).T
+
+    # Dropped course: its index among the scenario's included courses, or -1
+    drop_index = np.full(n, -1, dtype=int)
+    drop_after = np.full(n, num_weeks, dtype=int)
+    for k, cfg in enumerate(configs):
+        if cfg.drop_course_id is not None and cfg.drop_at_week is not None:
+            drop_after[k] = cfg.drop_at_week
+            row_ids = courses.ids[k] if stacked else courses.ids
+            match = np.flatnonzero(included[k] & (row_ids == cfg.drop_course_id))
+            if match.size:
+                drop_index[k] = match[0]
+    is_dropped_course = course_index == drop_index[:, None]
+    # Grade order when a dropped course is carried: remaining courses, then the dropped one
+    carry_order = np.argsort(is_dropped_course, axis=1, kind="stable")
+
+    included_count = included.sum(axis=1)
+    demand = courses.workload * (courses.difficulty / 5.0)
+
+    # ── Week-type table ────────────────────────────────────────────────
+    # Time budget and study split depend only on the enrollment phase
+    # (before/after a drop) and exam pressure: compute the four week types
+    # once, indexed by 2 * after_drop + is_exam.
+    after_drop_active = included & ~is_dropped_course
+    no_active = ~after_drop_active.any(axis=1)
+    after_drop_active[no_active] = included[no_active]  # safety: never drop all courses
+    phase_active = np.stack([included, after_drop_active])
+
+    plan_allocations = []
+    plan_study = []
+    for active in phase_active:
+        workload_demand = np.zeros(n)
+        for j in range(num_courses):
+            workload_demand = workload_demand + np.where(active[:, j], courses.workload[..., j], 0.0)
+        class_hours = ts.compute_class_hours_batch(courses.credits, active)
+        for exam in (False, True):
+            # 1. Time system — during exam weeks squeeze soft reserves for more study
+            alloc = ts.allocate_time_batch(
+                class_hours=class_hours,
+                workload_demand=workload_demand,
+                work_hours=work_hours,
+                sleep_target_hours=sleep_target,
+                deep_ratio=deep_ratio,
+                recovery_hours=2.0 if exam else 4.0,
+                social_hours=2.0 if exam else 5.0,
+                extracurricular_hours=extracurricular,
+            )
+            plan_allocations.append(alloc)
+            # 2. Distribute study hours across active courses
+            total_study = alloc.deep_study_hours + alloc.shallow_study_hours
+            plan_study.append(cl.distribute_study_hours_batch(courses.difficulty, active, total_study))
+    plan_allocation = {
+        name: np.stack([np.broadcast_to(getattr(a, name), n) for a in plan_allocations])
+        for name in _ALLOCATION_FIELDS
+    }
+    plan_study = np.stack(plan_study)
+
+    if noise is not None:
+        # Hours are still scheduled as planned; only their effect changes
+        study_scale = noise.study_efficiency * (1.0 - noise.disruption)
+
+    # ── Mutable state ──────────────────────────────────────────────────
+    fatigue = np.zeros(n)
+    retention = np.zeros((n, num_courses))
+
+    # History accumulators, week-major: (week, scenario[, course])
+    load_history = np.zeros((num_weeks, n))
+    sleep_history = np.zeros((num_weeks, n))
+    gpa_history = np.zeros((num_weeks, n))
+    burnout_history = np.zeros((num_weeks, n))
+    fatigue_history = np.zeros((num_weeks, n))
+    retention_score_history = np.zeros((num_weeks, n))
+    allocation_history = {name: np.zeros((num_weeks, n)) for name in _ALLOCATION_FIELDS}
+    grade_history = np.zeros((num_weeks, n, num_courses))
+    present_history = np.zeros((num_weeks, n, num_courses), dtype=bool)
+    retention_history = np.zeros((num_weeks, n, num_courses))
+    carried_history = np.full((num_weeks, n), -1, dtype=int)
+    burnout_state = rm.BurnoutAccumulator(n)
+
+    after_drop = None
+    for w in range(num_weeks):
+        week = w + 1
+        exam = is_exam[w]
+
+        # Enrollment only changes when a drop takes effect
+        now_after_drop = week > drop_after
+        if after_drop is None or (now_after_drop != after_drop).any():
+            after_drop = now_after_drop
+            active = phase_active[after_drop.astype(int), scenario_index]
+            carried = (drop_index >= 0) & ~active[scenario_index, drop_index]
+
+        plan = 2 * after_drop + exam
+        alloc = {name: values[plan, scenario_index] for name, values in plan_allocation.items()}
+        study = plan_study[plan, scenario_index]
+        sleep_hours = alloc["sleep_hours"]
+        if noise is not None:
+            sleep_hours = np.clip(
+                sleep_hours + 7.0 * noise.sleep_delta[:, w], _MIN_WEEKLY_SLEEP, _MAX_WEEKLY_SLEEP
+            )
+            alloc["sleep_hours"] = sleep_hours
+            study = study * study_scale[:, w, None]
+
+        # 3. Cognitive load — apply 1.3× exam pressure multiplier
+        weekly_load = cl.compute_weekly_load_batch(
+            courses.difficulty, courses.workload, active, study, fatigue, sleep_hours
+        )
+        weekly_load = np.where(exam, np.minimum(100.0, weekly_load * 1.3), weekly_load)
+
+        # 4. Retention update per active course
+        retention = np.where(
+            active,
+            ret.update_retention_batch(retention, study, decay, gain_multiplier),
+            retention,
+        )
+
+        # 5. Burnout probability — computed BEFORE grades (exam modifier needs it)
+        load_history[w] = weekly_load
+        sleep_history[w] = sleep_hours
+        burnout = burnout_state.update(weekly_load, sleep_hours)
+
+        # 6. Performance prediction per active course
+        grades = pm.predict_grade_batch(
+            courses.difficulty, courses.workload, study, weekly_load, retention, exam, burnout
+        )
+        grades = np.where(active, grades, 0.0)
+        present = active
+
+        # Dropped course keeps its last recorded grade (frozen after drop)
+        carrying = carried & (w > 0)
+        if carrying.any():
+            frozen = is_dropped_course & carrying[:, None]
+            grades = np.where(frozen, grade_history[w - 1], grades)
+            present = active | frozen
+
+        weekly_gpa = pm.compute_gpa_batch(grades, courses.credits, present)
+        if carrying.any():
+            reordered = pm.compute_gpa_batch(
+                np.take_along_axis(grades, carry_order, axis=1),
+                (
+                    np.take_along_axis(courses.credits, carry_order, axis=1)
+                    if stacked else courses.credits[carry_order]
+                ),
+                np.take_along_axis(present, carry_order, axis=1),
+            )
+            weekly_gpa = np.where(carrying, reordered, weekly_gpa)
+            carried_history[w] = np.where(carrying, drop_index, -1)
+
+        # 7. Fatigue update
+        fatigue = rm.compute_recovery_batch(fatigue, sleep_hours, alloc["recovery_hours"])
+
+        # ── Accumulate history ─────────────────────────────────────────
+        retention_total = np.zeros(n)
+        for j in range(num_courses):
+            retention_total = retention_total + np.where(included[:, j], retention[:, j], 0.0)
+
+        gpa_history[w] = weekly_gpa
+        burnout_history[w] = burnout
+        fatigue_history[w] = fatigue
+        retention_score_history[w] = retention_total / included_count
+        for name in _ALLOCATION_FIELDS:
+            allocation_history[name][w] = alloc[name]
+        grade_history[w] = grades
+        present_history[w] = present
+        retention_history[w] = retention
+
+    # ── Summary statistics ─────────────────────────────────────────────
+    # Semester GPA averages each course that was graded in week 1
+    grade_totals = np.zeros((n, num_courses))
+    load_total = np.zeros(n)
+    sleep_total = np.zeros(n)
+    for w in range(num_weeks):
+        grade_totals = grade_totals + grade_history[w]
+        load_total = load_total + load_history[w]
+        sleep_total = sleep_total + sleep_history[w]
+
+    required_study = np.zeros(n)
+    for j in range(num_courses):
+        required_study = required_study + np.where(included[:, j], demand[..., j], 0.0)
+
+    # ── Write the group's rows ─────────────────────────────────────────
+    weeks = slice(0, num_weeks)
+    out.cognitive_load[rows, weeks] = load_history.T
+    out.predicted_gpa[rows, weeks] = gpa_history.T
+    out.burnout_probability[rows, weeks] = burnout_history.T
+    out.fatigue_level[rows, weeks] = fatigue_history.T
+    out.retention_score[rows, weeks] = retention_score_history.T
+    out.is_exam_week[rows, weeks] = is_exam.T
+    for name in _ALLOCATION_FIELDS:
+        out.time_allocation[name][rows, weeks] = allocation_history[name].T
+    out.course_grades[rows, weeks] = np.where(
+        present_history, grade_history, np.nan
+    ).transpose(1, 0, 2)
+    out.course_retentions[rows, weeks] = np.where(
+        included, retention_history, np.nan
+    ).transpose(1, 0, 2)
+    out.carried_course[rows, weeks] = carried_history.T
+
+    out.final_gpa[rows] = pm.compute_gpa_batch(
+        grade_totals / num_weeks, courses.credits, present_history[0]
+    )
+    out.gpa_std[rows] = _gpa_stdev(gpa_history.T) if num_weeks > 1 else 0.0
+    out.final_burnout_probability[rows] = burnout_state.probability()
+    out.avg_cognitive_load[rows] = load_total / num_weeks
+    out.avg_sleep_per_week[rows] = sleep_total / num_weeks
+    out.required_study[rows] = required_study
+
+
+def _gpa_stdev(gpa_history: np.ndarray) -> np.ndarray:
+    """
+    Sample standard deviation of each row, matching statistics.stdev.
+
+    The summary reports round(final_gpa ± stdev, 2) with final_gpa on a
+    0.01 grid, so a last-bit difference only matters when the stdev sits on
+    a multiple of 0.005; those rows are recomputed with statistics.stdev
+    (except constant rows, whose stdev is exactly 0).
+    """
+    std = gpa_history.std(axis=1, ddof=1)
+    constant = (gpa_history == gpa_history[:, :1]).all(axis=1)
+    std[constant] = 0.0
+    scaled = std * 200.0
+    on_boundary = (np.abs(scaled - np.round(scaled)) < 1e-6) & ~constant
+    for i in np.flatnonzero(on_boundary):
+        std[i] = statistics.stdev(gpa_history[i].tolist())
+    return std
+
+
+def _result_from_history(config: ScenarioConfig, history: _ScenarioHistory) -> SimulationResult:
+    """Pack a finished scenario history into the SimulationResult returned by `run()`."""
+    course_names = list(history.course_retentions[0])
+    column = {name: j for j, name in enumerate(course_names)}
+    grades = np.full((config.num_weeks, len(course_names)), np.nan)
+    carried = np.full(config.num_weeks, -1, dtype=int)
+    for w, week_grades in enumerate(history.course_grades):
+        columns = [column[name] for name in week_grades]
+        grades[w, columns] = list(week_grades.values())
+        # A frozen dropped grade is appended after the active courses
+        if len(columns) > 1 and columns[-1] < columns[-2]:
+            carried[w] = columns[-1]
+
+    trace = _build_trace(
+        course_names=course_names,
+        cognitive_load=np.array(history.load),
+        predicted_gpa=np.array(history.gpa),
+        burnout_probability=np.array(history.burnout),
+        fatigue_level=np.array(history.fatigue),
+        retention_score=np.array(history.retention_score),
+        is_exam_week=np.array(history.is_exam_week, dtype=bool),
+        time_allocation={
+            name: np.array([getattr(alloc, name) for alloc in history.allocations])
+            for name in _ALLOCATION_FIELDS
+        },
+        course_grades=grades,
+        course_retentions=np.array([list(r.values()) for r in history.course_retentions]),
+        carried_course=carried,
+    )
+
+    summary = _build_summary(
+        final_gpa=history.final_gpa,
+        gpa_std=history.gpa_std,
+        burnout_probability=history.final_burnout_probability,
+        peak_overload_weeks=history.peak_overload_weeks(),
+        avg_cognitive_load=sum(history.load) / len(history.load),
+        avg_sleep_per_week=sum(history.sleep) / len(history.sleep),
+        required_study=history.required_study,
+    )
+
+    return SimulationResult(
+        scenario_config=config,
+        summary=summary,
+        trace=trace,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def _build_trace(
+    course_names: list[str],
+    cognitive_load: np.ndarray,
+    predicted_gpa: np.ndarray,
+    burnout_probability: np.ndarray,
+    fatigue_level: np.ndarray,
+    retention_score: np.ndarray,
+    is_exam_week: np.ndarray,
+    time_allocation: dict[str, np.ndarray],
+    course_grades: np.ndarray,
+    course_retentions: np.ndarray,
+    carried_course: np.ndarray,
+) -> SimulationTrace:
+    """Round raw weekly arrays to WeeklySnapshot precision and pack them into a trace."""
+    return SimulationTrace(
+        course_names=course_names,
+        cognitive_load=pm.round_like_builtin(cognitive_load, 2),
+        predicted_gpa=pm.round_like_builtin(predicted_gpa, 2),
+        burnout_probability=pm.round_like_builtin(burnout_probability, 3),
+        fatigue_level=pm.round_like_builtin(fatigue_level, 3),
+        retention_score=pm.round_like_builtin(retention_score, 3),
+        is_exam_week=np.asarray(is_exam_week, dtype=bool),
+        time_allocation={
+            name: np.asarray(values, dtype=float) for name, values in time_allocation.items()
+        },
+        course_grades=pm.round_like_builtin(course_grades, 1),
+        course_retentions=pm.round_like_builtin(course_retentions, 3),
+        carried_course=np.asarray(carried_course, dtype=int),
+    )
+
+
+def _build_lite_result(
+    final_gpa: float,
+    gpa_std: float,
+    burnout_probability: float,
+    peak_overload_weeks: list[int],
+    avg_sleep_per_week: float,
+    required_study: float,
+) -> LiteResult:
+    """Round end-of-semester statistics into a LiteResult (mirrors _build_summary)."""
+    return LiteResult(
+        predicted_gpa_min=round(max(0.0, final_gpa - gpa_std), 2),
+        predicted_gpa_max=round(min(4.0, final_gpa + gpa_std), 2),
+        predicted_gpa_mean=round(final_gpa, 2),
+        burnout_risk=rm.burnout_risk_label(burnout_probability),
+        burnout_probability=round(burnout_probability, 3),
+        peak_overload_weeks=peak_overload_weeks,
+        required_study_hours_per_week=round(required_study, 1),
+        sleep_deficit_hours=round(
+            max(0.0, _RECOMMENDED_WEEKLY_SLEEP_HOURS - avg_sleep_per_week), 1
+        ),
+    )
+
+
+def _build_summary(
+    final_gpa: float,
+    gpa_std: float,
+    burnout_probability: float,
+    peak_overload_weeks: list[int],
+    avg_cognitive_load: float,
+    avg_sleep_per_week: float,
+    required_study: float,
+) -> SimulationSummary:
+    """Assemble the rounded SimulationSummary from raw end-of-semester statistics."""
+    burnout_risk = rm.burnout_risk_label(burnout_probability)
+    sleep_deficit = max(0.0, _RECOMMENDED_WEEKLY_SLEEP_HOURS - avg_sleep_per_week)
+
+    recommendation = _generate_recommendation(
+        burnout_risk=burnout_risk,
+        peak_overload_weeks=peak_overload_weeks,
+        avg_cognitive_load=avg_cognitive_load,
+        sleep_deficit=sleep_deficit,
+    )
+
+    return SimulationSummary(
+        predicted_gpa_min=round(max(0.0, final_gpa - gpa_std), 2),
+        predicted_gpa_max=round(min(4.0, final_gpa + gpa_std), 2),
+        predicted_gpa_mean=round(final_gpa, 2),
+        burnout_risk=burnout_risk,
+        burnout_probability=round(burnout_probability, 3),
+        peak_overload_weeks=peak_overload_weeks,
+        required_study_hours_per_week=round(required_study, 1),
+        sleep_deficit_hours=round(sleep_deficit, 1),
+        recommendation=recommendation,
+    )
+
+
 def _generate_recommendation(
     burnout_risk: str,
     peak_overload_weeks: list[int],
@@ -0,0 +1,321 @@
+"""
+Goal-Target Search.
+
+Finds the smallest change to a student's current schedule that reaches a
+target GPA. A change is measured in weekly hours moved:
+
+    cost = work hours given up + 7 × |change in nightly sleep|
+
+(the study strategy can change freely). The search space is one cell per
+(study strategy, sleep target); inside a cell GPA falls as work hours rise,
+so the cell's answer is the largest work load that still reaches the
+target, found by bisection on the work grid.
+
+All cells advance together, one `SimulationEngine.run_batch` call per
+round:
+
+  1. every cell at the current work load — cells that already reach the
+     target cost only their sleep change;
+  2. the remaining cells at zero work — cells that miss the target even
+     then are dropped;
+  3. bisection rounds between the highest reaching and lowest missing
+     work load.
+
+After every round a cell is pruned once its best possible cost (sleep
+change plus the work already known to be lost) cannot beat the best
+schedule found so far, so distant cells are rarely bisected to the end.
+
+GPA is only approximately monotone in work hours: bisection can settle on
+a slightly smaller work load than the true maximum, but every returned
+schedule has been simulated and reaches the target. When no cell reaches
+it, the highest-GPA zero-work schedule is returned instead.
+
+The search is written as a generator of batch rounds (`goal_search_steps`)
+so a caller can advance many students' searches in lockstep and simulate
+all their rounds in one batch (see app/simulation/cohort.py).
+
+`goal_surface` instead simulates the whole grid in one batch and returns
+the GPA and burnout surfaces, cached by course fingerprint, so the UI can
+draw the feasible region for any target without re-simulating.
+"""
+
+import hashlib
+import json
+from dataclasses import dataclass
+from typing import Generator
+
+import numpy as np
+
+from app.schemas.simulation import (
+    GoalSurfaceRequest,
+    GoalSurfaceResult,
+    GoalTargetRequest,
+    ScenarioConfig,
+)
+from app.simulation.course_table import CourseTable
+from app.simulation.result_cache import SimulationCache
+
+
+GOAL_STRATEGIES: tuple[str, ...] = ("spaced", "mixed", "cramming")
+
+# Sleep targets considered (hours/night)
+GOAL_SLEEP_RANGE: tuple[float, float] = (6.0, 9.0)
+
+# Nightly sleep changes count 7× in the weekly-hours adjustment cost
+NIGHTS_PER_WEEK: int = 7
+
+
+@dataclass
+class GoalSearchOutcome:
+    """Schedule chosen by `goal_target_search` and the work spent finding it."""
+
+    config: ScenarioConfig
+    predicted_gpa: float
+    achievable: bool
+    adjustment_hours: float
+    evaluations: int
+
+
+def _grid(low: float, high: float, step: float, extra: float) -> np.ndarray:
+    """Sorted grid low, low + step, ..., plus `high` and `extra` (if in range)."""
+    values = np.append(np.arange(low, high + 1e-9, step), [high, extra])
+    values = values[(values >= low - 1e-9) & (values <= high + 1e-9)]
+    return np.unique(np.round(values, 4))
+
+
+GoalSearchSteps = Generator[list[ScenarioConfig], list[float], GoalSearchOutcome]
+
+
+def goal_target_search(
+    engine,
+    courses: CourseTable | list,
+    request: GoalTargetRequest,
+    current_work_hours: float,
+    current_sleep_hours: float,
+) -> GoalSearchOutcome:
+    """
+    Minimal-adjustment schedule reaching `request.target_gpa`.
+
+    Args:
+        engine: SimulationEngine used for the batched runs.
+        courses: CourseTable (or list of Course ORM objects) in play.
+        request: GoalTargetRequest (target, horizon, work cap, resolution).
+        current_work_hours: Student's current weekly work hours (capped at
+            `request.max_work_hours`).
+        current_sleep_hours: Student's current nightly sleep target.
+
+    Returns:
+        GoalSearchOutcome with the chosen config and the number of
+        simulations run.
+    """
+    courses = CourseTable.from_courses(courses)
+    steps = goal_search_steps(courses, request, current_work_hours, current_sleep_hours)
+    try:
+        configs = next(steps)
+        while True:
+            configs = steps.send(engine.run_batch(configs, courses).predicted_gpa_means())
+    except StopIteration as done:
+        return done.value
+
+
+def goal_search_steps(
+    courses: CourseTable,
+    request: GoalTargetRequest,
+    current_work_hours: float,
+    current_sleep_hours: float,
+) -> GoalSearchSteps:
+    """
+    `goal_target_search` as a generator of simulation rounds.
+
+    Each yield is a non-empty list of ScenarioConfigs to simulate; send back
+    their predicted mean GPAs in the same order. The generator returns the
+    GoalSearchOutcome (as StopIteration.value).
+
+    Args:
+        courses: CourseTable in play.
+        request: GoalTargetRequest (target, horizon, work cap, resolution).
+        current_work_hours: Student's current weekly work hours.
+        current_sleep_hours: Student's current nightly sleep target.
+    """
+    course_ids = courses.ids.tolist()
+    current_work = min(max(current_work_hours, 0.0), request.max_work_hours)
+    work = _grid(0.0, request.max_work_hours, request.work_step, current_work)
+    sleep = _grid(*GOAL_SLEEP_RANGE, request.sleep_step, current_sleep_hours)[::-1]
+    current = int(np.searchsorted(work, round(current_work, 4)))
+
+    cells = [(strategy, float(s)) for strategy in GOAL_STRATEGIES for s in sleep]
+    sleep_cost = np.array([NIGHTS_PER_WEEK * abs(s - current_sleep_hours) for _, s in cells])
+    evaluations = 0
+
+    def config(cell: int, work_index: int) -> ScenarioConfig:
+        strategy, sleep_hours = cells[cell]
+        return ScenarioConfig(
+            student_id=request.student_id,
+            num_weeks=request.num_weeks,
+            work_hours_per_week=float(work[work_index]),
+            sleep_target_hours=sleep_hours,
+            study_strategy=strategy,
+            include_course_ids=course_ids,
+            exam_weeks=request.exam_weeks,
+        )
+
+    def gpas(
+        points: list[tuple[int, int]],
+    ) -> Generator[list[ScenarioConfig], list[float], list[float]]:
+        nonlocal evaluations
+        if not points:
+            return []
+        evaluations += len(points)
+        return (yield [config(c, w) for c, w in points])
+
+    def reduction(work_index: int) -> float:
+        return current_work - float(work[work_index])
+
+    # Incumbent: (cost, cell, work index, gpa)
+    best: tuple[float, int, int, float] | None = None
+
+    def offer(cell: int, work_index: int, gpa: float) -> None:
+        nonlocal best
+        cost = float(sleep_cost[cell]) + reduction(work_index)
+        if best is None or cost < best[0]:
+            best = (cost, cell, work_index, gpa)
+
+    def beaten(cell: int, highest_possible: int) -> bool:
+        # Lower bound: keep at most work[highest_possible] hours
+        return best is not None and sleep_cost[cell] + reduction(highest_possible) >= best[0]
+
+    # Round 1: current work load everywhere
+    at_current = yield from gpas([(c, current) for c in range(len(cells))])
+    for cell, gpa in enumerate(at_current):
+        if gpa >= request.target_gpa:
+            offer(cell, current, gpa)
+
+    # Round 2: zero work for cells that missed (the fallback needs every cell)
+    fallback: list[tuple[float, int]] = []
+    missed = [c for c, gpa in enumerate(at_current) if gpa < request.target_gpa]
+    if current == 0:
+        fallback = [(at_current[c], c) for c in missed]
+        missed = []
+    missed = [c for c in missed if not beaten(c, current - 1)]
+    brackets: dict[int, tuple[int, int]] = {}  # cell -> (reaching, missing) work indices
+    for cell, gpa in zip(missed, (yield from gpas([(c, 0) for c in missed]))):
+        fallback.append((gpa, cell))
+        if gpa >= request.target_gpa:
+            offer(cell, 0, gpa)
+            brackets[cell] = (0, current)
+
+    # Bisection rounds, pruning cells that can no longer win
+    while True:
+        brackets = {
+            cell: (lo, hi) for cell, (lo, hi) in brackets.items()
+            if hi - lo > 1 and not beaten(cell, hi - 1)
+        }
+        if not brackets:
+            break
+        probes = [(cell, (lo + hi) // 2) for cell, (lo, hi) in brackets.items()]
+        for (cell, mid), gpa in zip(probes, (yield from gpas(probes))):
+            lo, hi = brackets[cell]
+            if gpa >= request.target_gpa:
+                brackets[cell] = (mid, hi)
+                offer(cell, mid, gpa)
+            else:
+                brackets[cell] = (lo, mid)
+
+    if best is not None:
+        cost, cell, work_index, gpa = best
+        return GoalSearchOutcome(
+            config=config(cell, work_index),
+            predicted_gpa=gpa,
+            achievable=True,
+            adjustment_hours=round(cost, 2),
+            evaluations=evaluations,
+        )
+
+    # Unreachable: the highest-GPA schedule without work (first on ties)
+    gpa, cell = max(fallback, key=lambda item: (item[0], -item[1]))
+    return GoalSearchOutcome(
+        config=config(cell, 0),
+        predicted_gpa=gpa,
+        achievable=False,
+        adjustment_hours=round(float(sleep_cost[cell]) + reduction(0), 2),
+        evaluations=evaluations,
+    )
+
+
+def surface_key(courses: CourseTable, request: GoalSurfaceRequest) -> str:
+    """Cache key of a goal surface: course fingerprint plus grid settings."""
+    settings = request.model_dump(mode="json", exclude={"student_id", "target_gpa"})
+    settings["exam_weeks"] = sorted(set(settings["exam_weeks"]))
+    payload = json.dumps(
+        ["goal-surface", courses.fingerprint(), settings], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def goal_surface(
+    engine,
+    courses: CourseTable | list,
+    request: GoalSurfaceRequest,
+    cache: SimulationCache | None = None,
+) -> GoalSurfaceResult:
+    """
+    Predicted GPA and burnout probability over the whole schedule grid.
+
+    Every (strategy, sleep, work) cell is simulated in one `run_batch` call.
+    With a cache, the surface is stored under `surface_key` so later requests
+    for the same courses and grid — any `target_gpa` — are lookups.
+
+    Args:
+        engine: SimulationEngine used for the batched run.
+        courses: CourseTable (or list of Course ORM objects) in play.
+        request: GoalSurfaceRequest (horizon, work cap, resolution, target).
+        cache: Optional SimulationCache (entries are dropped with the
+            student's other results when their courses change).
+
+    Returns:
+        GoalSurfaceResult indexed [strategy][sleep][work], with the feasible
+        mask filled in when `request.target_gpa` is set.
+    """
+    courses = CourseTable.from_courses(courses)
+    key = surface_key(courses, request)
+    surface = cache.get(key) if cache is not None else None
+    cached = surface is not None
+
+    if not cached:
+        work = _grid(0.0, request.max_work_hours, request.work_step, 0.0)
+        sleep = _grid(*GOAL_SLEEP_RANGE, request.sleep_step, GOAL_SLEEP_RANGE[0])
+        configs = [
+            ScenarioConfig(
+                student_id=request.student_id,
+                num_weeks=request.num_weeks,
+                work_hours_per_week=float(w),
+                sleep_target_hours=float(s),
+                study_strategy=strategy,
+                include_course_ids=courses.ids.tolist(),
+                exam_weeks=request.exam_weeks,
+            )
+            for strategy in GOAL_STRATEGIES for s in sleep for w in work
+        ]
+        outcomes = engine.run_batch(configs, courses).lite_results()
+        shape = (len(GOAL_STRATEGIES), len(sleep), len(work))
+        gpa = np.reshape([o.predicted_gpa_mean for o in outcomes], shape)
+        burnout = np.reshape([o.burnout_probability for o in outcomes], shape)
+        surface = GoalSurfaceResult(
+            strategies=list(GOAL_STRATEGIES),
+            sleep_hours=sleep.tolist(),
+            work_hours=work.tolist(),
+            predicted_gpa=gpa.tolist(),
+            burnout_probability=burnout.tolist(),
+            evaluations=len(configs),
+        )
+        if cache is not None:
+            cache.put(key, request.student_id, surface)
+
+    feasible = None
+    if request.target_gpa is not None:
+        feasible = (np.array(surface.predicted_gpa) >= request.target_gpa).tolist()
+    return surface.model_copy(update={
+        "feasible": feasible,
+        "evaluations": 0 if cached else surface.evaluations,
+        "cached": cached,
+    })
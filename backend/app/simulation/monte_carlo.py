@@ -1,10 +1,17 @@
 """
 Monte Carlo Simulation Runner.
 
-Runs the simulation engine N times with randomized sleep/study variance to
+Runs the simulation engine N times with randomized per-week variation to
 produce confidence bands (p10/p50/p90) on GPA predictions. Models real-world
 unpredictability: sick days, disruptions, variable motivation.
 
+Runs are simulated in fixed-size chunks: per chunk, one RNG call draws a
+(runs × weeks) noise matrix for each source of variation, and
+`SimulationEngine.run_batch` propagates every run through the week loop as
+NumPy arrays. Each chunk draws from its own stream spawned from a single
+SeedSequence, so chunks can be farmed out to a process pool and the merged
+percentiles are bit-identical for any worker count.
+
 References:
   - Metropolis & Ulam (1949): The Monte Carlo method — Journal of the American
     Statistical Association 44(247):335–341
@@ -14,87 +21,474 @@ References:
     in student performance prediction systems
 """
 
-import random
-import statistics
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+from app.schemas.simulation import (
+    MonteCarloCompareRequest,
+    MonteCarloCompareResult,
+    MonteCarloConfig,
+    MonteCarloDifference,
+    MonteCarloProgress,
+    MonteCarloRequest,
+    MonteCarloResult,
+    ScenarioConfig,
+)
+from app.simulation import performance_model as pm
+from app.simulation.course_table import CourseTable
+from app.simulation.engine import SimulationEngine, WeeklyNoise
+from app.simulation.quantile_sketch import HistogramQuantiles, make_sketch
+
+
+# Nightly sleep standard deviation (hours) per unit of study_variance
+SLEEP_SD_PER_VARIANCE: float = 2.0
+
+# Study efficiency is clamped so a bad week never goes negative
+MIN_STUDY_EFFICIENCY: float = 0.25
+MAX_STUDY_EFFICIENCY: float = 1.75
+
+# Chance of a disrupted week per unit of study_variance, and the share of
+# that week's study hours it costs (e.g. 0.15 variance → 3% of weeks lose half)
+DISRUPTION_RATE_PER_VARIANCE: float = 0.2
+DISRUPTION_STUDY_LOSS: float = 0.5
+
+# Noise channels drawn per (run, week): sleep, study efficiency, disruption
+NOISE_DIMENSIONS: int = 3
+
+_MC_SEED: int = 42
+
+# Bands every result reports (p10/p50/p90); more can be requested
+BAND_PERCENTILES: tuple[float, ...] = (10.0, 50.0, 90.0)
+
+# Reported GPAs are rounded to 0.01 on [0, 4], so a histogram on that grid is exact
+GPA_GRID: tuple[float, float, float] = (0.0, 4.0, 0.01)
+# Paired GPA differences between two scenarios lie on the same step over [-4, 4]
+DIFFERENCE_GRID: tuple[float, float, float] = (-4.0, 4.0, 0.01)
+
+# Runs per chunk — fixed so the seed streams never depend on the worker count
+CHUNK_RUNS: int = 500
+
+# With a tolerance the stopping rule is checked after every (smaller) chunk;
+# a power of two keeps each scrambled Sobol chunk balanced
+TOLERANCE_CHUNK_RUNS: int = 64
+MIN_RUNS_BEFORE_STOP: int = 128
+
+# Bootstrap for the early-stopping rule: resamples and two-sided CI level
+BOOTSTRAP_RESAMPLES: int = 200
+BOOTSTRAP_CONFIDENCE: float = 0.95
+
+
+def weekly_noise_from_uniforms(uniforms: np.ndarray, study_variance: float) -> WeeklyNoise:
+    """
+    Map uniform draws onto the engine's per-week perturbations.
+
+    Args:
+        uniforms: Array of shape (NOISE_DIMENSIONS, runs, weeks) with values
+            in [0, 1) — one plane per noise channel.
+        study_variance: Spread of the variation (MonteCarloConfig.study_variance).
+
+    Returns:
+        WeeklyNoise with one row per run. Zero variance yields no noise.
+    """
+    eps = np.finfo(float).eps
+    z = ndtri(np.clip(uniforms[:2], eps, 1.0 - eps))
+    return WeeklyNoise(
+        sleep_delta=z[0] * (study_variance * SLEEP_SD_PER_VARIANCE),
+        study_efficiency=np.clip(
+            1.0 + z[1] * study_variance, MIN_STUDY_EFFICIENCY, MAX_STUDY_EFFICIENCY
+        ),
+        disruption=np.where(
+            uniforms[2] < study_variance * DISRUPTION_RATE_PER_VARIANCE,
+            DISRUPTION_STUDY_LOSS,
+            0.0,
+        ),
+    )
+
+
+def draw_uniforms(
+    sampler: str,
+    runs: int,
+    num_weeks: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """
+    Draw the uniform noise matrix for one chunk of runs.
+
+    Every run is one point in [0, 1)^(NOISE_DIMENSIONS × num_weeks).
+    "pseudo" draws them independently; "lhs" stratifies each dimension
+    (Latin hypercube); "sobol" uses a scrambled Sobol' sequence, whose
+    low-discrepancy points cover the space more evenly.
+
+    Args:
+        sampler: "pseudo", "lhs" or "sobol".
+        runs: Number of runs (points) in the chunk.
+        num_weeks: Weeks per run.
+        rng: Generator seeding the draw (or the scrambling).
+
+    Returns:
+        Array of shape (NOISE_DIMENSIONS, runs, num_weeks).
+    """
+    if sampler == "pseudo":
+        return rng.random((NOISE_DIMENSIONS, runs, num_weeks))
+
+    dimensions = NOISE_DIMENSIONS * num_weeks
+    if sampler == "lhs":
+        points = qmc.LatinHypercube(d=dimensions, seed=rng).random(runs)
+    elif sampler == "sobol":
+        # Draw the enclosing power of two and keep its first `runs` points
+        m = max(0, int(np.ceil(np.log2(runs))))
+        points = qmc.Sobol(d=dimensions, scramble=True, seed=rng).random_base2(m)[:runs]
+    else:
+        raise ValueError(f"Unknown sampler: {sampler}")
+    return points.reshape(runs, NOISE_DIMENSIONS, num_weeks).transpose(1, 0, 2)
+
+
+def _simulate_chunk(
+    configs: list[ScenarioConfig],
+    courses: CourseTable,
+    study_variance: float,
+    sampler: str,
+    runs: int,
+    seed: np.random.SeedSequence,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Simulate one chunk of Monte Carlo runs (module-level so it pickles).
+
+    Every config is run against the same noise matrix (common random
+    numbers), all in one batch.
+
+    Returns:
+        (final GPA, weekly GPA, final burnout probability) with shapes
+        (configs, runs), (configs, runs, max_weeks) and (configs, runs), all
+        unrounded; weeks past a config's own `num_weeks` are NaN.
+    """
+    num_weeks = max(cfg.num_weeks for cfg in configs)
+    rng = np.random.default_rng(seed)
+    uniforms = draw_uniforms(sampler, runs, num_weeks, rng)
+    noise = weekly_noise_from_uniforms(uniforms, study_variance)
+    if len(configs) > 1:
+        noise = noise.rows(np.tile(np.arange(runs), len(configs)), num_weeks)
+    batch = SimulationEngine().run_batch(
+        [cfg for cfg in configs for _ in range(runs)], courses, noise=noise
+    )
+    return (
+        batch.final_gpa.reshape(len(configs), runs),
+        batch.predicted_gpa.reshape(len(configs), runs, num_weeks),
+        batch.final_burnout_probability.reshape(len(configs), runs),
+    )
+
+
+def _chunk_sizes(runs: int, chunk_runs: int = CHUNK_RUNS) -> list[int]:
+    """Split `runs` into `chunk_runs`-sized chunks (the last may be smaller)."""
+    full, rest = divmod(runs, chunk_runs)
+    return [chunk_runs] * full + ([rest] if rest else [])
+
+
+def resolve_workers(workers: int) -> int:
+    """Map the `workers` knob to a process count (0 means every core)."""
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+
+def _iter_chunks(
+    configs: list[ScenarioConfig],
+    mc: MonteCarloConfig,
+    courses: CourseTable,
+) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Yield the Monte Carlo chunks in order, serially or from a process pool.
+
+    Closing the iterator early cancels chunks that have not started yet.
+    """
+    sizes = _chunk_sizes(mc.runs, CHUNK_RUNS if mc.tolerance is None else TOLERANCE_CHUNK_RUNS)
+    seeds = np.random.SeedSequence(_MC_SEED).spawn(len(sizes))
+    jobs = [
+        (configs, courses, mc.study_variance, mc.sampler, size, seed)
+        for size, seed in zip(sizes, seeds)
+    ]
+
+    workers = min(resolve_workers(mc.workers), len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            yield _simulate_chunk(*job)
+        return
+
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        yield from pool.map(_simulate_chunk, *zip(*jobs))
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
 
-from app.schemas.simulation import MonteCarloRequest, MonteCarloResult, ScenarioConfig
-from app.simulation.engine import SimulationEngine
+class _MonteCarloBands:
+    """
+    Running percentile bands over the chunks simulated so far.
+
+    Final and weekly values (GPAs rounded to 0.01, as reported, or paired
+    differences of them) feed two quantile sketches; burnout only needs a
+    running mean. Memory stays constant in the number of runs unless the
+    exact sketch is selected.
+
+    With a tolerance, final values are also counted on the grid so the
+    bootstrap behind `converged()` resamples bin counts rather than runs.
+
+    Args:
+        mc: Monte Carlo settings (percentiles, sketch, tolerance).
+        grid: (low, high, step) grid the values lie on.
+    """
+
+    def __init__(self, mc: MonteCarloConfig, grid: tuple[float, float, float] = GPA_GRID):
+        self.tolerance = mc.tolerance
+        self.requested = sorted(set(mc.percentiles))
+        self.percentiles = sorted({*BAND_PERCENTILES, *self.requested})
+        self.final = make_sketch(mc.quantile_method, self.percentiles, mc.runs, grid)
+        self.weekly = make_sketch(mc.quantile_method, self.percentiles, mc.runs, grid)
+        self.final_counts = HistogramQuantiles(*grid) if mc.tolerance is not None else None
+        self.burnout_total = 0.0
+        self.stopped_early = False
+
+    @property
+    def runs(self) -> int:
+        return self.final.count
+
+    def add(self, final_gpa: np.ndarray, weekly_gpa: np.ndarray, burnout: np.ndarray) -> None:
+        """Fold in one chunk of already rounded values."""
+        self.final.update(final_gpa)
+        self.weekly.update(weekly_gpa)
+        self.burnout_total += float(burnout.sum())
+        if self.final_counts is not None:
+            self.final_counts.update(final_gpa)
+
+    def converged(self) -> bool:
+        """
+        Whether every reported final percentile is pinned down to within
+        the tolerance: the width of its bootstrap confidence interval.
+        """
+        if self.final_counts is None or self.runs < MIN_RUNS_BEFORE_STOP:
+            return False
+        rng = np.random.default_rng([_MC_SEED, self.runs])
+        estimates = self.final_counts.bootstrap_quantiles(
+            self.percentiles, BOOTSTRAP_RESAMPLES, rng
+        )
+        tail = (1.0 - BOOTSTRAP_CONFIDENCE) / 2 * 100
+        low, high = np.percentile(estimates, [tail, 100 - tail], axis=0)
+        return bool(np.all(high - low <= self.tolerance))
+
+    def result(self) -> MonteCarloResult:
+        final = dict(zip(self.percentiles, self.final.quantiles(self.percentiles).tolist()))
+        weekly = dict(zip(self.percentiles, self.weekly.quantiles(self.percentiles).tolist()))
+
+        def band(p: float) -> list[float]:
+            return [round(v, 3) for v in weekly[p]]
+
+        return MonteCarloResult(
+            runs=self.runs,
+            p10_gpa=round(final[10], 3),
+            p50_gpa=round(final[50], 3),
+            p90_gpa=round(final[90], 3),
+            burnout_probability_mean=round(self.burnout_total / self.runs, 3),
+            weekly_p10=band(10),
+            weekly_p50=band(50),
+            weekly_p90=band(90),
+            percentiles={percentile_key(p): round(final[p], 3) for p in self.requested},
+            weekly_percentiles={percentile_key(p): band(p) for p in self.requested},
+            stopped_early=self.stopped_early,
+        )
+
+
+def _rounded(chunk: tuple[np.ndarray, np.ndarray, np.ndarray]):
+    """Round a chunk's GPAs to 0.01 and burnout to 0.001, as reported."""
+    final_gpa, weekly_gpa, burnout = chunk
+    return (
+        pm.round_like_builtin(final_gpa, 2),
+        pm.round_like_builtin(weekly_gpa, 2),
+        pm.round_like_builtin(burnout, 3),
+    )
+
+
+def percentile_key(p: float) -> str:
+    """Response key for percentile `p` — "p5", "p97.5"."""
+    return f"p{p:g}"
+
+
+def _iter_bands(
+    request: MonteCarloRequest,
+    courses: CourseTable,
+    stop: threading.Event | None = None,
+) -> Iterator[_MonteCarloBands]:
+    """
+    Fold chunks into the bands, yielding after each one; stops early once
+    the tolerance (if any) is met, or once `stop` is set.
+    """
+    bands = _MonteCarloBands(request.monte_carlo)
+    chunks = _iter_chunks([request.scenario_config], request.monte_carlo, courses)
+    try:
+        for chunk in chunks:
+            final_gpa, weekly_gpa, burnout = _rounded(chunk)
+            bands.add(final_gpa[0], weekly_gpa[0], burnout[0])
+            if bands.runs < request.monte_carlo.runs and bands.converged():
+                bands.stopped_early = True
+            if stop is not None and stop.is_set():
+                return
+            yield bands
+            if bands.stopped_early:
+                return
+    finally:
+        chunks.close()
 
 
 def run_monte_carlo(
     request: MonteCarloRequest,
-    courses: list,
+    courses: CourseTable | list,
     student,
 ) -> MonteCarloResult:
     """
     Run the simulation multiple times with random variation to produce
     GPA confidence bands.
 
-    Variation is injected via small random jitter on sleep target hours,
-    which serves as a proxy for real-world disruptions (sick days,
-    late nights, social events) without changing the core model.
+    Each run gets its own week-by-week jitter on nightly sleep, study
+    efficiency and the odds of a disrupted week, standing in for sick days,
+    late nights and social events without changing the core model.
+
+    Runs are split into chunks of CHUNK_RUNS, each with its own spawned
+    seed stream; with `workers` > 1 the chunks run in a process pool. The
+    noise comes from the configured sampler (pseudo-random, Latin hypercube
+    or scrambled Sobol'). With a `tolerance`, runs stop as soon as the
+    bootstrap CI of every reported GPA percentile is narrower than it;
+    `runs` in the result is the number actually simulated.
 
     Args:
         request: MonteCarloRequest with scenario config and MC settings.
-        courses: List of Course ORM objects.
+        courses: CourseTable (or list of Course ORM objects).
         student: Student ORM object.
 
     Returns:
         MonteCarloResult with p10/p50/p90 GPA and per-week bands.
+
+    Raises:
+        ValueError: If the scenario selects no courses.
     """
-    engine = SimulationEngine()
-    config = request.scenario_config
-    mc = request.monte_carlo
+    for bands in _iter_bands(request, CourseTable.from_courses(courses)):
+        pass
+    return bands.result()
+
+
+def stream_monte_carlo(
+    request: MonteCarloRequest,
+    courses: CourseTable | list,
+    student,
+    stop: threading.Event | None = None,
+) -> Iterator[MonteCarloProgress]:
+    """
+    Run Monte Carlo chunk by chunk, yielding the bands after each chunk.
+
+    Uses the same chunks, seed streams and stopping rule as
+    `run_monte_carlo`, so the final update (`done=True`) carries exactly its
+    result. Closing the generator stops the remaining runs.
 
-    all_weekly_gpas: list[list[float]] = []
-    all_final_gpas: list[float] = []
-    all_burnout_probs: list[float] = []
+    `stop` serves callers that advance the generator from a worker thread,
+    where `close()` fails while a chunk is running: once set, the generator
+    finishes after the current chunk and shuts down its process pool.
 
-    rng = random.Random(42)
+    Args:
+        request: MonteCarloRequest with scenario config and MC settings.
+        courses: CourseTable (or list of Course ORM objects).
+        student: Student ORM object.
+        stop: Optional event that ends the stream between chunks.
 
-    for _ in range(mc.runs):
-        # Jitter sleep as a proxy for real-world unpredictability
-        sleep_jitter = rng.gauss(0, mc.study_variance * 0.5)
-        jittered_sleep = max(4.0, min(12.0, config.sleep_target_hours + sleep_jitter))
+    Yields:
+        MonteCarloProgress with the bands over all runs completed so far.
 
-        jittered_config = ScenarioConfig(
-            **{**config.model_dump(), "sleep_target_hours": jittered_sleep}
+    Raises:
+        ValueError: If the scenario selects no courses.
+    """
+    total_runs = request.monte_carlo.runs
+    for bands in _iter_bands(request, CourseTable.from_courses(courses), stop):
+        yield MonteCarloProgress(
+            **bands.result().model_dump(),
+            total_runs=total_runs,
+            done=bands.stopped_early or bands.runs == total_runs,
         )
 
-        try:
-            result = engine.run(config=jittered_config, courses=courses, student=student)
-            weekly_gpas = [s.predicted_gpa for s in result.weekly_snapshots]
-            all_weekly_gpas.append(weekly_gpas)
-            all_final_gpas.append(result.summary.predicted_gpa_mean)
-            all_burnout_probs.append(result.summary.burnout_probability)
-        except Exception:
-            continue
-
-    if not all_final_gpas:
-        raise ValueError("Monte Carlo: all runs failed — check scenario config.")
-
-    all_final_gpas.sort()
-
-    def percentile(sorted_list: list[float], p: float) -> float:
-        idx = max(0, min(int(len(sorted_list) * p / 100), len(sorted_list) - 1))
-        return sorted_list[idx]
-
-    # Build per-week percentile bands
-    num_weeks = len(all_weekly_gpas[0]) if all_weekly_gpas else 0
-    weekly_p10, weekly_p50, weekly_p90 = [], [], []
-    for w in range(num_weeks):
-        week_vals = sorted([run[w] for run in all_weekly_gpas if len(run) > w])
-        weekly_p10.append(round(percentile(week_vals, 10), 3))
-        weekly_p50.append(round(percentile(week_vals, 50), 3))
-        weekly_p90.append(round(percentile(week_vals, 90), 3))
-
-    return MonteCarloResult(
-        runs=len(all_final_gpas),
-        p10_gpa=round(percentile(all_final_gpas, 10), 3),
-        p50_gpa=round(percentile(all_final_gpas, 50), 3),
-        p90_gpa=round(percentile(all_final_gpas, 90), 3),
-        burnout_probability_mean=round(statistics.mean(all_burnout_probs), 3),
-        weekly_p10=weekly_p10,
-        weekly_p50=weekly_p50,
-        weekly_p90=weekly_p90,
+
+def compare_monte_carlo(
+    request: MonteCarloCompareRequest,
+    courses: CourseTable | list,
+    student,
+) -> MonteCarloCompareResult:
+    """
+    Monte Carlo over several scenarios with common random numbers.
+
+    Every scenario is simulated against the same noise matrix — run i of
+    each scenario sees the same sleep, efficiency and disruption draws — so
+    the paired differences against the baseline (the first scenario) cancel
+    most of the sampling noise. Differences are bands of
+    (scenario − baseline) GPA per run, far tighter than comparing two
+    independently sampled bands.
+
+    With a `tolerance`, runs stop once every difference band's bootstrap CI
+    is narrower than it.
+
+    Args:
+        request: MonteCarloCompareRequest with the scenarios (baseline
+            first) and shared MC settings.
+        courses: CourseTable (or list of Course ORM objects) shared by all
+            scenarios; each selects its own via include_course_ids.
+        student: Student ORM object.
+
+    Returns:
+        MonteCarloCompareResult with per-scenario and paired-difference bands.
+
+    Raises:
+        ValueError: If a scenario selects no courses.
+    """
+    configs = request.scenario_configs
+    mc = request.monte_carlo
+    weeks = [cfg.num_weeks for cfg in configs]
+    # Weekly differences cover the weeks both scenarios simulate
+    shared_weeks = [min(weeks[0], w) for w in weeks]
+
+    scenario_bands = [_MonteCarloBands(mc) for _ in configs]
+    difference_bands = [_MonteCarloBands(mc, DIFFERENCE_GRID) for _ in configs[1:]]
+    better = np.zeros(len(configs) - 1, dtype=int)
+
+    chunks = _iter_chunks(configs, mc, CourseTable.from_courses(courses))
+    try:
+        for chunk in chunks:
+            final_gpa, weekly_gpa, burnout = _rounded(chunk)
+            for k, bands in enumerate(scenario_bands):
+                bands.add(final_gpa[k], weekly_gpa[k, :, : weeks[k]], burnout[k])
+            for k, bands in enumerate(difference_bands, start=1):
+                common = slice(0, shared_weeks[k])
+                gpa_delta = final_gpa[k] - final_gpa[0]
+                bands.add(
+                    gpa_delta,
+                    weekly_gpa[k, :, common] - weekly_gpa[0, :, common],
+                    burnout[k] - burnout[0],
+                )
+                better[k - 1] += int((gpa_delta > 0).sum())
+            runs = scenario_bands[0].runs
+            if runs < mc.runs and all(bands.converged() for bands in difference_bands):
+                for bands in scenario_bands + difference_bands:
+                    bands.stopped_early = True
+                break
+    finally:
+        chunks.close()
+
+    return MonteCarloCompareResult(
+        runs=runs,
+        scenarios=[bands.result() for bands in scenario_bands],
+        differences=[
+            MonteCarloDifference(
+                scenario_index=k,
+                bands=bands.result(),
+                probability_better=round(float(better[k - 1]) / runs, 3),
+            )
+            for k, bands in enumerate(difference_bands, start=1)
+        ],
     )
@@ -2,13 +2,14 @@
 Schedule Optimizer.
 
 Wraps the simulation engine as a black-box objective function and uses
-scipy's differential evolution algorithm to search for the optimal
-weekly schedule configuration.
+scipy's differential evolution algorithm (or, with `method="surrogate"`, a
+Gaussian-process surrogate with expected improvement) to search for the
+optimal weekly schedule configuration.
 
 Optimization variables:
   - work_hours_per_week (continuous)
   - sleep_hours_per_night (continuous)
-  - study_strategy (categorical, encoded)
+  - study_strategy (categorical — one search per strategy)
 
 Objective functions:
   - 'maximize_gpa': minimize negative predicted GPA
@@ -19,109 +20,437 @@ Uses differential evolution because:
   - The schedule space is non-convex and non-differentiable
   - Categorical + continuous mixed variable space
   - No gradient information available
+
+The categorical strategy is not encoded as a continuous variable: each
+strategy gets its own 2-D (work, sleep) search, the three run concurrently
+and the best one wins. DE runs in vectorized mode, so each generation is
+scored by a single `SimulationEngine.run_batch` call, and every search
+memoizes its objective on a quantized (work, sleep) grid so near-identical
+candidates are never simulated twice.
+
+The surrogate method spends far fewer simulations: a small space-filling
+design seeds a GP over the quantized grid, and each further simulation goes
+to the grid point with the highest expected improvement, stopping once no
+point is expected to improve on the best one.
+
+With `request.deadline_ms` set the searches are anytime: once the budget
+has elapsed, no further batch is simulated and each search keeps the best
+schedule it has seen (the incumbent), and the result reports
+`converged=False`.
+
+Searches can be warm-started from earlier optima (`seeds`): they are placed
+in DE's initial population, or simulated with the surrogate's initial
+design, so a request for slightly changed courses starts next to the old
+answer. `reuse_optimum` rebuilds a full result from a stored optimum
+without any search.
 """
 
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Sequence
+
 import numpy as np
 from scipy.optimize import differential_evolution
+from scipy.stats import qmc
 
 from app.schemas.simulation import (
     OptimizationConstraints,
     OptimizationRequest,
     OptimizationResult,
+    ParetoPoint,
+    ParetoRequest,
+    ParetoResult,
     ScenarioConfig,
+    StrategySearchStats,
 )
+from app.simulation import performance_model as pm
+from app.simulation.course_table import CourseTable
+from app.simulation.surrogate import GaussianProcess, expected_improvement
 
 
 STRATEGY_ENCODING = {0: "spaced", 1: "mixed", 2: "cramming"}
 
+# Memo grid: candidates closer than this are treated as the same schedule
+WORK_HOURS_QUANTUM: float = 0.5    # hours/week
+SLEEP_HOURS_QUANTUM: float = 0.25  # hours/night
 
-def optimize_schedule(
-    engine,
-    student,
-    courses: list,
-    request: OptimizationRequest,
-) -> OptimizationResult:
-    """
-    Search for the optimal weekly schedule using differential evolution.
+# Objective value for candidates the engine cannot simulate
+INVALID_PENALTY: float = 1e6
 
-    Decision vector x = [work_hours, sleep_hours_per_night, strategy_idx]
+# Surrogate search budget per strategy: Sobol' design, then EI proposals
+SURROGATE_INITIAL_POINTS: int = 8
+SURROGATE_MAX_PROPOSALS: int = 16
+# Stop proposing once no grid point's expected improvement exceeds this
+SURROGATE_MIN_IMPROVEMENT: float = 1e-4
 
-    Args:
-        engine: SimulationEngine instance (already instantiated).
-        student: Student ORM object.
-        courses: List of Course ORM objects to include in optimization.
-        request: OptimizationRequest with constraints and objective.
+# Prior optima used to seed a search
+WARM_START_MAX_SEEDS: int = 5
 
-    Returns:
-        OptimizationResult with optimal parameters and predicted outcomes.
-    """
-    constraints = request.constraints
-    course_ids = [c.id for c in courses]
+# DE settings shared by the cold and seeded searches
+_DE_POPSIZE: int = 15
+
+
+_QUANTA = np.array([WORK_HOURS_QUANTUM, SLEEP_HOURS_QUANTUM])
+
+
+def _key_range(bounds: list[tuple[float, float]]) -> tuple[np.ndarray, np.ndarray]:
+    """Lowest and highest (work, sleep) grid indices inside the bounds."""
+    low, high = np.array(bounds, dtype=float).T
+    key_low = np.ceil(low / _QUANTA - 1e-9).astype(int)
+    return key_low, np.maximum(key_low, np.floor(high / _QUANTA + 1e-9).astype(int))
+
+
+def _grid_keys(key_low: np.ndarray, key_high: np.ndarray) -> np.ndarray:
+    """Every (work, sleep) grid index pair in the range, shape (N, 2)."""
+    work, sleep = np.meshgrid(
+        np.arange(key_low[0], key_high[0] + 1),
+        np.arange(key_low[1], key_high[1] + 1),
+        indexing="ij",
+    )
+    return np.column_stack([work.ravel(), sleep.ravel()])
 
-    bounds = [
+
+def schedule_bounds(constraints: OptimizationConstraints) -> list[tuple[float, float]]:
+    """(min, max) work hours/week and sleep hours/night allowed by the constraints."""
+    return [
         (0.0, constraints.max_work_hours_per_week),       # work_hours
         (constraints.min_sleep_hours, 10.0),               # sleep_hours/night
-        (0.0, 2.99),                                       # strategy_idx (floor → 0,1,2)
     ]
 
-    def objective(x: np.ndarray) -> float:
-        work_h, sleep_h, strat_idx = x
-        strategy = STRATEGY_ENCODING[int(strat_idx)]
 
-        config = ScenarioConfig(
-            student_id=student.id,
-            num_weeks=request.num_weeks,
-            work_hours_per_week=float(work_h),
-            sleep_target_hours=float(sleep_h),
-            study_strategy=strategy,
-            include_course_ids=course_ids,
+class DeadlineExpired(Exception):
+    """Raised by ScheduleObjective when the search's time budget has run out."""
+
+
+def burnout_scores(probability: np.ndarray) -> np.ndarray:
+    """Objective penalty per burnout risk label (LOW 0.1, MEDIUM 0.5, HIGH 0.9)."""
+    return np.select([probability < 0.33, probability < 0.66], [0.1, 0.5], default=0.9)
+
+
+class ScheduleObjective:
+    """
+    Batched, memoized objective over (work_hours, sleep_hours) for one strategy.
+
+    Candidates are snapped to the WORK/SLEEP quantum grid (kept inside the
+    bounds); only grid points not seen before are simulated, all in one
+    `run_batch` call.
+
+    Args:
+        engine: SimulationEngine used for the batched runs.
+        courses: CourseTable the schedule is optimized for.
+        request: OptimizationRequest (objective, num_weeks).
+        student_id: Student the configs belong to.
+        strategy: Study strategy held fixed in this search.
+        bounds: [(min, max) work hours, (min, max) sleep hours].
+        deadline: `time.monotonic()` value after which no new batch is
+            simulated (DeadlineExpired is raised instead); the first batch
+            always runs so there is an incumbent. None for no limit.
+    """
+
+    def __init__(self, engine, courses: CourseTable, request: OptimizationRequest,
+                 student_id: int, strategy: str, bounds: list[tuple[float, float]],
+                 deadline: float | None = None):
+        self.quanta = _QUANTA
+        self.key_low, self.key_high = _key_range(bounds)
+        self.engine = engine
+        self.courses = courses
+        self.request = request
+        self.student_id = student_id
+        self.strategy = strategy
+        self.course_ids = courses.ids.tolist()
+        self.cache: dict[tuple[int, int], float] = {}
+        self.evaluations = 0
+        self.lookups = 0
+        self.deadline = deadline
+        self.expired = False
+
+    @property
+    def hits(self) -> int:
+        return self.lookups - self.evaluations
+
+    def config(self, key: tuple[int, int]) -> ScenarioConfig:
+        """ScenarioConfig for a quantized (work, sleep) grid point."""
+        return ScenarioConfig(
+            student_id=self.student_id,
+            num_weeks=self.request.num_weeks,
+            work_hours_per_week=key[0] * WORK_HOURS_QUANTUM,
+            sleep_target_hours=key[1] * SLEEP_HOURS_QUANTUM,
+            study_strategy=self.strategy,
+            include_course_ids=self.course_ids,
         )
 
-        try:
-            result = engine.run(config=config, courses=courses, student=student)
-        except Exception:
-            return 1e6  # penalize invalid configs
+    def __call__(self, population: np.ndarray) -> np.ndarray:
+        # population has shape (2, S): one column per candidate schedule
+        grid = np.rint(population / self.quanta[:, None]).astype(int)
+        grid = np.clip(grid, self.key_low[:, None], self.key_high[:, None])
+        keys = list(zip(*grid.tolist()))
+        missing = [key for key in dict.fromkeys(keys) if key not in self.cache]
+        if missing and self.cache and self._out_of_time():
+            self.expired = True
+            raise DeadlineExpired
+        if missing:
+            try:
+                batch = self.engine.run_batch([self.config(k) for k in missing], self.courses)
+                scores = self.score(batch).tolist()
+            except Exception:
+                scores = [INVALID_PENALTY] * len(missing)  # penalize invalid configs
+            self.cache.update(zip(missing, scores))
+        self.evaluations += len(missing)
+        self.lookups += len(keys)
+        return np.array([self.cache[key] for key in keys])
 
-        gpa = result.summary.predicted_gpa_mean
-        burnout = result.summary.burnout_risk
+    def _out_of_time(self) -> bool:
+        return self.deadline is not None and time.monotonic() >= self.deadline
 
-        burnout_score = {"LOW": 0.1, "MEDIUM": 0.5, "HIGH": 0.9}[burnout]
+    def score(self, batch) -> np.ndarray:
+        """Objective value (lower is better) per simulated scenario."""
+        gpa = pm.round_like_builtin(batch.final_gpa, 2)
+        burnout_score = burnout_scores(batch.final_burnout_probability)
 
-        if request.objective == "maximize_gpa":
+        if self.request.objective == "maximize_gpa":
             return -gpa
-        elif request.objective == "minimize_burnout":
+        elif self.request.objective == "minimize_burnout":
             return burnout_score
         else:  # balanced
             return -gpa * 0.6 + burnout_score * 0.4
 
-    result = differential_evolution(
+    def grid_keys(self) -> np.ndarray:
+        """Every quantized (work, sleep) grid point inside the bounds, shape (N, 2)."""
+        return _grid_keys(self.key_low, self.key_high)
+
+    def best(self) -> tuple[tuple[int, int], float]:
+        """Best grid point simulated so far and its objective value."""
+        key = min(self.cache, key=self.cache.__getitem__)
+        return key, self.cache[key]
+
+    def stats(self) -> StrategySearchStats:
+        return StrategySearchStats(
+            strategy=self.strategy,
+            best_objective=round(self.best()[1], 4),
+            evaluations=self.evaluations,
+            cache_lookups=self.lookups,
+            cache_hits=self.hits,
+            converged=not self.expired,
+        )
+
+
+def request_key(request: OptimizationRequest) -> str:
+    """
+    Hex SHA-256 of the request fields that determine the optimum.
+
+    Covers the objective, semester length and constraints; the search
+    method and deadline only change how the optimum is found.
+    """
+    payload = json.dumps(
+        request.model_dump(mode="json", include={"objective", "num_weeks", "constraints"}),
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _de_search(
+    objective: ScheduleObjective,
+    bounds: list[tuple[float, float]],
+    seeds: np.ndarray,
+) -> None:
+    """Run vectorized DE over (work, sleep); results accumulate in `objective`."""
+    init = "latinhypercube"
+    if len(seeds):
+        # Same Latin hypercube start, with the seeds replacing its first rows
+        low, high = np.array(bounds, dtype=float).T
+        population = _DE_POPSIZE * len(bounds)
+        init = qmc.scale(qmc.LatinHypercube(d=len(bounds), seed=42).random(population), low, high)
+        seeds = seeds[:population]
+        init[: len(seeds)] = np.clip(seeds, low, high)
+    differential_evolution(
         objective,
         bounds=bounds,
         maxiter=50,
-        popsize=10,
+        popsize=_DE_POPSIZE,
+        init=init,
         seed=42,
         tol=0.01,
+        vectorized=True,
+        updating="deferred",
+        polish=False,  # objective is piecewise constant: no gradient to follow
     )
 
-    optimal_work = float(result.x[0])
-    optimal_sleep = float(result.x[1])
-    optimal_strategy = STRATEGY_ENCODING[int(result.x[2])]
 
-    # Run final simulation with optimal params to get full result
-    optimal_config = ScenarioConfig(
+def _surrogate_search(
+    objective: ScheduleObjective,
+    bounds: list[tuple[float, float]],
+    seeds: np.ndarray,
+) -> None:
+    """
+    Bayesian optimization over the quantized (work, sleep) grid.
+
+    Simulates a scrambled Sobol' design (plus any seeds), then repeatedly
+    fits a GP to the grid points seen so far and simulates the unseen one
+    with the highest expected improvement. Results accumulate in `objective`.
+    """
+    low, high = np.array(bounds, dtype=float).T
+    design = qmc.Sobol(d=2, scramble=True, seed=42).random(SURROGATE_INITIAL_POINTS)
+    objective(np.vstack([qmc.scale(design, low, high), seeds]).T)
+
+    keys = objective.grid_keys()
+    span = np.maximum(objective.key_high - objective.key_low, 1)
+    unit = (keys - objective.key_low) / span  # GP inputs live in [0, 1]^2
+
+    for _ in range(SURROGATE_MAX_PROPOSALS):
+        seen = np.array([key in objective.cache for key in map(tuple, keys.tolist())])
+        if seen.all():
+            break
+        values = np.array([objective.cache[key] for key in map(tuple, keys[seen].tolist())])
+        valid = values < INVALID_PENALTY
+        if not valid.any():
+            break
+        # Keep penalized points in the fit, but at the worst valid value so
+        # they do not swamp the target scale
+        values = np.where(valid, values, values[valid].max())
+
+        gp = GaussianProcess().fit(unit[seen], values)
+        mean, std = gp.predict(unit[~seen])
+        improvement = expected_improvement(mean, std, values.min())
+        if improvement.max() <= SURROGATE_MIN_IMPROVEMENT:
+            break
+        proposal = keys[~seen][np.argmax(improvement)]
+        objective((proposal * objective.quanta)[:, None])
+
+
+# Search routine per OptimizationRequest.method
+_SEARCHES = {"de": _de_search, "surrogate": _surrogate_search}
+
+
+def _run_search(
+    method: str,
+    objective: ScheduleObjective,
+    bounds: list[tuple[float, float]],
+    seeds: np.ndarray,
+) -> None:
+    """Run one strategy search, stopping quietly at the deadline."""
+    try:
+        _SEARCHES[method](objective, bounds, seeds)
+    except DeadlineExpired:
+        pass  # the incumbent is already in objective.cache
+
+
+def optimize_schedule(
+    engine,
+    student,
+    courses: CourseTable | list,
+    request: OptimizationRequest,
+    seeds: Sequence[tuple[float, float]] = (),
+) -> OptimizationResult:
+    """
+    Search for the optimal weekly schedule.
+
+    Uses differential evolution, or a GP surrogate with expected
+    improvement when `request.method == "surrogate"`. Runs one 2-D search
+    over x = [work_hours, sleep_hours_per_night] per study strategy,
+    concurrently, and keeps the best schedule overall.
+
+    Args:
+        engine: SimulationEngine instance (already instantiated).
+        student: Student ORM object.
+        courses: CourseTable (or list of Course ORM objects) to include in optimization.
+        request: OptimizationRequest with constraints and objective.
+        seeds: (work_hours, sleep_hours) of earlier optima to start every
+            strategy's search from (at most WARM_START_MAX_SEEDS are used).
+
+    Returns:
+        OptimizationResult with optimal parameters, predicted outcomes,
+        per-strategy evaluation / cache statistics and whether every search
+        finished within `request.deadline_ms`.
+    """
+    courses = CourseTable.from_courses(courses)
+    bounds = schedule_bounds(request.constraints)
+
+    deadline = None
+    if request.deadline_ms is not None:
+        deadline = time.monotonic() + request.deadline_ms / 1000.0
+
+    seeds = np.array(list(seeds)[:WARM_START_MAX_SEEDS], dtype=float).reshape(-1, 2)
+
+    objectives = [
+        ScheduleObjective(engine, courses, request, student.id, strategy, bounds, deadline)
+        for strategy in STRATEGY_ENCODING.values()
+    ]
+    with ThreadPoolExecutor(max_workers=len(objectives)) as pool:
+        list(pool.map(
+            lambda objective: _run_search(request.method, objective, bounds, seeds),
+            objectives,
+        ))
+
+    # Ties go to the earlier strategy (spaced, mixed, cramming)
+    winner = min(objectives, key=lambda objective: objective.best()[1])
+    return _build_result(
+        engine, student, courses, request, winner.config(winner.best()[0]),
+        evaluations=sum(objective.evaluations for objective in objectives),
+        cache_hit_rate=round(
+            sum(o.hits for o in objectives) / max(1, sum(o.lookups for o in objectives)), 3
+        ),
+        strategy_searches=[objective.stats() for objective in objectives],
+        converged=not any(objective.expired for objective in objectives),
+        warm_start="seeded" if len(seeds) else "cold",
+    )
+
+
+def reuse_optimum(
+    engine,
+    student,
+    courses: CourseTable | list,
+    request: OptimizationRequest,
+    work_hours: float,
+    sleep_hours: float,
+    study_strategy: str,
+) -> OptimizationResult:
+    """
+    Rebuild the result of an earlier search without searching again.
+
+    Only valid when the stored optimum was found for the same courses
+    (CourseTable.fingerprint) and the same `request_key`; the simulation is
+    deterministic, so one run reproduces the original result.
+
+    Returns:
+        OptimizationResult with `warm_start="reused"` and zero search evaluations.
+    """
+    courses = CourseTable.from_courses(courses)
+    config = ScenarioConfig(
         student_id=student.id,
         num_weeks=request.num_weeks,
-        work_hours_per_week=optimal_work,
-        sleep_target_hours=optimal_sleep,
-        study_strategy=optimal_strategy,
-        include_course_ids=course_ids,
+        work_hours_per_week=work_hours,
+        sleep_target_hours=sleep_hours,
+        study_strategy=study_strategy,
+        include_course_ids=courses.ids.tolist(),
     )
+    return _build_result(engine, student, courses, request, config, warm_start="reused")
+
+
+def _build_result(
+    engine,
+    student,
+    courses: CourseTable,
+    request: OptimizationRequest,
+    optimal_config: ScenarioConfig,
+    **search_info,
+) -> OptimizationResult:
+    """Simulate the chosen schedule in full and package it as an OptimizationResult."""
+    optimal_work = optimal_config.work_hours_per_week
+    optimal_sleep = optimal_config.sleep_target_hours
+    optimal_strategy = optimal_config.study_strategy
+
+    # Run final simulation with optimal params to get full result
     final_sim = engine.run(config=optimal_config, courses=courses, student=student)
 
     # Distribute total study hours across courses proportional to workload demand
     # (weekly_workload_hours reflects both difficulty and credit intensity)
-    last_alloc = final_sim.weekly_snapshots[-1].time_allocation
-    total_study_hours = last_alloc.deep_study_hours + last_alloc.shallow_study_hours
+    last_alloc = final_sim.trace.time_allocation
+    total_study_hours = float(
+        last_alloc["deep_study_hours"][-1] + last_alloc["shallow_study_hours"][-1]
+    )
     total_workload = sum(c.weekly_workload_hours for c in courses)
     if total_workload > 0:
         study_per_course = {
@@ -141,4 +470,68 @@ def optimize_schedule(
         predicted_gpa=final_sim.summary.predicted_gpa_mean,
         predicted_burnout_probability=final_sim.summary.burnout_probability,
         simulation_result=final_sim,
+        **search_info,
     )
+
+
+def pareto_front(
+    engine,
+    student,
+    courses: CourseTable | list,
+    request: ParetoRequest,
+) -> ParetoResult:
+    """
+    Non-dominated (GPA, burnout probability) schedules over the whole grid.
+
+    Every quantized (work, sleep) point of every strategy is simulated in a
+    single `run_batch` call. A schedule is kept unless another one has at
+    least its GPA and at most its burnout probability (and is strictly
+    better in one of them); among identical outcomes the first schedule in
+    strategy, work, sleep order is kept.
+
+    Args:
+        engine: SimulationEngine instance.
+        student: Student ORM object.
+        courses: CourseTable (or list of Course ORM objects) to include.
+        request: ParetoRequest with constraints and semester length.
+
+    Returns:
+        ParetoResult with the front ordered by increasing burnout probability
+        (and therefore increasing GPA).
+    """
+    courses = CourseTable.from_courses(courses)
+    course_ids = courses.ids.tolist()
+    grid = _grid_keys(*_key_range(schedule_bounds(request.constraints))) * _QUANTA
+    configs = [
+        ScenarioConfig(
+            student_id=student.id,
+            num_weeks=request.num_weeks,
+            work_hours_per_week=float(work),
+            sleep_target_hours=float(sleep),
+            study_strategy=strategy,
+            include_course_ids=course_ids,
+        )
+        for strategy in STRATEGY_ENCODING.values()
+        for work, sleep in grid.tolist()
+    ]
+    outcomes = engine.run_batch(configs, courses).lite_results()
+
+    # Sweep by burnout (then GPA, best first): a schedule is on the front
+    # iff it beats the GPA of every schedule with lower or equal burnout
+    order = sorted(
+        range(len(configs)),
+        key=lambda i: (outcomes[i].burnout_probability, -outcomes[i].predicted_gpa_mean),
+    )
+    points: list[ParetoPoint] = []
+    for i in order:
+        outcome = outcomes[i]
+        if points and outcome.predicted_gpa_mean <= points[-1].predicted_gpa:
+            continue
+        points.append(ParetoPoint(
+            config=configs[i],
+            predicted_gpa=outcome.predicted_gpa_mean,
+            burnout_probability=outcome.burnout_probability,
+            burnout_risk=outcome.burnout_risk,
+        ))
+
+    return ParetoResult(points=points, evaluations=len(configs))
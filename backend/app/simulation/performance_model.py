@@ -29,6 +29,8 @@ References:
 
 import math
 
+import numpy as np
+
 GRADE_TO_GPA = [
     (93, 4.0),
     (90, 3.7),
@@ -117,6 +119,9 @@ def grade_to_gpa_points(percentage: float) -> float:
     return 0.0
 
 
+_GPA_BY_WHOLE_PERCENT = np.array([grade_to_gpa_points(p) for p in range(101)])
+
+
 def compute_gpa(
     course_grades: dict[str, float],
     course_credits: dict[str, int],
@@ -170,3 +175,111 @@ def compute_semester_gpa(
         for name in course_names
     }
     return compute_gpa(avg_grades, course_credits)
+
+
+def predict_grade_batch(
+    difficulty: np.ndarray,
+    workload: np.ndarray,
+    study_hours: np.ndarray,
+    avg_cognitive_load: np.ndarray,
+    cumulative_retention: np.ndarray,
+    is_exam_week: np.ndarray,
+    burnout_probability: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized predict_grade over a (scenarios, courses) grid.
+
+    Args:
+        difficulty: Difficulty score per course, shape (courses,) or
+            (scenarios, courses).
+        workload: Weekly workload hours per course, same shape as difficulty.
+        study_hours: Study hours per course, shape (scenarios, courses).
+        avg_cognitive_load: Cognitive load per scenario, shape (scenarios,).
+        cumulative_retention: Retention per course, shape (scenarios, courses).
+        is_exam_week: Exam-week flag per scenario, shape (scenarios,).
+        burnout_probability: Burnout probability per scenario, shape (scenarios,).
+
+    Returns:
+        Predicted grades [0, 100], shape (scenarios, courses).
+    """
+    demand = workload * (difficulty / 5.0)
+    study_ratio = study_hours / np.maximum(demand, 0.5)
+    sigmoid_val = 1.0 / (1.0 + np.exp(-2.5 * (study_ratio - 1.0)))
+    base_score = 40.0 + sigmoid_val * 55.0
+
+    load_penalty = np.where(
+        avg_cognitive_load > 70.0, (avg_cognitive_load - 70.0) * 0.5, 0.0
+    )[:, None]
+    retention_bonus = cumulative_retention * 10.0
+
+    exam = is_exam_week[:, None]
+    exam_modifier = (
+        np.where(exam & (cumulative_retention > 0.7), 5.0, 0.0)
+        - np.where(exam & (burnout_probability[:, None] > 0.6), 10.0, 0.0)
+    )
+
+    grade = base_score - load_penalty + retention_bonus + exam_modifier
+    return np.clip(grade, 0.0, 100.0)
+
+
+def grade_to_gpa_points_batch(percentage: np.ndarray) -> np.ndarray:
+    """Vectorized grade_to_gpa_points for percentages in [0, 100]."""
+    # Thresholds are whole percentages, so the floor picks the same band
+    whole = np.clip(np.floor(percentage), 0, 100).astype(int)
+    return _GPA_BY_WHOLE_PERCENT[whole]
+
+
+def compute_gpa_batch(
+    grades: np.ndarray,
+    credits: np.ndarray,
+    present: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized compute_gpa: credit-weighted GPA of the courses in `present`.
+
+    Args:
+        grades: Percentage grades, shape (scenarios, courses).
+        credits: Credit hours, shape (courses,) or (scenarios, courses).
+        present: Boolean mask of courses that count, same shape as grades.
+
+    Returns:
+        GPA per scenario on a 4.0 scale (0.0 where no course is present).
+    """
+    quality_points = np.where(present, grade_to_gpa_points_batch(grades) * credits, 0.0)
+    credit_hours = np.where(present, credits, 0)
+    total_quality_points = np.zeros(grades.shape[0])
+    for j in range(grades.shape[1]):
+        total_quality_points = total_quality_points + quality_points[:, j]
+    total_credits = credit_hours.sum(axis=-1)
+
+    gpa = total_quality_points / np.where(total_credits > 0, total_credits, 1)
+    return np.where(total_credits > 0, round_like_builtin(gpa, 2), 0.0)
+
+
+def round_like_builtin(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """
+    Round non-negative values exactly like the built-in round().
+
+    np.round rounds `values * 10**ndigits`, and that product can itself round
+    onto an exact .5. For those elements the exact product is recovered with
+    a Veltkamp split (each half times the scale is exact) and compared with
+    the midpoint, falling back to half-to-even only for genuine ties.
+    """
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded_scaled = np.rint(scaled)
+    floor = np.floor(scaled)
+    tie = (scaled - floor) == 0.5
+    if tie.any():
+        x = values[tie]
+        split = x * 134217729.0  # 2**27 + 1
+        hi = split - (split - x)
+        lo = x - hi
+        midpoint = floor[tie] + 0.5
+        excess = (hi * scale - midpoint) + lo * scale  # sign is exact
+        is_even = np.fmod(floor[tie], 2.0) == 0.0
+        rounded_scaled[tie] = np.where(
+            excess > 0, floor[tie] + 1.0,
+            np.where(excess < 0, floor[tie], np.where(is_even, floor[tie], floor[tie] + 1.0)),
+        )
+    return rounded_scaled / scale
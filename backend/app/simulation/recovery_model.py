@@ -79,47 +79,127 @@ def compute_burnout_probability(
       - Consecutive overload streak (weight: 0.20)
       - Mean sleep deficit (weight: 0.20)
 
+    Equivalent to feeding each week into a BurnoutAccumulator; callers that
+    advance week by week should keep an accumulator instead.
+
     Args:
         load_history: List of per-week cognitive load scores (0–100).
-        sleep_history: List of per-week total sleep hours.
+        sleep_history: List of per-week total sleep hours (averaged over
+            the load weeks; 49h/week when empty).
         recovery_history: List of per-week recovery hours.
 
     Returns:
         Burnout probability [0, 1].
     """
-    if not load_history:
-        return 0.0
-
-    n = len(load_history)
+    accumulator = BurnoutAccumulator()
+    for load in load_history:
+        accumulator.update(load, 0.0)
+    # Mean sleep is taken over the load weeks; no sleep data counts as 49h/week
+    accumulator.sleep_total = sum(sleep_history) if sleep_history else 49.0 * accumulator.weeks
+    return accumulator.probability()
 
-    # Factor 1: Mean cognitive load normalized to 0-1
-    mean_load = sum(load_history) / n
-    mean_load_factor = mean_load / 100.0
 
-    # Factor 2: Proportion of weeks in overload zone
-    overload_weeks = sum(1 for l in load_history if l > BURNOUT_LOAD_THRESHOLD)
-    overload_proportion = overload_weeks / n
+class BurnoutAccumulator:
+    """
+    Running burnout state, updated in O(1) per simulated week.
 
-    # Factor 3: Longest consecutive overload streak
-    max_streak = _max_consecutive(load_history, threshold=BURNOUT_LOAD_THRESHOLD)
-    streak_factor = min(max_streak / 8.0, 1.0)  # 8+ weeks = max risk
+    Keeps the load and sleep sums, the overload-week count, the current
+    overload streak and the longest streak so far — everything
+    compute_burnout_probability needs — instead of rescanning the history.
+    Pass `num_scenarios` to track many scenarios at once as NumPy arrays.
 
-    # Factor 4: Mean sleep deficit factor
-    mean_sleep = sum(sleep_history) / n if sleep_history else 49.0
-    sleep_deficit = max(0.0, 49.0 - mean_sleep)
-    sleep_factor = min(sleep_deficit / 21.0, 1.0)  # 21h deficit = 3h/night short
+    Args:
+        num_scenarios: None for a single scenario (float state), otherwise
+            the length of the per-scenario state arrays.
+    """
 
-    # Weighted logistic score
-    raw_score = (
-        0.35 * mean_load_factor
-        + 0.25 * overload_proportion
-        + 0.20 * streak_factor
-        + 0.20 * sleep_factor
-    )
+    def __init__(self, num_scenarios: int | None = None):
+        self.vectorized = num_scenarios is not None
+        self.weeks = 0
+        if self.vectorized:
+            self.load_total = np.zeros(num_scenarios)
+            self.sleep_total = np.zeros(num_scenarios)
+            self.overload_weeks = np.zeros(num_scenarios, dtype=int)
+            self.current_streak = np.zeros(num_scenarios, dtype=int)
+            self.max_streak = np.zeros(num_scenarios, dtype=int)
+        else:
+            self.load_total = 0.0
+            self.sleep_total = 0.0
+            self.overload_weeks = 0
+            self.current_streak = 0
+            self.max_streak = 0
+
+    def update(self, load, sleep_hours):
+        """
+        Add one week and return the burnout probability including it.
+
+        Args:
+            load: This week's cognitive load (0–100), scalar or per-scenario array.
+            sleep_hours: This week's total sleep hours, scalar or per-scenario array.
+
+        Returns:
+            Burnout probability [0, 1] over all weeks seen so far.
+        """
+        self.weeks += 1
+        self.load_total = self.load_total + load
+        self.sleep_total = self.sleep_total + sleep_hours
+        overloaded = load > BURNOUT_LOAD_THRESHOLD
+        if self.vectorized:
+            self.overload_weeks = self.overload_weeks + overloaded
+            self.current_streak = np.where(overloaded, self.current_streak + 1, 0)
+            self.max_streak = np.maximum(self.max_streak, self.current_streak)
+        else:
+            self.overload_weeks += overloaded
+            self.current_streak = self.current_streak + 1 if overloaded else 0
+            self.max_streak = max(self.max_streak, self.current_streak)
+        return self.probability()
+
+    def probability(self):
+        """Burnout probability over the weeks seen so far (0 before any week)."""
+        n = self.weeks
+        if n == 0:
+            return np.zeros_like(self.load_total) if self.vectorized else 0.0
+
+        mean_load_factor = (self.load_total / n) / 100.0
+        overload_proportion = self.overload_weeks / n
+
+        if self.vectorized:
+            streak_factor = np.minimum(self.max_streak / 8.0, 1.0)
+            sleep_deficit = np.maximum(0.0, 49.0 - self.sleep_total / n)
+            sleep_factor = np.minimum(sleep_deficit / 21.0, 1.0)
+        else:
+            streak_factor = min(self.max_streak / 8.0, 1.0)  # 8+ weeks = max risk
+            sleep_deficit = max(0.0, 49.0 - self.sleep_total / n)
+            sleep_factor = min(sleep_deficit / 21.0, 1.0)  # 21h deficit = 3h/night short
+
+        # Weighted logistic score
+        raw_score = (
+            0.35 * mean_load_factor
+            + 0.25 * overload_proportion
+            + 0.20 * streak_factor
+            + 0.20 * sleep_factor
+        )
+
+        # Apply logistic function centered at 0.5 for smooth probability
+        if self.vectorized:
+            probability = 1.0 / (1.0 + np.exp(-10.0 * (raw_score - 0.45)))
+            return np.clip(probability, 0.0, 1.0)
+        probability = 1.0 / (1.0 + math.exp(-10.0 * (raw_score - 0.45)))
+        return min(max(probability, 0.0), 1.0)
+
+
+def compute_recovery_batch(
+    current_fatigue: np.ndarray,
+    sleep_hours: np.ndarray,
+    recovery_hours: np.ndarray,
+) -> np.ndarray:
+    """Vectorized compute_recovery: one fatigue update per array element."""
+    sleep_recovery = np.minimum((sleep_hours / 49.0) * 0.5, 0.5)
+    recovery_benefit = np.minimum(recovery_hours / 10.0 * 0.2, 0.2)
+    sleep_penalty = np.maximum(0.0, 49.0 - sleep_hours) * 0.015
 
-    # Apply logistic function centered at 0.5 for smooth probability
-    probability = 1.0 / (1.0 + math.exp(-10.0 * (raw_score - 0.45)))
-    return float(np.clip(probability, 0.0, 1.0))
+    fatigue_change = sleep_penalty - sleep_recovery - recovery_benefit
+    return np.clip(current_fatigue + fatigue_change, 0.0, 1.0)
 
 
 def burnout_risk_label(probability: float) -> str:
@@ -130,15 +210,3 @@ def burnout_risk_label(probability: float) -> str:
         return "MEDIUM"
     return "HIGH"
 
-
-def _max_consecutive(values: list[float], threshold: float) -> int:
-    """Return the length of the longest consecutive run where value > threshold."""
-    max_run = 0
-    current_run = 0
-    for v in values:
-        if v > threshold:
-            current_run += 1
-            max_run = max(max_run, current_run)
-        else:
-            current_run = 0
-    return max_run
@@ -0,0 +1,140 @@
+"""
+Simulation Result Cache.
+
+Content-addressed LRU cache in front of `SimulationEngine.run` / `run_lite`.
+The simulation is deterministic, so a result is fully determined by the
+scenario config and the course parameters; both are folded into a canonical
+SHA-256 key. Dashboard re-runs, compare-page reloads and overlapping
+goal-target grids then reuse earlier results instead of re-simulating.
+
+Entries are also indexed by student so `crud.create_course` /
+`crud.delete_course` can drop a student's results as soon as their course
+list changes.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import get_settings
+from app.schemas.simulation import ScenarioConfig
+from app.simulation.course_table import CourseTable
+
+
+# Fields that label a scenario but do not change the simulated outcome
+_COSMETIC_FIELDS = {"scenario_name"}
+
+
+def cache_key(config: ScenarioConfig, courses: CourseTable, kind: str = "full") -> str:
+    """
+    Canonical hash of everything that determines a simulation outcome.
+
+    Args:
+        config: Scenario configuration (defaults already applied by pydantic).
+        courses: Course parameters the scenario runs against.
+        kind: Result flavour ("full", "lite", ...) so different result types
+            never collide.
+
+    Returns:
+        Hex SHA-256 digest.
+    """
+    canonical = config.model_dump(mode="json", exclude=_COSMETIC_FIELDS)
+    canonical["include_course_ids"] = sorted(set(canonical["include_course_ids"]))
+    canonical["exam_weeks"] = sorted(set(canonical["exam_weeks"]))
+    payload = json.dumps(
+        [kind, canonical, [list(record) for record in courses.records]],
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class SimulationCache:
+    """
+    Thread-safe, bounded LRU map from cache key to simulation result.
+
+    Args:
+        max_entries: Maximum number of cached results; the least recently
+            used entry is evicted beyond this. 0 disables caching.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[int, Any]] = OrderedDict()
+        self._keys_by_student: dict[int, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for `key` (marking it recently used), or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, student_id: int, value: Any) -> None:
+        """Store `value` under `key`, evicting least recently used entries if full."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (student_id, value)
+            self._keys_by_student.setdefault(student_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                old_key, (old_student, _) = self._entries.popitem(last=False)
+                self._forget(old_key, old_student)
+                self.evictions += 1
+
+    def invalidate_student(self, student_id: int) -> int:
+        """
+        Drop every cached result for a student.
+
+        Returns:
+            Number of entries removed.
+        """
+        with self._lock:
+            keys = self._keys_by_student.pop(student_id, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_student.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, int]:
+        """Current size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _forget(self, key: str, student_id: int) -> None:
+        keys = self._keys_by_student.get(student_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_student[student_id]
+
+
+# Shared by the API routes and invalidated by crud on course changes
+simulation_cache = SimulationCache(max_entries=get_settings().SIMULATION_CACHE_SIZE)
@@ -15,6 +15,15 @@ References:
 
 import math
 
+import numpy as np
+
+# Memory stability (resistance to forgetting) by study strategy, in days
+STABILITY_BY_STRATEGY = {
+    "spaced": 21.0,    # 21-day half-life
+    "mixed": 10.0,     # 10-day half-life
+    "cramming": 4.0,   # 4-day half-life
+}
+
 
 def _forgetting_decay(days_since_review: int, stability: float) -> float:
     """
@@ -33,6 +42,30 @@ def _forgetting_decay(days_since_review: int, stability: float) -> float:
     return math.exp(-days_since_review / max(stability, 0.1))
 
 
+def strategy_retention_factors(
+    study_strategy: str,
+    days_since_last_review: int = 7,
+) -> tuple[float, float]:
+    """
+    Return the (forgetting decay, learning-gain multiplier) pair for a strategy.
+
+    Both depend only on the strategy and review interval, so batched callers
+    compute them once per scenario instead of once per course-week.
+    """
+    # Strategy determines memory stability (resistance to forgetting)
+    stability = STABILITY_BY_STRATEGY.get(study_strategy, 10.0)
+    decay = _forgetting_decay(days_since_last_review, stability)
+
+    # Spaced repetition bonus
+    if study_strategy == "spaced" and days_since_last_review >= 3:
+        gain_multiplier = 1.25
+    elif study_strategy == "cramming":
+        gain_multiplier = 0.80  # cramming is less efficient for long-term retention
+    else:
+        gain_multiplier = 1.0
+    return decay, gain_multiplier
+
+
 def update_retention(
     prior_retention: float,
     study_hours: float,
@@ -57,33 +90,48 @@ def update_retention(
     Returns:
         Updated retention score [0, 1].
     """
-    # Strategy determines memory stability (resistance to forgetting)
-    stability_map = {
-        "spaced": 21.0,    # 21-day half-life
-        "mixed": 10.0,     # 10-day half-life
-        "cramming": 4.0,   # 4-day half-life
-    }
-    stability = stability_map.get(study_strategy, 10.0)
+    decay, gain_multiplier = strategy_retention_factors(study_strategy, days_since_last_review)
 
     # Decay prior retention
-    decayed = prior_retention * _forgetting_decay(days_since_last_review, stability)
+    decayed = prior_retention * decay
 
     # Learning gain: logarithmic — first hours are most effective
     # Max gain per week capped at 0.6 (realistic ceiling for one week)
     raw_gain = min(study_hours / 10.0, 1.0)  # normalize: ~10h = full effort
     gain = 0.6 * math.log1p(raw_gain * 4) / math.log1p(4)
-
-    # Spaced repetition bonus
-    if study_strategy == "spaced" and days_since_last_review >= 3:
-        gain *= 1.25
-    elif study_strategy == "cramming":
-        gain *= 0.80  # cramming is less efficient for long-term retention
+    gain *= gain_multiplier
 
     # Combine: new knowledge fills gap between decayed retention and ceiling
     new_retention = decayed + gain * (1.0 - decayed)
     return float(min(max(new_retention, 0.0), 1.0))
 
 
+def update_retention_batch(
+    prior_retention: np.ndarray,
+    study_hours: np.ndarray,
+    decay: np.ndarray,
+    gain_multiplier: np.ndarray,
+) -> np.ndarray:
+    """
+    Vectorized update_retention over a (scenarios, courses) grid.
+
+    Args:
+        prior_retention: Retention scores from the previous week [0, 1].
+        study_hours: Study hours per course this week.
+        decay: Forgetting decay per scenario, broadcastable to the grid
+            (see strategy_retention_factors).
+        gain_multiplier: Strategy gain multiplier, broadcastable likewise.
+
+    Returns:
+        Updated retention scores [0, 1], same shape as prior_retention.
+    """
+    decayed = prior_retention * decay
+    raw_gain = np.minimum(study_hours / 10.0, 1.0)
+    gain = 0.6 * np.log1p(raw_gain * 4) / math.log1p(4)
+    gain = gain * gain_multiplier
+    return np.clip(decayed + gain * (1.0 - decayed), 0.0, 1.0)
+
+
 def semester_retention_curve(
     num_weeks: int,
     weekly_study_hours: float,
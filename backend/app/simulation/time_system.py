@@ -17,9 +17,18 @@ References:
 
 from dataclasses import dataclass
 
+import numpy as np
+
 HOURS_PER_WEEK = 168.0
 MIN_COMMUTE_AND_PERSONAL_HOURS = 14.0  # meals, hygiene, transit
 
+# Fraction of study time spent in deep (focused) work, by study strategy
+DEEP_STUDY_RATIO = {
+    "spaced": 0.70,
+    "cramming": 0.30,
+    "mixed": 0.50,
+}
+
 
 @dataclass
 class TimeAllocation:
@@ -131,12 +140,7 @@ def allocate_time(
         available_for_study = study_cap
 
     # Split study time by strategy
-    if study_strategy == "spaced":
-        deep_ratio = 0.70
-    elif study_strategy == "cramming":
-        deep_ratio = 0.30
-    else:  # mixed
-        deep_ratio = 0.50
+    deep_ratio = DEEP_STUDY_RATIO.get(study_strategy, DEEP_STUDY_RATIO["mixed"])
 
     deep_study = available_for_study * deep_ratio
     shallow_study = available_for_study * (1 - deep_ratio)
@@ -150,3 +154,87 @@ def allocate_time(
         recovery_hours=recovery_hours,
         social_hours=social_hours,
     )
+
+
+def compute_class_hours_batch(credits: np.ndarray, active: np.ndarray) -> np.ndarray:
+    """
+    Vectorized compute_class_hours over many course selections at once.
+
+    Args:
+        credits: Credit hours per course, shape (courses,), or per scenario
+            and course, shape (scenarios, courses).
+        active: Boolean enrollment mask, shape (..., courses).
+
+    Returns:
+        Weekly in-class hours, shape active.shape[:-1].
+    """
+    hours_per_course = credits * 1.0 + np.where(credits >= 4, 1.0, 0.0)
+    # Whole-hour values, so the matrix product (or sum) is exact
+    if hours_per_course.ndim == 1:
+        return active @ hours_per_course
+    return np.where(active, hours_per_course, 0.0).sum(axis=-1)
+
+
+def allocate_time_batch(
+    class_hours: np.ndarray,
+    workload_demand: np.ndarray,
+    work_hours: np.ndarray,
+    sleep_target_hours: np.ndarray,
+    deep_ratio: np.ndarray,
+    recovery_hours: np.ndarray,
+    social_hours: np.ndarray,
+    extracurricular_hours: np.ndarray,
+) -> TimeAllocation:
+    """
+    Vectorized allocate_time: same priority rules, applied element-wise.
+
+    Every argument is an array broadcastable to a common shape (typically
+    one entry per scenario). The course list is pre-reduced by the caller
+    to its class hours and total weekly workload demand.
+
+    Args:
+        class_hours: Weekly in-class hours (see compute_class_hours_batch).
+        workload_demand: Sum of weekly_workload_hours over active courses.
+        work_hours: Hours per week committed to employment.
+        sleep_target_hours: Nightly sleep target.
+        deep_ratio: Deep-study fraction (see DEEP_STUDY_RATIO).
+        recovery_hours: Hours reserved for rest beyond sleep.
+        social_hours: Hours reserved for social and leisure activities.
+        extracurricular_hours: Hours per week for clubs, sports, etc.
+
+    Returns:
+        TimeAllocation whose fields are arrays rather than floats.
+    """
+    sleep_hours = sleep_target_hours * 7.0
+
+    committed = (
+        sleep_hours
+        + class_hours
+        + work_hours
+        + extracurricular_hours
+        + MIN_COMMUTE_AND_PERSONAL_HOURS
+    )
+
+    soft_reserves = recovery_hours + social_hours
+    available_for_study = HOURS_PER_WEEK - committed - soft_reserves
+
+    squeezed = available_for_study < 0
+    squeezed_pool = np.maximum(0.0, HOURS_PER_WEEK - committed)
+    recovery_hours = np.where(squeezed, squeezed_pool * 0.4, recovery_hours)
+    social_hours = np.where(squeezed, squeezed_pool * 0.6, social_hours)
+    available_for_study = np.where(squeezed, 0.0, available_for_study)
+
+    study_cap = workload_demand * 2.0
+    capped = (study_cap > 0) & (available_for_study > study_cap)
+    social_hours = np.where(capped, social_hours + (available_for_study - study_cap), social_hours)
+    available_for_study = np.where(capped, study_cap, available_for_study)
+
+    return TimeAllocation(
+        class_hours=class_hours,
+        work_hours=work_hours,
+        sleep_hours=sleep_hours,
+        deep_study_hours=available_for_study * deep_ratio,
+        shallow_study_hours=available_for_study * (1 - deep_ratio),
+        recovery_hours=recovery_hours,
+        social_hours=social_hours,
+    )
@@ -2,6 +2,8 @@
 Pytest configuration and shared fixtures for the Academic Digital Twin test suite.
 """
 
+from unittest.mock import MagicMock
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
@@ -90,6 +92,29 @@ def sample_course_data():
     ]
 
 
+def make_course(id: int, name: str, credits: int, difficulty: float, workload: float):
+    """MagicMock standing in for a Course ORM row (the fields the engine reads)."""
+    course = MagicMock()
+    course.id = id
+    course.name = name
+    course.credits = credits
+    course.difficulty_score = difficulty
+    course.weekly_workload_hours = workload
+    return course
+
+
+@pytest.fixture
+def course_catalog():
+    """Five mock courses for engine-level tests; slice it for smaller schedules."""
+    return [
+        make_course(1, "Calculus II", 4, 7.5, 8.0),
+        make_course(2, "Data Structures", 3, 6.0, 7.0),
+        make_course(3, "Technical Writing", 3, 3.5, 3.0),
+        make_course(4, "Physics I", 4, 8.0, 10.0),
+        make_course(5, "Organic Chemistry", 4, 9.0, 11.0),
+    ]
+
+
 @pytest.fixture
 def sample_scenario_config():
     """Base scenario config — student_id is set in individual tests."""
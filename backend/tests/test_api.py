@@ -1,5 +1,7 @@
 """API endpoint integration tests."""
 
+import json
+
 import pytest
 
 
@@ -153,6 +155,170 @@ def test_get_simulation_by_id(client, sample_student_data, sample_course_data):
     assert "summary" in body
 
 
+def test_simulation_stored_as_columnar_trace(client, db, sample_student_data, sample_course_data):
+    from app.models.simulation import SimulationRun
+
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    created = _run_sim(client, student_id).json()
+
+    stored = db.get(SimulationRun, created["id"]).results
+    assert "weekly_snapshots" not in stored
+    assert len(stored["trace"]["predicted_gpa"]) == 8
+
+    body = client.get(f"/api/v1/simulations/{created['id']}").json()
+    assert body["weekly_snapshots"] == created["weekly_snapshots"]
+
+
+def test_get_simulation_reads_legacy_snapshot_rows(client, db, sample_student_data, sample_course_data):
+    from app.models.simulation import SimulationRun
+
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    created = _run_sim(client, student_id).json()
+
+    run = db.get(SimulationRun, created["id"])
+    run.results = {k: v for k, v in created.items() if k not in ("id", "created_at")}
+    db.commit()
+
+    body = client.get(f"/api/v1/simulations/{created['id']}").json()
+    assert body["weekly_snapshots"] == created["weekly_snapshots"]
+
+
+def test_simulation_summary_columns_written_and_backfilled(client, db, sample_student_data, sample_course_data):
+    from app.db import crud
+    from app.models.simulation import SimulationRun
+
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    created = _run_sim(client, student_id, num_weeks=10).json()
+
+    run = db.get(SimulationRun, created["id"])
+    columns = (run.predicted_gpa_mean, run.burnout_risk, run.study_strategy, run.num_weeks)
+    assert columns == (
+        created["summary"]["predicted_gpa_mean"], created["summary"]["burnout_risk"], "spaced", 10,
+    )
+
+    # A row stored before the columns existed
+    run.predicted_gpa_mean = run.burnout_risk = run.study_strategy = run.num_weeks = None
+    db.commit()
+    assert crud.backfill_simulation_summaries(db) == 1
+    db.refresh(run)
+    assert (run.predicted_gpa_mean, run.burnout_risk, run.study_strategy, run.num_weeks) == columns
+    assert crud.backfill_simulation_summaries(db) == 0
+
+
+def test_leaderboard_ranks_each_students_best_run(client, sample_student_data, sample_course_data):
+    best = {}
+    for email in ("a@university.edu", "b@university.edu"):
+        student_id = _create_student(client, {**sample_student_data, "email": email})["id"]
+        _add_courses(client, student_id, sample_course_data[:1] if email[0] == "a" else sample_course_data)
+        gpas = []
+        for work_hours in (40.0, 0.0):
+            r = client.post("/api/v1/simulations/run", json={
+                "student_id": student_id, "num_weeks": 8, "work_hours_per_week": work_hours,
+            })
+            gpas.append(r.json()["summary"]["predicted_gpa_mean"])
+        best[email] = max(gpas)
+
+    board = client.get("/api/v1/simulations/leaderboard").json()
+    assert [entry["rank"] for entry in board] == [1, 2]
+    assert [entry["gpa_mean"] for entry in board] == sorted(best.values(), reverse=True)
+    assert all(entry["week_count"] == 8 and entry["strategy"] == "spaced" for entry in board)
+
+
+def test_best_run_maintained_on_insert_and_delete(client, db, sample_student_data, sample_course_data):
+    from app.db import crud
+    from app.models.student_best_run import StudentBestRun
+
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    runs = {}
+    for work_hours in (40.0, 0.0, 20.0):
+        r = client.post("/api/v1/simulations/run", json={
+            "student_id": student_id, "num_weeks": 8, "work_hours_per_week": work_hours,
+        }).json()
+        runs[r["id"]] = r["summary"]["predicted_gpa_mean"]
+
+    def best():
+        db.expire_all()
+        row = db.get(StudentBestRun, student_id)
+        return row and (row.simulation_run_id, row.predicted_gpa_mean)
+
+    ranked = sorted(runs, key=lambda run_id: (-runs[run_id], run_id))
+    assert best() == (ranked[0], runs[ranked[0]])
+
+    # Deleting a non-best run keeps the row; deleting the best promotes the next one
+    assert client.delete(f"/api/v1/simulations/{ranked[2]}").status_code == 204
+    assert best() == (ranked[0], runs[ranked[0]])
+    assert client.delete(f"/api/v1/simulations/{ranked[0]}").status_code == 204
+    assert best() == (ranked[1], runs[ranked[1]])
+
+    # Rows lost (e.g. before the table existed) are rebuilt by the backfill
+    db.delete(db.get(StudentBestRun, student_id))
+    db.commit()
+    assert crud.backfill_student_best_runs(db) == 1
+    assert best() == (ranked[1], runs[ranked[1]])
+    assert crud.backfill_student_best_runs(db) == 0
+
+    assert client.delete(f"/api/v1/simulations/{ranked[1]}").status_code == 204
+    assert best() is None
+
+
+def test_delete_student_with_runs_under_enforced_foreign_keys(sample_student_data, sample_course_data):
+    from fastapi.testclient import TestClient
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.db.database import Base, get_db
+    from app.main import app
+
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool,
+    )
+    event.listen(engine, "connect", lambda conn, _: conn.execute("PRAGMA foreign_keys=ON"))
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autoflush=False, bind=engine)()
+
+    def override_get_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    try:
+        with TestClient(app) as client:
+            student_id = _create_student(client, sample_student_data)["id"]
+            _add_courses(client, student_id, sample_course_data)
+            for work_hours in (0.0, 20.0):
+                client.post("/api/v1/simulations/run", json={
+                    "student_id": student_id, "num_weeks": 8, "work_hours_per_week": work_hours,
+                })
+            assert client.delete(f"/api/v1/students/{student_id}").status_code == 204
+            assert client.get(f"/api/v1/students/{student_id}").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+        session.close()
+        engine.dispose()
+
+
+def test_send_summary_reads_summary_columns(client, monkeypatch, sample_student_data, sample_course_data):
+    import app.core.email
+
+    sent = {}
+    monkeypatch.setattr(app.core.email, "send_weekly_summary_email", lambda **kwargs: sent.update(kwargs))
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    runs = [_run_sim(client, student_id, num_weeks=weeks).json() for weeks in (8, 12)]
+
+    r = client.post(f"/api/v1/students/{student_id}/send-summary")
+    assert r.status_code == 200
+    assert sent["total_sims"] == 2
+    assert sent["best_gpa"] == max(run["summary"]["predicted_gpa_mean"] for run in runs)
+    assert sent["latest_gpa"] == runs[-1]["summary"]["predicted_gpa_mean"]
+    assert sent["latest_risk"] == runs[-1]["summary"]["burnout_risk"]
+    assert sent["tip"] == runs[-1]["summary"]["recommendation"]
+
+
 def test_get_simulation_not_found(client):
     r = client.get("/api/v1/simulations/99999")
     assert r.status_code == 404
@@ -226,6 +392,70 @@ def test_simulation_exam_weeks_flagged(client, sample_student_data, sample_cours
     assert 8 in exam_snap_weeks
 
 
+# ── Monte Carlo ───────────────────────────────────────────────────────────────
+
+def _sse_events(body: str) -> list[tuple[str, dict]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def test_monte_carlo_stream_ends_with_blocking_result(client, sample_student_data, sample_course_data):
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    request = {
+        "scenario_config": {"student_id": student_id, "num_weeks": 8},
+        "monte_carlo": {"runs": 1200, "study_variance": 0.2},
+    }
+
+    r = client.post("/api/v1/simulations/monte-carlo/stream", json=request)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(r.text)
+    assert [name for name, _ in events] == ["progress", "progress", "result"]
+    assert [data["runs"] for _, data in events] == [500, 1000, 1200]
+
+    final = {k: v for k, v in events[-1][1].items() if k not in {"total_runs", "done"}}
+    assert final == client.post("/api/v1/simulations/monte-carlo", json=request).json()
+
+
+def test_monte_carlo_stream_rejects_empty_course_selection(client, sample_student_data, sample_course_data):
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    r = client.post("/api/v1/simulations/monte-carlo/stream", json={
+        "scenario_config": {"student_id": student_id, "include_course_ids": [99999]},
+    })
+    assert r.status_code == 400
+
+
+def test_monte_carlo_compare_endpoint(client, sample_student_data, sample_course_data):
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    r = client.post("/api/v1/simulations/monte-carlo/compare", json={
+        "scenario_configs": [
+            {"student_id": student_id, "num_weeks": 8, "work_hours_per_week": 5.0},
+            {"student_id": student_id, "num_weeks": 8, "work_hours_per_week": 25.0},
+            {"student_id": student_id, "num_weeks": 8, "study_strategy": "cramming"},
+        ],
+        "monte_carlo": {"runs": 100},
+    })
+    assert r.status_code == 200
+    body = r.json()
+    assert body["runs"] == 100
+    assert len(body["scenarios"]) == 3
+    assert [d["scenario_index"] for d in body["differences"]] == [1, 2]
+
+
+def test_monte_carlo_compare_rejects_mixed_students(client, sample_student_data, sample_course_data):
+    student_id = _create_student(client, sample_student_data)["id"]
+    r = client.post("/api/v1/simulations/monte-carlo/compare", json={
+        "scenario_configs": [{"student_id": student_id}, {"student_id": student_id + 1}],
+    })
+    assert r.status_code == 400
+
+
 # ── Optimizer ─────────────────────────────────────────────────────────────────
 
 def test_optimize_schedule(client, sample_student_data, sample_course_data):
@@ -286,3 +516,173 @@ def test_optimize_missing_student_fails(client):
         "objective": "minimize_burnout",
     })
     assert r.status_code == 404
+
+
+def test_optimize_reuses_and_warm_starts_from_stored_optima(client, sample_student_data, sample_course_data):
+    """Identical requests reuse the stored optimum; changed ones start from it."""
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    payload = {
+        "student_id": student_id,
+        "num_weeks": 4,
+        "constraints": {"max_work_hours_per_week": 20.0, "min_sleep_hours": 6.0},
+        "objective": "balanced",
+    }
+
+    first = client.post("/api/v1/scenarios/optimize", json=payload).json()
+    assert first["warm_start"] == "cold"
+    assert first["evaluations"] > 0
+
+    again = client.post("/api/v1/scenarios/optimize", json=payload).json()
+    assert again["warm_start"] == "reused"
+    assert again["evaluations"] == 0
+    for field in ("optimal_work_hours", "optimal_sleep_hours", "optimal_study_strategy",
+                  "predicted_gpa", "predicted_burnout_probability"):
+        assert again[field] == first[field]
+
+    # New constraints: search again, seeded with the earlier optimum
+    payload["constraints"]["max_work_hours_per_week"] = 15.0
+    seeded = client.post("/api/v1/scenarios/optimize", json=payload).json()
+    assert seeded["warm_start"] == "seeded"
+    assert seeded["optimal_work_hours"] <= 15.0
+
+    # A course change alters the fingerprint, so nothing is reused
+    client.post(f"/api/v1/students/{student_id}/courses", json={
+        "name": "Linear Algebra", "credits": 3, "difficulty_score": 6.0, "weekly_workload_hours": 5.0,
+    })
+    changed = client.post("/api/v1/scenarios/optimize", json=payload).json()
+    assert changed["warm_start"] == "seeded"
+    assert "Linear Algebra" in changed["optimal_study_hours_per_course"]
+
+
+def test_goal_target(client, sample_student_data, sample_course_data):
+    """Goal targeting returns a schedule reaching a modest target, with its search cost."""
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+
+    r = client.post("/api/v1/advisor/goal-target", json={
+        "student_id": student_id,
+        "target_gpa": 1.0,
+        "num_weeks": 4,
+        "max_work_hours": 20.0,
+        "work_step": 0.5,
+    })
+    assert r.status_code == 200
+    body = r.json()
+    assert body["achievable"]
+    assert body["predicted_gpa"] >= 1.0
+    assert body["gap_to_target"] == 0.0
+    assert 0.0 <= body["recommended_work_hours"] <= 20.0
+    assert 6.0 <= body["recommended_sleep_hours"] <= 9.0
+    assert body["adjustment_hours"] >= 0.0
+    assert 0 < body["evaluations"] < 3 * 13 * 41
+
+
+def test_cohort_streams_every_student_then_summary(client, sample_student_data, sample_course_data):
+    with_courses = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, with_courses, sample_course_data)
+    no_courses = _create_student(client, {**sample_student_data, "email": "sam@university.edu"})["id"]
+
+    r = client.post("/api/v1/advisor/cohort", json={
+        "student_ids": [no_courses, 99999, with_courses], "num_weeks": 8, "study_strategy": "mixed",
+    })
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    events = _sse_events(r.text)
+    assert [name for name, _ in events] == ["student", "student", "student", "summary"]
+    students = {data["student_id"]: data for _, data in events[:3]}
+    assert students[99999]["detail"] == "Student not found."
+    assert students[no_courses]["detail"] == "No courses enrolled."
+
+    single = client.post("/api/v1/simulations/run", json={
+        "student_id": with_courses, "num_weeks": 8, "study_strategy": "mixed",
+        "work_hours_per_week": sample_student_data["weekly_work_hours"],
+        "sleep_target_hours": sample_student_data["sleep_target_hours"],
+    }).json()["summary"]
+    assert students[with_courses]["predicted_gpa"] == single["predicted_gpa_mean"]
+    assert students[with_courses]["burnout_risk"] == single["burnout_risk"]
+
+    summary = events[-1][1]
+    assert (summary["students"], summary["simulated"], summary["skipped"]) == (3, 1, 2)
+    assert summary["achievable"] is None and summary["evaluations"] == 1
+
+
+def test_cohort_goal_target_defaults_to_all_students(client, sample_student_data, sample_course_data):
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+
+    r = client.post("/api/v1/advisor/cohort", json={
+        "mode": "goal_target", "target_gpa": 1.0, "num_weeks": 4, "work_step": 5.0,
+    })
+    events = _sse_events(r.text)
+    assert [name for name, _ in events] == ["student", "summary"]
+    result = events[0][1]
+    assert result["student_id"] == student_id
+    assert result["achievable"] and result["predicted_gpa"] >= 1.0
+    assert events[1][1]["achievable"] == 1
+
+
+def test_cohort_without_students_is_not_found(client):
+    r = client.post("/api/v1/advisor/cohort", json={"student_ids": [99999]})
+    assert r.status_code == 404
+
+
+def test_goal_surface_is_cached_across_targets(client, sample_student_data, sample_course_data):
+    """The surface is simulated once; new targets and course changes behave."""
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+    payload = {
+        "student_id": student_id, "num_weeks": 4, "max_work_hours": 10.0,
+        "work_step": 2.0, "sleep_step": 0.25,
+    }
+
+    first = client.post("/api/v1/advisor/goal-surface", json=payload)
+    assert first.status_code == 200
+    body = first.json()
+    assert body["evaluations"] == 3 * 13 * 6
+    assert not body["cached"]
+    assert body["work_hours"] == [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+
+    again = client.post("/api/v1/advisor/goal-surface", json={**payload, "target_gpa": 2.0}).json()
+    assert again["cached"] and again["evaluations"] == 0
+    assert again["predicted_gpa"] == body["predicted_gpa"]
+    assert len(again["feasible"]) == 3
+
+    # Adding a course changes the fingerprint, so the surface is rebuilt
+    client.post(f"/api/v1/students/{student_id}/courses", json={
+        "name": "Linear Algebra", "credits": 3, "difficulty_score": 6.0, "weekly_workload_hours": 5.0,
+    })
+    rebuilt = client.post("/api/v1/advisor/goal-surface", json=payload).json()
+    assert not rebuilt["cached"]
+
+
+def test_pareto_front(client, sample_student_data, sample_course_data):
+    """Pareto endpoint returns a non-dominated GPA / burnout front with configs."""
+    student_id = _create_student(client, sample_student_data)["id"]
+    _add_courses(client, student_id, sample_course_data)
+
+    r = client.post("/api/v1/scenarios/pareto", json={
+        "student_id": student_id,
+        "num_weeks": 4,
+        "constraints": {"max_work_hours_per_week": 10.0, "min_sleep_hours": 7.0},
+    })
+    assert r.status_code == 200
+    body = r.json()
+
+    points = body["points"]
+    assert points
+    assert body["evaluations"] == 3 * 21 * 13  # strategies × work grid × sleep grid
+    burnout = [p["burnout_probability"] for p in points]
+    gpa = [p["predicted_gpa"] for p in points]
+    assert burnout == sorted(burnout)
+    assert all(a < b for a, b in zip(gpa, gpa[1:]))
+    for p in points:
+        assert p["config"]["student_id"] == student_id
+        assert 0.0 <= p["config"]["work_hours_per_week"] <= 10.0
+        assert 7.0 <= p["config"]["sleep_target_hours"] <= 10.0
+
+
+def test_pareto_no_courses_fails(client, sample_student_data):
+    student_id = _create_student(client, sample_student_data)["id"]
+    r = client.post("/api/v1/scenarios/pareto", json={"student_id": student_id})
+    assert r.status_code == 400
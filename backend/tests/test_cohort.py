@@ -0,0 +1,86 @@
+"""Tests for batched cohort simulation and goal targeting."""
+
+import threading
+
+import pytest
+
+from app.schemas.simulation import CohortRequest, GoalTargetRequest, ScenarioConfig
+from app.simulation.cohort import CohortMember, iter_cohort
+from app.simulation.course_table import CourseTable
+from app.simulation.engine import SimulationEngine
+from app.simulation.goal_search import goal_target_search
+
+
+@pytest.fixture
+def members(course_catalog):
+    return [
+        CohortMember(1, CourseTable.from_courses(course_catalog), 20.0, 7.0, 3.0),
+        CohortMember(2, CourseTable.from_courses(course_catalog[:2]), 10.0, 8.0, 3.8),
+        CohortMember(3, CourseTable.from_courses([]), 0.0, 7.0, 3.5),
+        CohortMember(4, CourseTable.from_courses(course_catalog[2:]), 30.0, 6.0, 3.5),
+        CohortMember(5, CourseTable.from_courses(course_catalog[3:]), 5.0, 7.5, 2.0),
+    ]
+
+
+def _results(members, request):
+    return [result for chunk, _ in iter_cohort(members, request) for result in chunk]
+
+
+def test_simulate_matches_per_student_runs(members):
+    request = CohortRequest(num_weeks=8, study_strategy="mixed", chunk_size=2)
+    results = _results(members, request)
+    assert [r.student_id for r in results] == [1, 2, 3, 4, 5]
+    assert results[2].detail == "No courses enrolled." and results[2].predicted_gpa is None
+
+    engine = SimulationEngine()
+    for member, result in zip(members, results):
+        if not member.courses:
+            continue
+        lite = engine.run_lite(ScenarioConfig(
+            student_id=member.student_id, num_weeks=8, study_strategy="mixed",
+            work_hours_per_week=member.work_hours, sleep_target_hours=member.sleep_hours,
+        ), member.courses)
+        assert result.predicted_gpa == lite.predicted_gpa_mean
+        assert result.burnout_probability == lite.burnout_probability
+        assert result.burnout_risk == lite.burnout_risk
+
+
+def test_goal_target_matches_single_student_search(members):
+    request = CohortRequest(mode="goal_target", num_weeks=8, work_step=2.0, chunk_size=3)
+    results = _results(members, request)
+
+    engine = SimulationEngine()
+    for member, result in zip(members, results):
+        if not member.courses:
+            assert result.detail is not None
+            continue
+        outcome = goal_target_search(engine, member.courses, GoalTargetRequest(
+            student_id=member.student_id, target_gpa=member.target_gpa, num_weeks=8, work_step=2.0,
+        ), member.work_hours, member.sleep_hours)
+        assert result.target_gpa == member.target_gpa
+        assert result.achievable == outcome.achievable
+        assert result.predicted_gpa == outcome.predicted_gpa
+        assert result.adjustment_hours == outcome.adjustment_hours
+        assert result.recommended_work_hours == outcome.config.work_hours_per_week
+        assert result.recommended_sleep_hours == outcome.config.sleep_target_hours
+        assert result.recommended_strategy == outcome.config.study_strategy
+
+
+def test_results_do_not_depend_on_chunk_size(members):
+    request = CohortRequest(mode="goal_target", num_weeks=6, target_gpa=3.9, work_step=5.0)
+    whole = _results(members, request)
+    assert _results(members, request.model_copy(update={"chunk_size": 1})) == whole
+    assert all(r.target_gpa == 3.9 for r in whole if r.detail is None)
+
+
+def test_evaluations_count_every_batched_scenario(members):
+    chunks = list(iter_cohort(members, CohortRequest(num_weeks=6, chunk_size=4)))
+    assert [evaluations for _, evaluations in chunks] == [3, 1]
+
+
+def test_stop_flag_ends_run_between_chunks(members):
+    stop = threading.Event()
+    chunks = iter_cohort(members, CohortRequest(num_weeks=6, chunk_size=2), stop)
+    assert len(next(chunks)[0]) == 2
+    stop.set()
+    assert next(chunks, None) is None
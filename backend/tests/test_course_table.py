@@ -0,0 +1,75 @@
+"""Tests for the immutable CourseTable snapshot."""
+
+import pickle
+
+import pytest
+
+from app.schemas.simulation import ScenarioConfig
+from app.simulation.course_table import CourseStack, CourseTable
+from app.simulation.engine import SimulationEngine
+
+
+@pytest.fixture
+def orm_courses(course_catalog):
+    return course_catalog[:3]
+
+
+def test_columns_follow_enrollment_order(orm_courses):
+    table = CourseTable.from_courses(orm_courses)
+    assert len(table) == 3
+    assert table.ids.tolist() == [1, 2, 3]
+    assert table.names == ("Calculus II", "Data Structures", "Technical Writing")
+    assert table.difficulty.tolist() == [7.5, 6.0, 3.5]
+    assert [c.credits for c in table] == [4, 3, 3]
+
+
+def test_table_is_read_only(orm_courses):
+    table = CourseTable.from_courses(orm_courses)
+    with pytest.raises(ValueError):
+        table.workload[0] = 1.0
+    with pytest.raises(AttributeError):
+        table.records = ()
+
+
+def test_pickle_round_trip_keeps_columns_read_only(orm_courses):
+    table = pickle.loads(pickle.dumps(CourseTable.from_courses(orm_courses)))
+    assert table == CourseTable.from_courses(orm_courses)
+    assert not table.credits.flags.writeable
+
+
+def test_select_keeps_table_order(orm_courses):
+    table = CourseTable.from_courses(orm_courses).select([3, 1])
+    assert table.ids.tolist() == [1, 3]
+
+
+def test_fingerprint_ignores_order_but_not_parameters(orm_courses):
+    table = CourseTable.from_courses(orm_courses)
+    assert CourseTable(table.records[::-1]).fingerprint() == table.fingerprint()
+
+    changed = table.records[0]._replace(weekly_workload_hours=table.records[0].weekly_workload_hours + 1)
+    assert CourseTable((changed, *table.records[1:])).fingerprint() != table.fingerprint()
+    assert table.select([1, 2]).fingerprint() != table.fingerprint()
+
+
+def test_course_stack_pads_rows_and_takes_repeats(orm_courses):
+    full = CourseTable.from_courses(orm_courses)
+    stack = CourseStack((full.select([2]), full))
+    assert stack.ids.tolist() == [[2, 0, 0], [1, 2, 3]]
+    assert stack.present.tolist() == [[True, False, False], [True, True, True]]
+    assert stack.difficulty[0].tolist() == [6.0, 0.0, 0.0]
+
+    taken = stack.take([1, 0, 1])
+    assert len(taken) == 3
+    assert taken.tables == (full, full.select([2]), full)
+    assert taken.ids.tolist() == [[1, 2, 3], [2, 0, 0], [1, 2, 3]]
+    assert not taken.workload.flags.writeable
+    assert pickle.loads(pickle.dumps(taken)).ids.tolist() == taken.ids.tolist()
+
+
+def test_engine_accepts_table_or_orm_list(orm_courses):
+    engine = SimulationEngine()
+    config = ScenarioConfig(student_id=1, num_weeks=8, drop_course_id=1, drop_at_week=4)
+    from_list = engine.run(config=config, courses=orm_courses, student=None)
+    from_table = engine.run(config=config, courses=CourseTable.from_courses(orm_courses), student=None)
+    assert from_table.summary == from_list.summary
+    assert from_table.weekly_snapshots == from_list.weekly_snapshots
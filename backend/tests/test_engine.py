@@ -1,9 +1,11 @@
 """Integration tests for the simulation engine."""
 
+import numpy as np
 import pytest
 from unittest.mock import MagicMock
 
-from app.simulation.engine import SimulationEngine
+from app.simulation.course_table import CourseStack, CourseTable
+from app.simulation.engine import SimulationEngine, WeeklyNoise, divergence_week
 from app.schemas.simulation import ScenarioConfig
 
 
@@ -101,6 +103,167 @@ def test_engine_burnout_risk_label_is_valid(engine, sample_courses, sample_stude
     assert result.summary.burnout_risk in {"LOW", "MEDIUM", "HIGH"}
 
 
+def _batch_configs():
+    return [
+        ScenarioConfig(student_id=1, num_weeks=16, work_hours_per_week=10.0,
+                       sleep_target_hours=7.0, study_strategy="spaced"),
+        ScenarioConfig(student_id=1, num_weeks=12, work_hours_per_week=40.0,
+                       sleep_target_hours=5.0, study_strategy="cramming",
+                       exam_weeks=[6, 12]),
+        ScenarioConfig(student_id=1, num_weeks=16, work_hours_per_week=5.0,
+                       sleep_schedule="variable", study_strategy="mixed",
+                       extracurricular_hours=8.0, include_course_ids=[1, 3]),
+        ScenarioConfig(student_id=1, num_weeks=10, work_hours_per_week=15.0,
+                       sleep_target_hours=6.5, drop_course_id=2, drop_at_week=4),
+    ]
+
+
+def test_run_batch_matches_scalar_run(engine, sample_courses, sample_student):
+    configs = _batch_configs()
+    batch = engine.run_batch(configs, sample_courses)
+    assert len(batch) == len(configs)
+    for i, config in enumerate(configs):
+        expected = engine.run(config=config, courses=sample_courses, student=sample_student)
+        actual = batch.result(i)
+        assert actual.summary == expected.summary
+        assert actual.weekly_snapshots == expected.weekly_snapshots
+
+
+def test_run_batch_over_course_stack_matches_per_student_runs(engine, sample_courses):
+    """Scenarios with different course lists batched together match their scalar runs."""
+    extra = [*sample_courses, _make_course(4, "Physics I", 4, 9.0, 10.0)]
+    tables = (
+        CourseTable.from_courses(sample_courses[:1]),
+        CourseTable.from_courses(extra),
+        CourseTable.from_courses(sample_courses),
+        CourseTable.from_courses(extra),
+    )
+    configs = [
+        ScenarioConfig(student_id=1, num_weeks=8, work_hours_per_week=5.0),
+        ScenarioConfig(student_id=2, num_weeks=8, study_strategy="cramming",
+                       drop_course_id=2, drop_at_week=3),
+        ScenarioConfig(student_id=3, num_weeks=10, include_course_ids=[1, 3]),
+        ScenarioConfig(student_id=2, num_weeks=8, sleep_target_hours=5.5, work_hours_per_week=25.0),
+    ]
+    batch = engine.run_batch(configs, CourseStack(tables))
+    for i, (config, table) in enumerate(zip(configs, tables)):
+        expected = engine.run(config=config, courses=table, student=None)
+        actual = batch.result(i)
+        assert actual.summary == expected.summary
+        assert actual.weekly_snapshots == expected.weekly_snapshots
+    assert batch.predicted_gpa_means() == [lite.predicted_gpa_mean for lite in batch.lite_results()]
+
+
+def test_run_batch_rejects_mismatched_course_stack(engine, sample_courses):
+    stack = CourseStack((CourseTable.from_courses(sample_courses),))
+    with pytest.raises(ValueError):
+        engine.run_batch(_batch_configs(), stack)
+
+
+def test_run_batch_pads_shorter_scenarios(engine, sample_courses):
+    batch = engine.run_batch(_batch_configs(), sample_courses)
+    assert batch.cognitive_load.shape == (4, 16)
+    assert np.isnan(batch.cognitive_load[3, 10:]).all()
+    assert not np.isnan(batch.cognitive_load[3, :10]).any()
+
+
+def test_run_batch_raises_when_a_scenario_has_no_courses(engine, sample_courses):
+    configs = [
+        ScenarioConfig(student_id=1, include_course_ids=[1]),
+        ScenarioConfig(student_id=1, include_course_ids=[99]),
+    ]
+    with pytest.raises(ValueError, match="No courses selected"):
+        engine.run_batch(configs, sample_courses)
+
+
+def test_run_batch_neutral_noise_matches_deterministic_run(engine, sample_courses):
+    configs = _batch_configs()
+    shape = (len(configs), 16)
+    neutral = WeeklyNoise(
+        sleep_delta=np.zeros(shape), study_efficiency=np.ones(shape), disruption=np.zeros(shape)
+    )
+    plain = engine.run_batch(configs, sample_courses)
+    noisy = engine.run_batch(configs, sample_courses, noise=neutral)
+    np.testing.assert_array_equal(noisy.predicted_gpa, plain.predicted_gpa)
+    np.testing.assert_array_equal(noisy.final_gpa, plain.final_gpa)
+
+
+def test_run_batch_disruption_lowers_that_week_only(engine, sample_courses):
+    config = ScenarioConfig(student_id=1, num_weeks=8)
+    disruption = np.zeros((2, 8))
+    disruption[1, 3] = 0.5
+    noise = WeeklyNoise(
+        sleep_delta=np.zeros((2, 8)), study_efficiency=np.ones((2, 8)), disruption=disruption
+    )
+    batch = engine.run_batch([config, config], sample_courses, noise=noise)
+    np.testing.assert_array_equal(batch.predicted_gpa[0, :3], batch.predicted_gpa[1, :3])
+    assert batch.retention_score[1, 3] < batch.retention_score[0, 3]
+
+
+def test_run_lite_matches_full_summary(engine, sample_courses, sample_student):
+    batch = engine.run_batch(_batch_configs(), sample_courses)
+    for i, config in enumerate(_batch_configs()):
+        summary = engine.run(config=config, courses=sample_courses, student=sample_student).summary
+        for lite in (engine.run_lite(config=config, courses=sample_courses), batch.lite(i)):
+            assert lite.predicted_gpa_mean == summary.predicted_gpa_mean
+            assert lite.predicted_gpa_min == summary.predicted_gpa_min
+            assert lite.predicted_gpa_max == summary.predicted_gpa_max
+            assert lite.burnout_probability == summary.burnout_probability
+            assert lite.burnout_risk == summary.burnout_risk
+            assert lite.peak_overload_weeks == summary.peak_overload_weeks
+            assert lite.sleep_deficit_hours == summary.sleep_deficit_hours
+            assert lite.weekly_gpa is None
+
+
+def test_run_lite_weekly_arrays_cover_every_week(engine, sample_courses):
+    config = ScenarioConfig(student_id=1, num_weeks=12)
+    lite = engine.run_lite(config=config, courses=sample_courses, weekly=True)
+    assert lite.weekly_gpa.shape == (12,)
+    assert lite.weekly_cognitive_load.shape == (12,)
+    assert lite.weekly_burnout_probability.shape == (12,)
+
+
+def test_week_types_share_allocations(engine, sample_courses, sample_student):
+    config = ScenarioConfig(
+        student_id=1, num_weeks=10, exam_weeks=[5, 10], drop_course_id=1, drop_at_week=6
+    )
+    result = engine.run(config=config, courses=sample_courses, student=sample_student)
+    snapshots = result.weekly_snapshots
+    allocations = {(s.is_exam_week, s.week > 6): s.time_allocation for s in snapshots}
+    assert len(allocations) == 4
+    for s in snapshots:
+        assert s.time_allocation == allocations[s.is_exam_week, s.week > 6]
+    assert allocations[False, True].class_hours < allocations[False, False].class_hours
+
+
+def test_resume_from_checkpoint_matches_full_run(engine, sample_courses, sample_student):
+    base = ScenarioConfig(student_id=1, num_weeks=16)
+    edited = base.model_copy(update={"drop_course_id": 2, "drop_at_week": 9})
+    _, checkpoints = engine.run_with_checkpoints(base, sample_courses, sample_student)
+    assert len(checkpoints) == 16
+
+    week = divergence_week(base, edited)
+    assert week == 9
+    resumed = engine.resume(checkpoints[week - 1], edited)
+    full = engine.run(config=edited, courses=sample_courses, student=sample_student)
+    assert resumed.summary == full.summary
+    assert resumed.weekly_snapshots == full.weekly_snapshots
+
+
+def test_divergence_week_is_zero_when_schedule_changes():
+    base = ScenarioConfig(student_id=1, num_weeks=16)
+    assert divergence_week(base, base.model_copy(update={"work_hours_per_week": 10.0})) == 0
+    assert divergence_week(base, base.model_copy(update={"exam_weeks": [6, 16]})) == 5
+    assert divergence_week(base, base.model_copy(update={"num_weeks": 12})) == 12
+
+
+def test_resume_rejects_different_course_selection(engine, sample_courses, sample_student):
+    base = ScenarioConfig(student_id=1, num_weeks=8)
+    _, checkpoints = engine.run_with_checkpoints(base, sample_courses, sample_student)
+    with pytest.raises(ValueError):
+        engine.resume(checkpoints[3], base.model_copy(update={"include_course_ids": [1]}))
+
+
 def test_api_health_check(client):
     response = client.get("/health")
     assert response.status_code == 200
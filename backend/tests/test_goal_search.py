@@ -0,0 +1,133 @@
+"""Tests for the goal-target search and the goal surface."""
+
+import numpy as np
+import pytest
+
+from app.schemas.simulation import GoalSurfaceRequest, GoalTargetRequest, ScenarioConfig
+from app.simulation.course_table import CourseTable
+from app.simulation.engine import SimulationEngine
+from app.simulation.goal_search import (
+    GOAL_SLEEP_RANGE,
+    GOAL_STRATEGIES,
+    NIGHTS_PER_WEEK,
+    goal_surface,
+    goal_target_search,
+)
+from app.simulation.result_cache import SimulationCache
+
+
+@pytest.fixture
+def courses(course_catalog):
+    return CourseTable.from_courses(course_catalog)
+
+
+def _brute_force(engine, courses, request, current_work, current_sleep):
+    """Lowest adjustment cost over the full grid, or None if unreachable."""
+    work = np.arange(0.0, request.max_work_hours + 1e-9, request.work_step)
+    sleep = np.arange(GOAL_SLEEP_RANGE[0], GOAL_SLEEP_RANGE[1] + 1e-9, request.sleep_step)
+    cells = [
+        (strategy, float(s), float(w))
+        for strategy in GOAL_STRATEGIES for s in sleep for w in work if w <= current_work
+    ]
+    batch = engine.run_batch([
+        ScenarioConfig(
+            student_id=1, num_weeks=request.num_weeks, work_hours_per_week=w,
+            sleep_target_hours=s, study_strategy=strategy,
+            include_course_ids=courses.ids.tolist(), exam_weeks=request.exam_weeks,
+        )
+        for strategy, s, w in cells
+    ], courses)
+    costs = [
+        NIGHTS_PER_WEEK * abs(s - current_sleep) + current_work - w
+        for i, (_, s, w) in enumerate(cells)
+        if batch.lite(i).predicted_gpa_mean >= request.target_gpa
+    ]
+    return (min(costs), len(cells)) if costs else (None, len(cells))
+
+
+@pytest.mark.parametrize("target", [1.0, 1.5, 2.5])
+def test_search_matches_brute_force_with_fewer_runs(courses, target):
+    engine = SimulationEngine()
+    request = GoalTargetRequest(student_id=1, target_gpa=target, num_weeks=8, max_work_hours=20.0,
+                                work_step=1.0, sleep_step=0.25)
+    outcome = goal_target_search(engine, courses, request, current_work_hours=20.0,
+                                 current_sleep_hours=7.0)
+    best_cost, grid_size = _brute_force(engine, courses, request, 20.0, 7.0)
+
+    assert outcome.achievable == (best_cost is not None)
+    if outcome.achievable:
+        assert outcome.adjustment_hours == pytest.approx(best_cost)
+        assert outcome.predicted_gpa >= target
+        assert outcome.config.work_hours_per_week <= 20.0
+    assert outcome.evaluations < grid_size / 3
+
+
+def test_default_resolution_matches_the_original_grid():
+    # Finer steps are opt-in; the defaults keep the 5 h / 0.5 h grid
+    for model in (GoalTargetRequest(student_id=1, target_gpa=3.0), GoalSurfaceRequest(student_id=1)):
+        assert (model.work_step, model.sleep_step) == (5.0, 0.5)
+
+
+def test_current_schedule_is_kept_when_it_reaches_the_target(courses):
+    request = GoalTargetRequest(student_id=1, target_gpa=0.5, num_weeks=8, max_work_hours=20.0,
+                                sleep_step=0.25)
+    outcome = goal_target_search(SimulationEngine(), courses, request, current_work_hours=5.0,
+                                 current_sleep_hours=7.5)
+
+    assert outcome.achievable
+    assert outcome.adjustment_hours == 0.0
+    assert (outcome.config.work_hours_per_week, outcome.config.sleep_target_hours) == (5.0, 7.5)
+    # One batched round over every (strategy, sleep) cell is enough
+    assert outcome.evaluations == len(GOAL_STRATEGIES) * 13
+
+
+def test_unreachable_target_falls_back_to_best_zero_work_schedule(courses):
+    request = GoalTargetRequest(student_id=1, target_gpa=4.0, num_weeks=8, max_work_hours=20.0)
+    outcome = goal_target_search(SimulationEngine(), courses, request, current_work_hours=10.0,
+                                 current_sleep_hours=7.0)
+
+    assert not outcome.achievable
+    assert outcome.config.work_hours_per_week == 0.0
+    assert outcome.predicted_gpa < 4.0
+
+
+def test_goal_surface_is_one_batch_and_cached(courses):
+    class CountingEngine(SimulationEngine):
+        def __init__(self):
+            super().__init__()
+            self.batches: list[int] = []
+
+        def run_batch(self, configs, courses, noise=None):
+            self.batches.append(len(configs))
+            return super().run_batch(configs, courses, noise=noise)
+
+    engine, cache = CountingEngine(), SimulationCache()
+    request = GoalSurfaceRequest(student_id=1, num_weeks=8, max_work_hours=10.0, work_step=1.0)
+    first = goal_surface(engine, courses, request, cache=cache)
+
+    assert engine.batches == [first.evaluations] == [3 * 7 * 11]
+    assert (len(first.strategies), len(first.sleep_hours), len(first.work_hours)) == (3, 7, 11)
+    assert first.feasible is None and not first.cached
+
+    # A different target is a lookup on the cached surface
+    target = goal_surface(engine, courses, request.model_copy(update={"target_gpa": 1.5}), cache)
+    assert engine.batches == [first.evaluations]
+    assert target.cached and target.evaluations == 0
+    assert target.predicted_gpa == first.predicted_gpa
+    gpa = np.array(target.predicted_gpa)
+    assert np.array_equal(np.array(target.feasible), gpa >= 1.5)
+
+    # The surface agrees with the bisection search's own simulations
+    outcome = goal_target_search(
+        SimulationEngine(), courses,
+        GoalTargetRequest(student_id=1, target_gpa=1.5, num_weeks=8, max_work_hours=10.0,
+                          work_step=1.0),
+        current_work_hours=10.0, current_sleep_hours=7.0,
+    )
+    config = outcome.config
+    cell = (
+        target.strategies.index(config.study_strategy),
+        target.sleep_hours.index(config.sleep_target_hours),
+        target.work_hours.index(config.work_hours_per_week),
+    )
+    assert gpa[cell] == outcome.predicted_gpa
@@ -7,12 +7,27 @@ Tests for features added in v1.1:
   - Monte Carlo confidence bands
 """
 
+import threading
+
+import numpy as np
 import pytest
 from unittest.mock import MagicMock
 
 from app.simulation.engine import SimulationEngine, _VARIABLE_SLEEP_WEEKLY
-from app.schemas.simulation import ScenarioConfig, MonteCarloConfig, MonteCarloRequest
-from app.simulation.monte_carlo import run_monte_carlo
+from app.schemas.simulation import (
+    MonteCarloCompareRequest,
+    MonteCarloConfig,
+    MonteCarloRequest,
+    ScenarioConfig,
+)
+from app.simulation.monte_carlo import (
+    CHUNK_RUNS,
+    _chunk_sizes,
+    compare_monte_carlo,
+    draw_uniforms,
+    run_monte_carlo,
+    stream_monte_carlo,
+)
 from app.simulation.performance_model import predict_grade
 
 
@@ -268,3 +283,149 @@ def test_monte_carlo_weekly_bands_length_matches_num_weeks(courses, student):
     assert len(result.weekly_p10) == 10
     assert len(result.weekly_p50) == 10
     assert len(result.weekly_p90) == 10
+
+
+def test_monte_carlo_without_variance_collapses_to_deterministic_run(engine, courses, student):
+    config = ScenarioConfig(
+        student_id=1, num_weeks=8,
+        work_hours_per_week=5.0, sleep_target_hours=7.5,
+        study_strategy="spaced", include_course_ids=[1, 2, 3],
+    )
+    request = MonteCarloRequest(
+        scenario_config=config,
+        monte_carlo=MonteCarloConfig(runs=20, study_variance=0.0),
+    )
+    result = run_monte_carlo(request=request, courses=courses, student=student)
+    expected = engine.run(config=config, courses=courses, student=student)
+    assert result.p10_gpa == result.p90_gpa == expected.summary.predicted_gpa_mean
+    assert result.weekly_p50 == [s.predicted_gpa for s in expected.weekly_snapshots]
+
+
+def test_monte_carlo_supports_large_run_counts(courses, student):
+    config = ScenarioConfig(student_id=1, num_weeks=16, include_course_ids=[1, 2, 3])
+    request = MonteCarloRequest(
+        scenario_config=config,
+        monte_carlo=MonteCarloConfig(runs=10_000, study_variance=0.3),
+    )
+    result = run_monte_carlo(request=request, courses=courses, student=student)
+    assert result.runs == 10_000
+    assert result.p10_gpa < result.p90_gpa
+    assert run_monte_carlo(request=request, courses=courses, student=student) == result
+
+
+def test_monte_carlo_is_identical_for_any_worker_count(courses, student):
+    config = ScenarioConfig(student_id=1, num_weeks=8, include_course_ids=[1, 2, 3])
+
+    def run(workers: int):
+        request = MonteCarloRequest(
+            scenario_config=config,
+            monte_carlo=MonteCarloConfig(runs=1_200, study_variance=0.3, workers=workers),
+        )
+        return run_monte_carlo(request=request, courses=courses, student=student)
+
+    serial = run(1)
+    assert serial.runs == 1_200
+    assert run(2) == serial
+    assert run(0) == serial
+
+
+def test_monte_carlo_chunks_cover_every_run():
+    assert _chunk_sizes(1_200) == [CHUNK_RUNS, CHUNK_RUNS, 1_200 - 2 * CHUNK_RUNS]
+    assert _chunk_sizes(CHUNK_RUNS) == [CHUNK_RUNS]
+
+
+def test_monte_carlo_reports_requested_percentiles(courses, student):
+    config = ScenarioConfig(student_id=1, num_weeks=8, include_course_ids=[1, 2, 3])
+
+    def run(method: str):
+        request = MonteCarloRequest(
+            scenario_config=config,
+            monte_carlo=MonteCarloConfig(
+                runs=600, study_variance=0.3, percentiles=[95, 5, 25, 75], quantile_method=method
+            ),
+        )
+        return run_monte_carlo(request=request, courses=courses, student=student)
+
+    result = run("exact")
+    assert list(result.percentiles) == ["p5", "p25", "p75", "p95"]
+    assert result.percentiles["p5"] <= result.p10_gpa <= result.percentiles["p25"]
+    assert result.percentiles["p75"] <= result.p90_gpa <= result.percentiles["p95"]
+    assert len(result.weekly_percentiles["p95"]) == 8
+    assert run("histogram") == result
+
+
+@pytest.mark.parametrize("sampler", ["pseudo", "lhs", "sobol"])
+def test_monte_carlo_samplers_draw_unit_noise_per_run_and_week(sampler):
+    uniforms = draw_uniforms(sampler, runs=100, num_weeks=6, rng=np.random.default_rng(3))
+    assert uniforms.shape == (3, 100, 6)
+    assert ((uniforms >= 0.0) & (uniforms < 1.0)).all()
+
+
+def test_latin_hypercube_fills_every_stratum():
+    uniforms = draw_uniforms("lhs", runs=50, num_weeks=4, rng=np.random.default_rng(5))
+    strata = np.sort(np.floor(uniforms * 50), axis=1)
+    assert (strata == np.arange(50)[None, :, None]).all()
+
+
+def test_monte_carlo_tolerance_stops_early_and_reports_runs_used(courses, student):
+    config = ScenarioConfig(student_id=1, num_weeks=8, include_course_ids=[1, 2, 3])
+    request = MonteCarloRequest(
+        scenario_config=config,
+        monte_carlo=MonteCarloConfig(runs=5_000, study_variance=0.3, tolerance=0.1),
+    )
+    result = run_monte_carlo(request=request, courses=courses, student=student)
+    assert result.stopped_early
+    assert result.runs < 5_000
+
+    updates = list(stream_monte_carlo(request=request, courses=courses, student=student))
+    assert updates[-1].done and updates[-1].runs == result.runs
+    assert not any(update.done for update in updates[:-1])
+
+
+def test_stream_monte_carlo_stop_flag_ends_stream_between_chunks(courses, student):
+    config = ScenarioConfig(student_id=1, num_weeks=8, include_course_ids=[1, 2, 3])
+    request = MonteCarloRequest(
+        scenario_config=config,
+        monte_carlo=MonteCarloConfig(runs=1_200, study_variance=0.3, workers=2),
+    )
+    stop = threading.Event()
+    updates = stream_monte_carlo(request=request, courses=courses, student=student, stop=stop)
+    first = next(updates)
+    stop.set()
+    assert next(updates, None) is None
+    assert not first.done and first.runs < 1_200
+
+
+def test_monte_carlo_compare_identical_scenarios_have_zero_difference(courses, student):
+    config = ScenarioConfig(student_id=1, num_weeks=8, include_course_ids=[1, 2, 3])
+    mc = MonteCarloConfig(runs=300, study_variance=0.3)
+    request = MonteCarloCompareRequest(scenario_configs=[config, config], monte_carlo=mc)
+    result = compare_monte_carlo(request=request, courses=courses, student=student)
+
+    single = run_monte_carlo(
+        request=MonteCarloRequest(scenario_config=config, monte_carlo=mc),
+        courses=courses, student=student,
+    )
+    assert result.scenarios == [single, single]
+    difference = result.differences[0]
+    assert difference.bands.p10_gpa == difference.bands.p90_gpa == 0.0
+    assert set(difference.bands.weekly_p90) == {0.0}
+    assert difference.probability_better == 0.0
+
+
+def test_monte_carlo_compare_pairs_runs_against_baseline(courses, student):
+    baseline = ScenarioConfig(student_id=1, num_weeks=10, work_hours_per_week=5.0,
+                              sleep_target_hours=8.0, include_course_ids=[1, 2, 3])
+    overloaded = ScenarioConfig(student_id=1, num_weeks=8, work_hours_per_week=40.0,
+                                sleep_target_hours=5.0, include_course_ids=[1, 2, 3])
+    request = MonteCarloCompareRequest(
+        scenario_configs=[baseline, overloaded],
+        monte_carlo=MonteCarloConfig(runs=200, study_variance=0.3),
+    )
+    result = compare_monte_carlo(request=request, courses=courses, student=student)
+    assert [len(s.weekly_p50) for s in result.scenarios] == [10, 8]
+    difference = result.differences[0]
+    assert difference.scenario_index == 1 and difference.baseline_index == 0
+    assert len(difference.bands.weekly_p50) == 8
+    assert difference.bands.p10_gpa <= difference.bands.p50_gpa < 0.0
+    assert difference.probability_better < 0.5
@@ -0,0 +1,237 @@
+"""Tests for the schedule optimizer and its GP surrogate."""
+
+import time
+
+import numpy as np
+import pytest
+from unittest.mock import MagicMock
+
+from app.schemas.simulation import OptimizationConstraints, OptimizationRequest, ParetoRequest
+from app.simulation.engine import SimulationEngine
+from app.simulation.course_table import CourseTable
+from app.simulation.optimizer import (
+    SURROGATE_INITIAL_POINTS,
+    SURROGATE_MAX_PROPOSALS,
+    ScheduleObjective,
+    burnout_scores,
+    optimize_schedule,
+    pareto_front,
+    request_key,
+    reuse_optimum,
+)
+from app.simulation.surrogate import GaussianProcess, expected_improvement
+from tests.conftest import make_course
+
+
+class _CountingEngine(SimulationEngine):
+    """Engine that records how it was called."""
+
+    def __init__(self):
+        super().__init__()
+        self.batch_sizes: list[int] = []
+        self.lite_calls = 0
+
+    def run_batch(self, configs, courses, noise=None):
+        self.batch_sizes.append(len(configs))
+        return super().run_batch(configs, courses, noise=noise)
+
+    def run_lite(self, *args, **kwargs):
+        self.lite_calls += 1
+        return super().run_lite(*args, **kwargs)
+
+
+@pytest.fixture
+def courses(course_catalog):
+    return course_catalog[:3]
+
+
+@pytest.fixture
+def student():
+    s = MagicMock()
+    s.id = 1
+    return s
+
+
+def test_burnout_scores_follow_risk_labels():
+    scores = burnout_scores(np.array([0.0, 0.329, 0.33, 0.659, 0.66, 1.0]))
+    assert scores.tolist() == [0.1, 0.1, 0.5, 0.5, 0.9, 0.9]
+
+
+def test_optimizer_scores_each_generation_in_one_batch(courses, student):
+    engine = _CountingEngine()
+    request = OptimizationRequest(
+        student_id=1, num_weeks=6,
+        constraints=OptimizationConstraints(max_work_hours_per_week=20.0),
+    )
+    result = optimize_schedule(engine, student, courses, request)
+
+    assert engine.lite_calls == 0
+    assert len(engine.batch_sizes) > 1
+    # Population of popsize × 2 variables, all scored together
+    assert max(engine.batch_sizes) >= 25
+    assert 0.0 <= result.optimal_work_hours <= 20.0
+    assert 6.0 <= result.optimal_sleep_hours <= 10.0
+
+
+def test_optimizer_reports_one_search_per_strategy(courses, student):
+    engine = _CountingEngine()
+    request = OptimizationRequest(student_id=1, num_weeks=6, objective="balanced")
+    result = optimize_schedule(engine, student, courses, request)
+
+    assert [s.strategy for s in result.strategy_searches] == ["spaced", "mixed", "cramming"]
+    assert result.evaluations == sum(engine.batch_sizes)
+    assert result.evaluations == sum(s.evaluations for s in result.strategy_searches)
+    assert all(s.cache_hits + s.evaluations == s.cache_lookups for s in result.strategy_searches)
+    assert 0.0 < result.cache_hit_rate < 1.0
+    winner = min(result.strategy_searches, key=lambda s: s.best_objective)
+    assert result.optimal_study_strategy == winner.strategy
+    assert result.converged
+
+
+def test_schedule_objective_memoizes_quantized_points(courses):
+    engine = _CountingEngine()
+    bounds = [(0.0, 20.0), (6.1, 10.0)]
+    objective = ScheduleObjective(
+        engine, CourseTable.from_courses(courses),
+        OptimizationRequest(student_id=1, num_weeks=6), 1, "spaced", bounds,
+    )
+    first = objective(np.array([[5.0, 5.1, 12.0], [7.0, 7.05, 6.0]]))
+    assert first[0] == first[1]
+    assert engine.batch_sizes == [2]
+
+    again = objective(np.array([[4.95, 12.1], [7.02, 6.05]]))
+    assert again.tolist() == [first[0], first[2]]
+    assert engine.batch_sizes == [2]
+    assert (objective.evaluations, objective.lookups, objective.hits) == (2, 5, 3)
+    # Snapped sleep stays inside the bounds
+    assert objective.config(objective.best()[0]).sleep_target_hours >= 6.1
+
+
+def test_gaussian_process_interpolates_and_widens_away_from_data():
+    x = np.array([[0.0, 0.0], [0.5, 0.5], [1.0, 1.0], [0.0, 1.0]])
+    y = np.array([1.0, -2.0, 0.5, 3.0])
+    gp = GaussianProcess().fit(x, y)
+    mean, std = gp.predict(x)
+    np.testing.assert_allclose(mean, y, atol=0.05)
+
+    _, far_std = gp.predict(np.array([[1.0, 0.0]]))
+    assert far_std[0] > std.max()
+
+
+def test_expected_improvement_prefers_low_mean_and_high_uncertainty():
+    ei = expected_improvement(np.array([0.0, -1.0, 0.0]), np.array([0.1, 0.1, 1.0]), best=-0.5)
+    assert ei[1] > ei[0]
+    assert ei[2] > ei[0]
+    assert (ei >= 0).all()
+
+
+@pytest.mark.parametrize("objective", ["maximize_gpa", "balanced"])
+def test_surrogate_matches_de_with_fewer_evaluations(courses, student, objective):
+    de = optimize_schedule(
+        SimulationEngine(), student, courses,
+        OptimizationRequest(student_id=1, num_weeks=6, objective=objective),
+    )
+    engine = _CountingEngine()
+    surrogate = optimize_schedule(
+        engine, student, courses,
+        OptimizationRequest(student_id=1, num_weeks=6, objective=objective, method="surrogate"),
+    )
+
+    budget = 3 * (SURROGATE_INITIAL_POINTS + SURROGATE_MAX_PROPOSALS)
+    assert surrogate.evaluations == sum(engine.batch_sizes) <= budget
+    assert surrogate.evaluations < de.evaluations / 2
+    assert surrogate.predicted_gpa >= de.predicted_gpa - 0.1
+    assert min(s.best_objective for s in surrogate.strategy_searches) <= (
+        min(s.best_objective for s in de.strategy_searches) + 0.05
+    )
+
+
+def test_pareto_front_is_non_dominated_in_one_batch(student):
+    # A heavy load, where trading GPA for lower burnout is possible
+    courses = [
+        make_course(i, f"Course {i}", credits, difficulty, workload)
+        for i, (credits, difficulty, workload) in enumerate(
+            [(3, 7, 10), (4, 5, 8), (3, 8, 12), (3, 4, 6), (4, 6, 9), (3, 9, 11), (2, 3, 4)],
+            start=1,
+        )
+    ]
+    engine = _CountingEngine()
+    result = pareto_front(engine, student, courses, ParetoRequest(student_id=1))
+
+    assert engine.batch_sizes == [result.evaluations]
+    assert len(result.points) >= 2
+    for a in result.points:
+        for b in result.points:
+            dominates = (
+                b.predicted_gpa >= a.predicted_gpa
+                and b.burnout_probability <= a.burnout_probability
+                and (b.predicted_gpa, b.burnout_probability) != (a.predicted_gpa, a.burnout_probability)
+            )
+            assert not dominates
+
+    # The front's extremes match the single-objective optimum
+    best = optimize_schedule(
+        SimulationEngine(), student, courses,
+        OptimizationRequest(student_id=1, objective="maximize_gpa"),
+    )
+    assert result.points[-1].predicted_gpa >= best.predicted_gpa
+
+
+@pytest.mark.parametrize("method", ["de", "surrogate"])
+def test_deadline_returns_incumbent_after_first_batch(courses, student, method):
+    class SlowEngine(_CountingEngine):
+        def run_batch(self, configs, courses, noise=None):
+            time.sleep(0.02)  # every batch outlasts the 1 ms budget
+            return super().run_batch(configs, courses, noise=noise)
+
+    engine = SlowEngine()
+    request = OptimizationRequest(student_id=1, num_weeks=6, method=method, deadline_ms=1)
+    result = optimize_schedule(engine, student, courses, request)
+
+    # One batch per strategy: DE's initial population or the Sobol' design
+    assert len(engine.batch_sizes) == 3
+    assert not result.converged
+    assert not any(s.converged for s in result.strategy_searches)
+    assert result.evaluations == sum(engine.batch_sizes)
+    winner = min(result.strategy_searches, key=lambda s: s.best_objective)
+    assert result.optimal_study_strategy == winner.strategy
+
+
+@pytest.mark.parametrize("method", ["de", "surrogate"])
+def test_seeded_search_starts_from_prior_optimum(courses, student, method):
+    request = OptimizationRequest(student_id=1, num_weeks=6, objective="balanced", method=method)
+    cold = optimize_schedule(SimulationEngine(), student, courses, request)
+    assert cold.warm_start == "cold"
+
+    seeded = optimize_schedule(
+        SimulationEngine(), student, courses, request,
+        seeds=[(cold.optimal_work_hours, cold.optimal_sleep_hours)],
+    )
+    assert seeded.warm_start == "seeded"
+    assert min(s.best_objective for s in seeded.strategy_searches) <= (
+        min(s.best_objective for s in cold.strategy_searches)
+    )
+
+
+def test_reuse_optimum_matches_search_without_evaluations(courses, student):
+    request = OptimizationRequest(student_id=1, num_weeks=6, objective="balanced")
+    searched = optimize_schedule(SimulationEngine(), student, courses, request)
+
+    engine = _CountingEngine()
+    reused = reuse_optimum(
+        engine, student, courses, request,
+        searched.optimal_work_hours, searched.optimal_sleep_hours, searched.optimal_study_strategy,
+    )
+    assert engine.batch_sizes == []
+    assert (reused.warm_start, reused.evaluations) == ("reused", 0)
+    assert reused.predicted_gpa == searched.predicted_gpa
+    assert reused.optimal_study_hours_per_course == searched.optimal_study_hours_per_course
+
+
+def test_request_key_ignores_search_settings():
+    base = OptimizationRequest(student_id=1, objective="balanced")
+    assert request_key(base) == request_key(base.model_copy(update={"method": "surrogate", "deadline_ms": 50}))
+    assert request_key(base) != request_key(base.model_copy(update={"num_weeks": 12}))
+    assert request_key(base) != request_key(
+        base.model_copy(update={"constraints": OptimizationConstraints(max_work_hours_per_week=10)})
+    )
@@ -0,0 +1,88 @@
+"""Tests for the streaming quantile sketches behind Monte Carlo bands."""
+
+import numpy as np
+import pytest
+
+from app.simulation.quantile_sketch import (
+    EXACT_MAX_SAMPLES,
+    ExactQuantiles,
+    HistogramQuantiles,
+    P2Quantiles,
+    make_sketch,
+)
+
+
+PERCENTILES = [5, 10, 25, 50, 75, 90, 95]
+
+
+def _feed(sketch, values, chunk=250):
+    for start in range(0, len(values), chunk):
+        sketch.update(values[start:start + chunk])
+    return sketch
+
+
+def test_exact_uses_nearest_rank():
+    sketch = _feed(ExactQuantiles(), np.arange(100.0)[::-1])
+    np.testing.assert_array_equal(sketch.quantiles([10, 50, 90]), [10.0, 50.0, 90.0])
+
+
+def test_histogram_matches_exact_on_grid_values():
+    rng = np.random.default_rng(0)
+    values = np.round(np.clip(rng.normal(2.5, 0.6, size=(3_000, 12)), 0, 4), 2)
+    exact = _feed(ExactQuantiles(), values)
+    histogram = _feed(HistogramQuantiles(0.0, 4.0, 0.01), values)
+    assert histogram.count == exact.count == 3_000
+    np.testing.assert_allclose(
+        histogram.quantiles(PERCENTILES), exact.quantiles(PERCENTILES), atol=1e-9
+    )
+
+
+def test_p2_tracks_normal_quantiles_per_column():
+    rng = np.random.default_rng(1)
+    values = rng.normal([0.0, 10.0], [1.0, 2.0], size=(5_000, 2))
+    estimates = _feed(P2Quantiles(PERCENTILES), values).quantiles(PERCENTILES)
+    assert estimates.shape == (len(PERCENTILES), 2)
+    np.testing.assert_allclose(estimates, np.percentile(values, PERCENTILES, axis=0), atol=0.1)
+
+
+def test_p2_error_is_bounded_against_exact_on_continuous_values():
+    rng = np.random.default_rng(3)
+    values = np.column_stack([rng.normal(2.5, 0.6, 20_000), rng.gamma(2.0, 1.0, 20_000)])
+    p2 = _feed(P2Quantiles(PERCENTILES), values, chunk=500)
+    exact = _feed(ExactQuantiles(), values, chunk=500)
+    error = np.abs(p2.quantiles(PERCENTILES) - exact.quantiles(PERCENTILES))
+    assert (error <= 0.03 * values.std(axis=0)).all()
+
+
+def test_p2_rejects_untracked_percentile():
+    sketch = _feed(P2Quantiles([50]), np.arange(20.0))
+    with pytest.raises(ValueError, match="does not track"):
+        sketch.quantiles([90])
+
+
+def test_make_sketch_auto_switches_to_constant_memory():
+    grid = (0.0, 4.0, 0.01)
+    assert isinstance(make_sketch("auto", [50], EXACT_MAX_SAMPLES, grid), ExactQuantiles)
+    assert isinstance(make_sketch("auto", [50], EXACT_MAX_SAMPLES + 1, grid), HistogramQuantiles)
+    assert isinstance(make_sketch("auto", [50], EXACT_MAX_SAMPLES + 1), P2Quantiles)
+
+
+def test_make_sketch_uses_p2_only_for_many_continuous_values():
+    grid = (0.0, 4.0, 0.01)
+    assert isinstance(make_sketch("p2", [50], EXACT_MAX_SAMPLES + 1), P2Quantiles)
+    assert isinstance(make_sketch("p2", [50], EXACT_MAX_SAMPLES + 1, grid), HistogramQuantiles)
+    assert isinstance(make_sketch("p2", [50], EXACT_MAX_SAMPLES), ExactQuantiles)
+
+
+def test_histogram_bootstrap_narrows_with_more_samples():
+    rng = np.random.default_rng(2)
+
+    def ci_width(n):
+        sketch = HistogramQuantiles(0.0, 4.0, 0.01)
+        sketch.update(np.round(np.clip(rng.normal(2.5, 0.5, n), 0, 4), 2))
+        estimates = sketch.bootstrap_quantiles([10, 50, 90], 200, np.random.default_rng(0))
+        assert estimates.shape == (200, 3)
+        low, high = np.percentile(estimates, [2.5, 97.5], axis=0)
+        return high - low
+
+    assert (ci_width(20_000) < ci_width(200)).all()
@@ -1,7 +1,9 @@
 """Tests for the recovery and burnout model."""
 
+import numpy as np
 import pytest
 from app.simulation.recovery_model import (
+    BurnoutAccumulator,
     compute_recovery,
     compute_burnout_probability,
     burnout_risk_label,
@@ -57,3 +59,33 @@ def test_burnout_risk_labels():
 
 def test_empty_history_returns_zero():
     assert compute_burnout_probability([], [], []) == 0.0
+
+
+def test_missing_or_short_sleep_history_uses_every_load_week():
+    # Empty sleep history counts as 49h/week; short history is averaged over all load weeks
+    assert compute_burnout_probability([80.0] * 4, [], []) == pytest.approx(0.858, abs=1e-3)
+    assert compute_burnout_probability([80.0] * 4, [35.0], []) == pytest.approx(0.978, abs=1e-3)
+    assert compute_burnout_probability([80.0] * 4, [49.0] * 4, []) == (
+        compute_burnout_probability([80.0] * 4, [], [])
+    )
+
+
+def test_accumulator_matches_full_history_every_week():
+    loads = [55.0, 72.0, 81.0, 90.0, 40.0, 75.0, 77.0, 30.0]
+    sleeps = [49.0, 42.0, 35.0, 35.0, 56.0, 42.0, 38.5, 49.0]
+    accumulator = BurnoutAccumulator()
+    for week in range(1, len(loads) + 1):
+        prob = accumulator.update(loads[week - 1], sleeps[week - 1])
+        assert prob == compute_burnout_probability(loads[:week], sleeps[:week], [4.0] * week)
+
+
+def test_vectorized_accumulator_matches_scalar():
+    loads = np.array([[80.0, 85.0, 60.0, 90.0], [30.0, 35.0, 40.0, 45.0]])
+    sleeps = np.array([[35.0, 35.0, 42.0, 35.0], [56.0, 56.0, 56.0, 56.0]])
+    batch = BurnoutAccumulator(num_scenarios=2)
+    scalars = [BurnoutAccumulator(), BurnoutAccumulator()]
+    for w in range(loads.shape[1]):
+        probs = batch.update(loads[:, w], sleeps[:, w])
+        for i, scalar in enumerate(scalars):
+            assert probs[i] == pytest.approx(scalar.update(loads[i, w], sleeps[i, w]), abs=1e-12)
+    assert batch.max_streak.tolist() == [2, 0]
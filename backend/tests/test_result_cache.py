@@ -0,0 +1,76 @@
+"""Tests for the content-addressed simulation result cache."""
+
+import pytest
+
+from app.schemas.simulation import ScenarioConfig
+from app.simulation.course_table import CourseTable
+from app.simulation.engine import SimulationEngine
+from app.simulation.result_cache import SimulationCache, cache_key, simulation_cache
+from tests.conftest import make_course
+
+
+@pytest.fixture
+def courses():
+    return CourseTable.from_courses([
+        make_course(1, "Physics I", 3, 7.0, 6.0),
+        make_course(2, "Ethics", 3, 3.0, 6.0),
+    ])
+
+
+def test_key_ignores_ordering_and_scenario_name(courses):
+    a = ScenarioConfig(student_id=1, include_course_ids=[2, 1], scenario_name="A")
+    b = ScenarioConfig(student_id=1, include_course_ids=[1, 2], scenario_name="B")
+    assert cache_key(a, courses) == cache_key(b, courses)
+    assert cache_key(a, courses) != cache_key(a, courses, kind="lite")
+
+
+def test_key_changes_with_course_parameters(courses):
+    config = ScenarioConfig(student_id=1)
+    harder = CourseTable.from_courses([
+        make_course(1, "Physics I", 3, 9.0, 6.0),
+        make_course(2, "Ethics", 3, 3.0, 6.0),
+    ])
+    assert cache_key(config, courses) != cache_key(config, harder)
+
+
+def test_lru_eviction_and_counters():
+    cache = SimulationCache(max_entries=2)
+    cache.put("a", 1, "A")
+    cache.put("b", 1, "B")
+    assert cache.get("a") == "A"   # "b" is now least recently used
+    cache.put("c", 2, "C")
+    assert cache.get("b") is None
+    assert cache.stats() == {
+        "entries": 2, "max_entries": 2, "hits": 1, "misses": 1, "evictions": 1,
+    }
+    assert cache.invalidate_student(1) == 1
+    assert len(cache) == 1
+
+
+def test_cached_engine_returns_equal_result(courses):
+    engine = SimulationEngine(cache=SimulationCache())
+    config = ScenarioConfig(student_id=1, num_weeks=8)
+    first = engine.run(config=config, courses=courses, student=None)
+    first.id = 99
+    second = engine.run(config=config, courses=courses, student=None)
+    assert engine.cache.hits == 1
+    assert second.id is None
+    assert second.summary == first.summary
+    assert second.weekly_snapshots == first.weekly_snapshots
+
+
+def test_course_changes_invalidate_student_entries(client, sample_student_data, sample_course_data):
+    student_id = client.post("/api/v1/students/", json=sample_student_data).json()["id"]
+    client.post(f"/api/v1/students/{student_id}/courses", json=sample_course_data[0])
+    client.post("/api/v1/simulations/run", json={"student_id": student_id, "num_weeks": 8})
+    assert simulation_cache.invalidate_student(student_id) == 1
+
+    client.post("/api/v1/simulations/run", json={"student_id": student_id, "num_weeks": 8})
+    course_id = client.post(
+        f"/api/v1/students/{student_id}/courses", json=sample_course_data[1]
+    ).json()["id"]
+    assert simulation_cache.invalidate_student(student_id) == 0
+
+    client.post("/api/v1/simulations/run", json={"student_id": student_id, "num_weeks": 8})
+    client.delete(f"/api/v1/courses/{course_id}")
+    assert simulation_cache.invalidate_student(student_id) == 0
@@ -166,6 +166,17 @@ export interface OptimizationRequest {
   num_weeks: number;
   constraints: OptimizationConstraints;
   objective: OptimizationObjective;
+  method?: "de" | "surrogate";
+  deadline_ms?: number | null;
+}
+
+export interface StrategySearchStats {
+  strategy: StudyStrategy;
+  best_objective: number;
+  evaluations: number;
+  cache_lookups: number;
+  cache_hits: number;
+  converged: boolean;
 }
 
 export interface OptimizationResult {
@@ -177,6 +188,29 @@ export interface OptimizationResult {
   predicted_gpa: number;
   predicted_burnout_probability: number;
   simulation_result: SimulationResult;
+  evaluations: number;
+  cache_hit_rate: number;
+  strategy_searches: StrategySearchStats[];
+  converged: boolean;
+  warm_start: "cold" | "seeded" | "reused";
+}
+
+export interface ParetoRequest {
+  student_id: number;
+  num_weeks: number;
+  constraints: OptimizationConstraints;
+}
+
+export interface ParetoPoint {
+  config: ScenarioConfig;
+  predicted_gpa: number;
+  burnout_probability: number;
+  burnout_risk: BurnoutRisk;
+}
+
+export interface ParetoResult {
+  points: ParetoPoint[];
+  evaluations: number;
 }
 
 // ── Monte Carlo ───────────────────────────────────────────────────────────────
@@ -184,6 +218,11 @@ export interface OptimizationResult {
 export interface MonteCarloConfig {
   runs: number;
   study_variance: number;
+  workers?: number;
+  percentiles?: number[];
+  quantile_method?: "auto" | "exact" | "histogram" | "p2";
+  sampler?: "pseudo" | "lhs" | "sobol";
+  tolerance?: number | null;
 }
 
 export interface MonteCarloRequest {
@@ -200,6 +239,27 @@ export interface MonteCarloResult {
   weekly_p10: number[];
   weekly_p50: number[];
   weekly_p90: number[];
+  percentiles: Record<string, number>;
+  weekly_percentiles: Record<string, number[]>;
+  stopped_early: boolean;
+}
+
+export interface MonteCarloCompareRequest {
+  scenario_configs: ScenarioConfig[];
+  monte_carlo: MonteCarloConfig;
+}
+
+export interface MonteCarloDifference {
+  scenario_index: number;
+  baseline_index: number;
+  bands: MonteCarloResult;
+  probability_better: number;
+}
+
+export interface MonteCarloCompareResult {
+  runs: number;
+  scenarios: MonteCarloResult[];
+  differences: MonteCarloDifference[];
 }
 
 // ── Goal Targeting ────────────────────────────────────────────────────────────
@@ -210,6 +270,8 @@ export interface GoalTargetRequest {
   num_weeks: number;
   max_work_hours: number;
   exam_weeks: number[];
+  work_step?: number;
+  sleep_step?: number;
 }
 
 export interface GoalTargetResult {
@@ -221,6 +283,73 @@ export interface GoalTargetResult {
   predicted_gpa: number;
   gap_to_target: number;
   tips: string[];
+  adjustment_hours: number;
+  evaluations: number;
+}
+
+export interface GoalSurfaceRequest {
+  student_id: number;
+  num_weeks: number;
+  max_work_hours: number;
+  exam_weeks: number[];
+  work_step?: number;
+  sleep_step?: number;
+  target_gpa?: number | null;
+}
+
+export interface GoalSurfaceResult {
+  strategies: StudyStrategy[];
+  sleep_hours: number[];
+  work_hours: number[];
+  /** Indexed [strategy][sleep][work] */
+  predicted_gpa: number[][][];
+  burnout_probability: number[][][];
+  feasible: boolean[][][] | null;
+  evaluations: number;
+  cached: boolean;
+}
+
+export interface CohortRequest {
+  /** Omit (or null) to run every student */
+  student_ids?: number[] | null;
+  mode?: "simulate" | "goal_target";
+  num_weeks?: number;
+  study_strategy?: StudyStrategy;
+  exam_weeks?: number[];
+  /** Goal targeting: overrides every student's own target GPA */
+  target_gpa?: number | null;
+  max_work_hours?: number;
+  work_step?: number;
+  sleep_step?: number;
+  chunk_size?: number;
+  /** Worker processes; 0 uses every CPU core */
+  workers?: number;
+}
+
+/** `student` event of POST /advisor/cohort */
+export interface CohortStudentResult {
+  student_id: number;
+  predicted_gpa: number | null;
+  burnout_probability: number | null;
+  burnout_risk: BurnoutRisk | null;
+  target_gpa: number | null;
+  achievable: boolean | null;
+  recommended_work_hours: number | null;
+  recommended_sleep_hours: number | null;
+  recommended_strategy: StudyStrategy | null;
+  adjustment_hours: number | null;
+  /** Why the student was skipped (unknown id, no courses) */
+  detail: string | null;
+}
+
+/** Final `summary` event of POST /advisor/cohort */
+export interface CohortSummary {
+  students: number;
+  simulated: number;
+  skipped: number;
+  achievable: number | null;
+  evaluations: number;
+  elapsed_ms: number;
 }
 
 // ── AI Advisor ────────────────────────────────────────────────────────────────